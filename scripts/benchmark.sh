@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+SCRIPT_DIR=$( cd -- "$( dirname -- "${BASH_SOURCE[0]}" )" &> /dev/null && pwd )
+
+
+cd $SCRIPT_DIR/..
+uv run src/buildplanner/benchmark_suite_main.py "$@"
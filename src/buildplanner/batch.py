@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from os import cpu_count
+from typing import IO, Callable, Iterable, Iterator, Optional, Union
+
+from .model import COURSE_HEIGHT, FULL_BRICK_LENGTH, Wall
+from .parser_util import (
+    ALIGNMENT_STRATEGIES,
+    BONDS,
+    MOVE_STRATEGIES,
+    int_greater_than_0,
+)
+from .robot import Robot
+from .util import to_fixed_point
+from .wall import WallPlanningException, create_wall
+
+# manifests are read a row at a time and only a few walls are ever being planned at
+# once, so memory stays flat however many walls a manifest has. lengths are in mm, like
+# the other command line tools
+
+MANIFEST_FIELDS = (
+    "name",
+    "length",
+    "height",
+    "bond",
+    "envelope_length",
+    "envelope_height",
+    "alignment",
+    "move",
+    "seed",
+)
+ROBOT_BUILD_ENVELOPE_LENGTH = 800
+ROBOT_BUILD_ENVELOPE_HEIGHT = 1300
+CHUNK_SIZE = 1 << 16
+
+# search plans a whole build up front, so it's only tried when a wall asks for it
+BATCH_MOVE_STRATEGIES = [name for name in MOVE_STRATEGIES if name != "search"]
+
+
+@dataclass(frozen=True)
+class WallSpec:
+    name: str
+    length: int
+    height: int
+    bond: str = "stretcher"
+    envelope_length: int = ROBOT_BUILD_ENVELOPE_LENGTH
+    envelope_height: int = ROBOT_BUILD_ENVELOPE_HEIGHT
+    alignment: Optional[str] = None
+    move: Optional[str] = None
+    seed: Optional[int] = None
+
+    @staticmethod
+    def from_row(row: dict, index: int) -> WallSpec:
+        unknown = {str(key) for key in row} - set(MANIFEST_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields {', '.join(sorted(unknown))}")
+        # csv rows have empty strings for values that aren't given
+        values = {key: value for key, value in row.items() if value not in (None, "")}
+        for field_name in ("length", "height"):
+            if field_name not in values:
+                raise ValueError(f"No {field_name}")
+        for field_name, choices in (
+            ("bond", BONDS),
+            ("alignment", ALIGNMENT_STRATEGIES),
+            ("move", MOVE_STRATEGIES),
+        ):
+            if field_name in values and values[field_name] not in choices:
+                raise ValueError(f"Unknown {field_name} {values[field_name]}")
+        numbers = {}
+        for field_name in ("length", "height", "envelope_length", "envelope_height"):
+            if field_name in values:
+                try:
+                    numbers[field_name] = int_greater_than_0(values[field_name])
+                except ValueError as e:
+                    raise ValueError(f"{field_name}: {e}") from None
+        if "seed" in values:
+            try:
+                numbers["seed"] = int(values["seed"])
+            except ValueError as e:
+                raise ValueError(f"seed: {e}") from None
+        spec = WallSpec(
+            str(values.get("name", index)),
+            bond=values.get("bond", "stretcher"),
+            alignment=values.get("alignment"),
+            move=values.get("move"),
+            **numbers,
+        )
+        # a robot that can't reach a whole brick and its bed joint would never finish
+        if to_fixed_point(spec.envelope_length) < FULL_BRICK_LENGTH or (
+            to_fixed_point(spec.envelope_height) < COURSE_HEIGHT
+        ):
+            raise ValueError("Envelope is too small to lay a brick")
+        return spec
+
+
+def read_manifest(file: IO[str], manifest_format: str) -> Iterator[dict]:
+    if manifest_format == "csv":
+        yield from csv.DictReader(file)
+    else:
+        yield from _json_objects(file)
+
+
+def _json_objects(file: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    # reads the objects of a JSON array, or of JSON lines, a chunk at a time instead of
+    # loading the whole manifest
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    at_end = False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+            position += 1
+        if position == len(buffer):
+            if at_end:
+                return
+            buffer = file.read(chunk_size)
+            position = 0
+            at_end = not buffer
+            continue
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            # the object might just run on into the next chunk
+            if at_end:
+                raise ValueError(f"Manifest isn't valid JSON: {e}") from None
+            chunk = file.read(chunk_size)
+            at_end = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        if not isinstance(value, dict):
+            raise ValueError("Manifest entries have to be JSON objects")
+        yield value
+        position = end
+
+
+def plan_wall(spec: WallSpec) -> dict:
+    start = time.perf_counter()
+    result = {"name": spec.name}
+    try:
+        wall = create_wall(
+            to_fixed_point(spec.length),
+            to_fixed_point(spec.height),
+            BONDS[spec.bond](_rng(spec.seed)),
+        )
+    except WallPlanningException as e:
+        result["error"] = str(e)
+        return result
+    result["strides"], result["alignment"], result["move"] = best_strategies(wall, spec)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def best_strategies(wall: Wall, spec: WallSpec) -> tuple[int, str, str]:
+    # walls that don't say which strategies to use are tried with all of them, and the
+    # one with the fewest strides is kept
+    best = None
+    for alignment, move in itertools.product(
+        [spec.alignment] if spec.alignment else ALIGNMENT_STRATEGIES,
+        [spec.move] if spec.move else BATCH_MOVE_STRATEGIES,
+    ):
+        wall.reset()
+        robot = create_robot(spec, alignment, move)
+        while True:
+            robot.lay_stride(wall)
+            if not robot.move(wall):
+                break
+        strides = robot.move_count + 1
+        if best is None or strides < best[0]:
+            best = (strides, alignment, move)
+    return best
+
+
+def create_robot(spec: WallSpec, alignment: str, move: str) -> Robot:
+    return Robot(
+        to_fixed_point(spec.envelope_length),
+        to_fixed_point(spec.envelope_height),
+        MOVE_STRATEGIES[move](ALIGNMENT_STRATEGIES[alignment](_rng(spec.seed))),
+    )
+
+
+def plan_walls(
+    rows: Iterable[dict],
+    workers: Optional[int] = None,
+    in_flight: Optional[int] = None,
+) -> Iterator[dict]:
+    # results come out in manifest order. at most in_flight rows are read ahead of the
+    # oldest one that's still being planned
+    if workers == 1:
+        for index, row in enumerate(rows):
+            yield _result(index, _plan_row(row, index, plan_wall))
+        return
+    in_flight = in_flight or 2 * (workers or cpu_count())
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for index, row in enumerate(rows):
+            pending.append(
+                (index, _plan_row(row, index, lambda s: executor.submit(plan_wall, s)))
+            )
+            if len(pending) >= in_flight:
+                yield _result(*pending.popleft())
+        while pending:
+            yield _result(*pending.popleft())
+
+
+def _plan_row(
+    row: dict, index: int, plan: Callable[[WallSpec], Union[dict, Future]]
+) -> Union[dict, Future]:
+    try:
+        spec = WallSpec.from_row(row, index)
+    except (TypeError, ValueError) as e:
+        return {"name": str(row.get("name", index)), "error": str(e)}
+    return plan(spec)
+
+
+def _result(index: int, result: Union[dict, Future]) -> dict:
+    if isinstance(result, Future):
+        result = result.result()
+    return {"index": index, **result}
+
+
+def _rng(seed: Optional[int]) -> Optional[random.Random]:
+    return random.Random(seed) if seed is not None else None
@@ -0,0 +1,81 @@
+import argparse
+import json
+import sys
+import time
+from contextlib import nullcontext
+from typing import Optional
+
+from buildplanner.batch import plan_walls, read_manifest
+from buildplanner.parser_util import int_greater_than_0
+
+
+def main(
+    manifest: str,
+    manifest_format: Optional[str],
+    output: str,
+    workers: Optional[int],
+    in_flight: Optional[int],
+):
+    manifest_format = manifest_format or (
+        "csv" if manifest.endswith(".csv") else "json"
+    )
+    start = time.perf_counter()
+    walls = 0
+    failures = 0
+    with (
+        (
+            nullcontext(sys.stdin) if manifest == "-" else open(manifest, newline="")
+        ) as manifest_file,
+        nullcontext(sys.stdout) if output == "-" else open(output, "w") as out,
+    ):
+        # every result is written as soon as it's in, so a long batch can be followed as
+        # it runs, and nothing is lost if it's stopped
+        for result in plan_walls(
+            read_manifest(manifest_file, manifest_format), workers, in_flight
+        ):
+            walls += 1
+            failures += "error" in result
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+    print(
+        f"Planned {walls - failures} of {walls} walls "
+        f"in {time.perf_counter() - start:.1f} s",
+        file=sys.stderr,
+    )
+
+
+def parse_args() -> (str, Optional[str], str, Optional[int], Optional[int]):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "manifest",
+        help="CSV, JSON array or JSON lines file of walls to plan, or - for stdin. Fields are name, length, height, bond, envelope_length, envelope_height, alignment, move and seed, with lengths in mm. Only length and height are needed",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("csv", "json"),
+        help="Format of the manifest. Defaults to csv for .csv files and json otherwise",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="-",
+        help="JSON lines file to write a result per wall to, in manifest order. Defaults to stdout",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int_greater_than_0,
+        help="Number of worker processes, defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "--in-flight",
+        type=int_greater_than_0,
+        help="Most walls to read ahead of the oldest one still being planned. Defaults to twice the number of workers",
+    )
+    args = parser.parse_args()
+    return args.manifest, args.format, args.output, args.workers, args.in_flight
+
+
+if __name__ == "__main__":
+    main(*parse_args())
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import itertools
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from .model import Wall
+from .parser_util import ALIGNMENT_STRATEGIES, MOVE_STRATEGIES
+from .robot import (
+    CenterAlignmentStrategy,
+    MoveStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from .util import to_fixed_point
+from .wall import Bond, WallPlanningException, create_wall
+
+# lengths and heights are in mm, like the other command line tools. wild bonds are
+# seeded so that every run measures the same walls
+LADDER_LENGTHS = (2300, 10000, 25000, 50000, 100000)
+LADDER_HEIGHTS = (2000, 4000)
+SWEEP_LENGTHS = (2300,)
+SEED = 0
+REPEATS = 3
+REGRESSION_THRESHOLD = 0.25
+BASELINE_VERSION = 1
+ROBOT_BUILD_ENVELOPE_LENGTH = 800
+ROBOT_BUILD_ENVELOPE_HEIGHT = 1300
+
+# changes smaller than these are within the noise of a shared machine, whatever the
+# threshold says
+NOISE_OF_METRICS = {
+    "plan_seconds": 0.02,
+    "lay_seconds": 0.02,
+    "sweep_seconds": 0.02,
+    "peak_kib": 64,
+}
+
+
+@dataclass
+class Measurement:
+    bond: str
+    length: int
+    height: int
+    bricks: int = 0
+    plan_seconds: Optional[float] = None
+    lay_seconds: Optional[float] = None
+    peak_kib: Optional[float] = None
+    sweep_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.bond} {self.length}x{self.height}"
+
+    @property
+    def bricks_per_second(self) -> Optional[float]:
+        if not self.lay_seconds:
+            return None
+        return self.bricks / self.lay_seconds
+
+
+def build_wall(wall: Wall, robot: Robot) -> int:
+    laid = 0
+    while True:
+        laid += len(robot.lay_stride(wall))
+        if not robot.move(wall):
+            return laid
+
+
+def create_robot(move_strategy: Optional[MoveStrategy] = None) -> Robot:
+    return Robot(
+        to_fixed_point(ROBOT_BUILD_ENVELOPE_LENGTH),
+        to_fixed_point(ROBOT_BUILD_ENVELOPE_HEIGHT),
+        move_strategy or OutsideInMoveStrategy(CenterAlignmentStrategy()),
+    )
+
+
+def measure(
+    bond_name: str,
+    bond: type[Bond],
+    wall_size: tuple[int, int],
+    repeats: int = REPEATS,
+    sweep: bool = False,
+) -> Measurement:
+    wall_length, wall_height = wall_size
+    measurement = Measurement(bond_name, wall_length, wall_height)
+
+    def plan() -> Wall:
+        return create_wall(
+            to_fixed_point(wall_length),
+            to_fixed_point(wall_height),
+            bond(random.Random(SEED)),
+        )
+
+    # the best of a few runs is the least disturbed by whatever else the machine is doing
+    try:
+        measurement.plan_seconds, wall = _best_of(repeats, plan)
+    except WallPlanningException as e:
+        measurement.error = str(e)
+        return measurement
+
+    def lay() -> int:
+        wall.reset()
+        return build_wall(wall, create_robot())
+
+    measurement.lay_seconds, measurement.bricks = _best_of(repeats, lay)
+
+    # memory is traced on its own run, as tracing slows everything else down
+    tracemalloc.start()
+    try:
+        build_wall(plan(), create_robot())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    measurement.peak_kib = peak / 1024
+
+    if sweep:
+        measurement.sweep_seconds, _ = _best_of(1, lambda: _sweep(plan()))
+    return measurement
+
+
+def _sweep(wall: Wall) -> None:
+    # a planner sweep plans the wall once and then lays it with every combination of
+    # strategies, as planner_main does with its wall cache
+    for alignment_strategy, move_strategy in itertools.product(
+        ALIGNMENT_STRATEGIES.values(), MOVE_STRATEGIES.values()
+    ):
+        wall.reset()
+        build_wall(
+            wall,
+            create_robot(move_strategy(alignment_strategy(random.Random(SEED)))),
+        )
+
+
+def scaling_exponents(measurements: list[Measurement]) -> dict[str, float]:
+    # how laying time grows with the number of bricks, from one length of a bond and
+    # height to the next. 1 is linear, 2 is quadratic
+    exponents = {}
+    by_bond_and_height = itertools.groupby(
+        sorted(
+            (m for m in measurements if m.error is None),
+            key=lambda m: (m.bond, m.height, m.length),
+        ),
+        key=lambda m: (m.bond, m.height),
+    )
+    for _, series in by_bond_and_height:
+        for smaller, larger in itertools.pairwise(series):
+            if smaller.lay_seconds and larger.lay_seconds:
+                exponents[larger.key] = math.log(
+                    larger.lay_seconds / smaller.lay_seconds
+                ) / math.log(larger.bricks / smaller.bricks)
+    return exponents
+
+
+def find_regressions(
+    baseline: dict[str, Measurement],
+    measurements: list[Measurement],
+    threshold: float = REGRESSION_THRESHOLD,
+) -> list[str]:
+    regressions = []
+    for measurement in measurements:
+        before = baseline.get(measurement.key)
+        if before is None or before.error is not None:
+            continue
+        if measurement.error is not None:
+            regressions.append(f"{measurement.key}: {measurement.error}")
+            continue
+        for metric, noise in NOISE_OF_METRICS.items():
+            old = getattr(before, metric)
+            new = getattr(measurement, metric)
+            if old is None or new is None:
+                continue
+            if new <= old * (1 + threshold) or new - old < noise:
+                continue
+            regressions.append(
+                f"{measurement.key}: {metric} went from {old:.4g} to {new:.4g} "
+                f"(+{(new / old - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def write_baseline(path: str, measurements: list[Measurement]) -> None:
+    with open(path, "w") as file:
+        json.dump(
+            {
+                "version": BASELINE_VERSION,
+                "python": platform.python_version(),
+                "measurements": {m.key: asdict(m) for m in measurements},
+            },
+            file,
+            indent=2,
+        )
+        file.write("\n")
+
+
+def read_baseline(path: str) -> dict[str, Measurement]:
+    with open(path) as file:
+        baseline = json.load(file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} is not a version {BASELINE_VERSION} baseline")
+    return {
+        key: Measurement(**measurement)
+        for key, measurement in baseline["measurements"].items()
+    }
+
+
+def _best_of(repeats: int, run: Callable[[], object]) -> (float, object):
+    best = math.inf
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,96 @@
+import argparse
+import sys
+import time
+import tracemalloc
+
+from buildplanner.benchmark import build_wall
+from buildplanner.parser_util import BONDS, wall_dimensions
+from buildplanner.model import Wall
+from buildplanner.robot import CenterAlignmentStrategy, OutsideInMoveStrategy, Robot
+from buildplanner.util import Point, Rectangle, to_fixed_point
+from buildplanner.wall import Bond, create_streaming_wall, create_wall
+
+WALL_SIZE = (10000, 2000)
+ROBOT_BUILD_ENVELOPE_LENGTH = 800
+ROBOT_BUILD_ENVELOPE_HEIGHT = 1300
+
+GEOMETRY_CONSTRUCTORS = (Point.__init__.__code__, Rectangle.__init__.__code__)
+
+
+def create_wall_and_robot(
+    bond: type[Bond], wall_size: tuple[int, int], streaming: bool
+) -> (Wall, Robot):
+    wall_length, wall_height = wall_size
+    wall = (create_streaming_wall if streaming else create_wall)(
+        to_fixed_point(wall_length), to_fixed_point(wall_height), bond()
+    )
+    robot = Robot(
+        to_fixed_point(ROBOT_BUILD_ENVELOPE_LENGTH),
+        to_fixed_point(ROBOT_BUILD_ENVELOPE_HEIGHT),
+        OutsideInMoveStrategy(CenterAlignmentStrategy()),
+    )
+    return wall, robot
+
+
+def count_geometry_allocations(wall: Wall, robot: Robot) -> int:
+    # every point and rectangle goes through its dataclass __init__, so counting those
+    # calls counts the geometry objects created
+    allocations = 0
+
+    def profile(frame, event, arg):
+        nonlocal allocations
+        if event == "call" and frame.f_code in GEOMETRY_CONSTRUCTORS:
+            allocations += 1
+
+    sys.setprofile(profile)
+    try:
+        build_wall(wall, robot)
+    finally:
+        sys.setprofile(None)
+    return allocations
+
+
+def main(bond: type[Bond], wall_size: tuple[int, int], streaming: bool) -> None:
+    # each measurement gets a fresh wall, and only laying it is measured. a streaming
+    # wall is planned while it's laid, so its planning is measured too
+    wall, robot = create_wall_and_robot(bond, wall_size, streaming)
+    start = time.perf_counter()
+    laid = build_wall(wall, robot)
+    elapsed = time.perf_counter() - start
+
+    wall, robot = create_wall_and_robot(bond, wall_size, streaming)
+    tracemalloc.start()
+    build_wall(wall, robot)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    allocations = count_geometry_allocations(
+        *create_wall_and_robot(bond, wall_size, streaming)
+    )
+    print(f"Bricks laid: {laid}")
+    print(f"Time per brick: {elapsed / laid * 1e6:.1f} us")
+    print(f"Peak traced memory: {peak / 1024:.0f} KiB")
+    print(f"Geometry objects allocated per brick: {allocations / laid:.1f}")
+
+
+def parse_args() -> (type[Bond], tuple[int, int], bool):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-b", "--bond", choices=BONDS.keys(), default="stretcher")
+    parser.add_argument(
+        "-s",
+        "--wall-size",
+        type=wall_dimensions,
+        default=WALL_SIZE,
+        help="Size of the wall to build, given as LENGTHxHEIGHT in mm",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Plan the wall's courses as the robot reaches them, and drop them once they're built",
+    )
+    args = parser.parse_args()
+    return BONDS[args.bond], args.wall_size, args.streaming
+
+
+if __name__ == "__main__":
+    main(*parse_args())
@@ -0,0 +1,154 @@
+import argparse
+import sys
+from typing import Optional
+
+from buildplanner.benchmark import (
+    LADDER_HEIGHTS,
+    LADDER_LENGTHS,
+    REGRESSION_THRESHOLD,
+    REPEATS,
+    SWEEP_LENGTHS,
+    Measurement,
+    find_regressions,
+    measure,
+    read_baseline,
+    scaling_exponents,
+    write_baseline,
+)
+from buildplanner.parser_util import BONDS, int_greater_than_0
+
+
+def main(
+    bonds: list[str],
+    lengths: list[int],
+    heights: list[int],
+    sweep_lengths: list[int],
+    repeats: int,
+    baseline: Optional[str],
+    output: Optional[str],
+    threshold: float,
+) -> int:
+    measurements = []
+    for bond in bonds:
+        for height in heights:
+            for length in sorted(set(lengths) | set(sweep_lengths)):
+                measurements.append(
+                    measure(
+                        bond,
+                        BONDS[bond],
+                        (length, height),
+                        repeats,
+                        sweep=length in sweep_lengths,
+                    )
+                )
+                _print_measurement(measurements[-1], measurements)
+
+    if output is not None:
+        write_baseline(output, measurements)
+        print(f"Wrote {len(measurements)} measurements to {output}")
+    if baseline is None:
+        return 0
+    regressions = find_regressions(read_baseline(baseline), measurements, threshold)
+    for regression in regressions:
+        print("Regression:", regression)
+    if regressions:
+        return 1
+    print(f"No regressions against {baseline}")
+    return 0
+
+
+def _print_measurement(measurement: Measurement, measurements: list[Measurement]):
+    if measurement.error is not None:
+        print(f"{measurement.key:<24} {measurement.error}", flush=True)
+        return
+    exponent = scaling_exponents(measurements).get(measurement.key)
+    print(
+        f"{measurement.key:<24} {measurement.bricks:>7} bricks, "
+        f"plan {measurement.plan_seconds * 1000:>8.1f} ms, "
+        f"lay {measurement.lay_seconds * 1000:>8.1f} ms, "
+        f"{measurement.bricks_per_second:>8.0f} bricks/s, "
+        f"peak {measurement.peak_kib:>8.0f} KiB"
+        + (f", growth n^{exponent:.2f}" if exponent is not None else "")
+        + (
+            f", sweep {measurement.sweep_seconds:.2f} s"
+            if measurement.sweep_seconds is not None
+            else ""
+        ),
+        flush=True,
+    )
+
+
+def parse_args() -> (
+    list[str],
+    list[int],
+    list[int],
+    list[int],
+    int,
+    Optional[str],
+    Optional[str],
+    float,
+):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-b", "--bond", choices=BONDS.keys(), nargs="+", default=list(BONDS.keys())
+    )
+    parser.add_argument(
+        "-l",
+        "--lengths",
+        type=int_greater_than_0,
+        nargs="+",
+        default=list(LADDER_LENGTHS),
+        help="Wall lengths to measure, in mm",
+    )
+    parser.add_argument(
+        "--heights",
+        type=int_greater_than_0,
+        nargs="+",
+        default=list(LADDER_HEIGHTS),
+        help="Wall heights to measure, in mm",
+    )
+    parser.add_argument(
+        "--sweep-lengths",
+        type=int_greater_than_0,
+        nargs="*",
+        default=list(SWEEP_LENGTHS),
+        help="Wall lengths to also time a full planner sweep of every move and alignment strategy on, in mm",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeats",
+        type=int_greater_than_0,
+        default=REPEATS,
+        help="Number of times to plan and lay each wall, the fastest run is kept",
+    )
+    parser.add_argument(
+        "--baseline",
+        help="JSON baseline to compare against. Exits with 1 if anything regressed past the threshold",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="File to write the measurements to, as a JSON baseline",
+    )
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=REGRESSION_THRESHOLD,
+        help="How much slower or bigger a measurement can get before it counts as a regression, as a fraction",
+    )
+    args = parser.parse_args()
+    return (
+        args.bond,
+        args.lengths,
+        args.heights,
+        args.sweep_lengths,
+        args.repeats,
+        args.baseline,
+        args.output,
+        args.threshold,
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main(*parse_args()))
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterator, Optional
+
+from .model import (
+    BED_JOINT_THICKNESS,
+    BRICK_HEIGHT,
+    COURSE_HEIGHT,
+    Brick,
+    Course,
+    HeadJoint,
+    Unit,
+    Wall,
+)
+from .util import Point, Rectangle
+
+BRICK_KIND = 0
+HEAD_JOINT_KIND = 1
+
+
+class CompactWall:
+    def __init__(self, box: Rectangle, course_heights: list[int]) -> None:
+        self.box = box
+        self.course_heights = array("l", course_heights)
+        self.course_starts = array("l", [0])
+        self.x = array("l")
+        self.length = array("l")
+        self.course = array("l")
+        self.kind = array("b")
+        self.built = array("b")
+        # the units supporting a unit are always a contiguous run of the course below,
+        # and the units it supports a contiguous run of the course above
+        self.supporters_start = array("l")
+        self.supporters_stop = array("l")
+        self.dependents_start = array("l")
+        self.dependents_stop = array("l")
+
+    @staticmethod
+    def from_wall(wall: Wall) -> CompactWall:
+        compact_wall = CompactWall(wall.box, [course.height for course in wall.courses])
+        for course_index, course in enumerate(wall.courses):
+            compact_wall._append_course(course_index, course.units)
+        return compact_wall
+
+    def _append_course(self, course_index: int, units: list[Unit]) -> None:
+        first_below = self.course_starts[course_index - 1] if course_index > 0 else 0
+        end_below = self.course_starts[course_index]
+        for unit in units:
+            unit_x = unit.box.bottom_left_corner.x
+            while (
+                first_below < end_below
+                and self.x[first_below] + self.length[first_below] < unit_x
+            ):
+                first_below += 1
+            last_below = first_below
+            while (
+                last_below < end_below
+                and self.x[last_below] <= unit_x + unit.box.length
+            ):
+                last_below += 1
+            self.x.append(unit_x)
+            self.length.append(unit.box.length)
+            self.course.append(course_index)
+            self.kind.append(
+                HEAD_JOINT_KIND if isinstance(unit, HeadJoint) else BRICK_KIND
+            )
+            self.built.append(unit.is_built)
+            self.supporters_start.append(first_below)
+            self.supporters_stop.append(last_below)
+            self.dependents_start.append(0)
+            self.dependents_stop.append(0)
+            for below in range(first_below, last_below):
+                if self.dependents_start[below] == self.dependents_stop[below]:
+                    self.dependents_start[below] = len(self.x) - 1
+                self.dependents_stop[below] = len(self.x)
+        self.course_starts.append(len(self.x))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def unit_box(self, index: int) -> Rectangle:
+        return Rectangle(
+            Point(
+                self.x[index],
+                self.course_heights[self.course[index]] + BED_JOINT_THICKNESS,
+            ),
+            self.length[index],
+            BRICK_HEIGHT,
+        )
+
+    def is_supported(self, index: int) -> bool:
+        return all(
+            self.built[self.supporters_start[index] : self.supporters_stop[index]]
+        )
+
+    def unit_ranges_within(self, area: Rectangle) -> Iterator[range]:
+        min_x = area.bottom_left_corner.x
+        max_x = area.bottom_right_corner.x
+        first_course = bisect_left(self.course_heights, area.bottom_left_corner.y)
+        last_course = bisect_right(
+            self.course_heights, area.top_left_corner.y - COURSE_HEIGHT
+        )
+        for course_index in range(first_course, last_course):
+            course_start = self.course_starts[course_index]
+            course_end = self.course_starts[course_index + 1]
+            first = bisect_left(self.x, min_x, course_start, course_end)
+            last = bisect_right(self.x, max_x, first, course_end)
+            if last > first and self.x[last - 1] + self.length[last - 1] > max_x:
+                last -= 1
+            yield range(first, last)
+
+    def lay_stride(self, area: Rectangle) -> list[int]:
+        # units in a course only depend on the course below, so each course is
+        # evaluated as one batch once the batch below it has been built
+        built = self.built
+        kind = self.kind
+        laid = []
+        for units in self.unit_ranges_within(area):
+            layable = [i for i in units if not built[i] and self.is_supported(i)]
+            for i in layable:
+                built[i] = True
+            laid.extend(i for i in layable if kind[i] == BRICK_KIND)
+        return laid
+
+    def as_wall(self) -> Wall:
+        views = [
+            (_HeadJointView if kind == HEAD_JOINT_KIND else _BrickView)(self, i)
+            for i, kind in enumerate(self.kind)
+        ]
+        courses = [
+            Course(
+                height,
+                views[self.course_starts[i] : self.course_starts[i + 1]],
+            )
+            for i, height in enumerate(self.course_heights)
+        ]
+        for view in views:
+            view._views = views
+        return Wall(self.box, courses)
+
+
+class _UnitView:
+    _views: list[Unit]
+
+    def __init__(self, wall: CompactWall, index: int) -> None:
+        self._wall = wall
+        self._index = index
+
+    @property
+    def box(self) -> Rectangle:
+        return self._wall.unit_box(self._index)
+
+    @property
+    def is_built(self) -> bool:
+        return bool(self._wall.built[self._index])
+
+    @is_built.setter
+    def is_built(self, is_built: bool) -> None:
+        self._wall.built[self._index] = is_built
+
+    _is_built = is_built
+
+    @property
+    def supporters(self) -> list[Unit]:
+        start = self._wall.supporters_start[self._index]
+        return self._views[start : self._wall.supporters_stop[self._index]]
+
+    @property
+    def dependents(self) -> list[Unit]:
+        start = self._wall.dependents_start[self._index]
+        return self._views[start : self._wall.dependents_stop[self._index]]
+
+    def is_supported(self, course_below: Optional[Course]) -> bool:
+        return self._wall.is_supported(self._index)
+
+
+class _BrickView(_UnitView, Brick):
+    pass
+
+
+class _HeadJointView(_UnitView, HeadJoint):
+    pass
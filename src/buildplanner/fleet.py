@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .model import Unit, Wall
+from .robot import MoveStrategy, Robot
+from .util import Point, Rectangle
+
+# robots share one wall and work in rounds. in a round every robot lays a stride, and
+# then every robot moves. robots run on one track along the wall, so they keep their
+# order and their envelopes never overlap along it. that also means nothing a robot lays
+# in a round can rest on something another robot lays in the same round, so laying them
+# one after another is the same as laying them at once
+
+
+class FleetStuckException(Exception):
+    pass
+
+
+@dataclass
+class FleetResult:
+    robots: int
+    bricks: int
+    strides: int
+    makespan: int
+    strides_per_robot: list[int]
+
+    @property
+    def bricks_per_round(self) -> float:
+        return self.bricks / self.makespan if self.makespan else 0.0
+
+
+@dataclass
+class ZoneMoveStrategy(MoveStrategy):
+    # picks a robot's next position with the order and alignment of its own move
+    # strategy, from the units in the robot's zone that it can lay now, and between its
+    # neighbours
+    move_strategy: Optional[MoveStrategy] = None
+    fleet: Optional[Fleet] = None
+    index: int = 0
+
+    def next_move(self, robot: Robot, wall: Wall) -> Optional[Rectangle]:
+        first_course = wall.next_non_complete_course()
+        if first_course is None:
+            return None
+        forced_move = self.fleet.forced_move(self.index)
+        if forced_move is not None:
+            return forced_move
+        direction = self.fleet.way_to_make(self.index)
+        area, blocking_unit = self._next_area(
+            robot, wall, first_course.index, direction
+        )
+        if area is None and self.fleet.share_work(self.index):
+            area, blocking_unit = self._next_area(
+                robot, wall, first_course.index, direction
+            )
+        if area is not None:
+            return area
+        min_x, max_x = self.fleet.free_span(self.index)
+        blocked_by = None
+        if blocking_unit is not None:
+            blocked_by = (
+                self.index - 1
+                if blocking_unit.box.bottom_left_corner.x < min_x
+                else self.index + 1
+            )
+        # there's nothing this robot can lay where it's allowed to go, so it asks the
+        # robot in its way to make room, and makes room itself if it's been asked to,
+        # passing the ask on in case there's no room. otherwise it waits in the middle
+        # of the space between its neighbours, as they might be laying what it's
+        # waiting on
+        if blocked_by is not None:
+            self.fleet.make_way(blocked_by, blocked_by - self.index)
+        area = robot.reachable_area
+        if direction < 0:
+            self.fleet.make_way(self.index - 1, -1)
+            x = min_x
+        elif direction > 0:
+            self.fleet.make_way(self.index + 1, 1)
+            x = max_x - area.length
+        else:
+            x = (min_x + max_x - area.length) // 2
+        return Rectangle(Point(x, area.bottom_left_corner.y), area.length, area.height)
+
+    def _next_area(
+        self, robot: Robot, wall: Wall, first_course_index: int, direction: int
+    ) -> tuple[Optional[Rectangle], Optional[Unit]]:
+        min_x, max_x = self.fleet.free_span(self.index)
+        zone_start, zone_end = self.fleet.zone(self.index)
+        blocking_unit = None
+        for course in wall.courses[first_course_index:]:
+            previous_course = (
+                wall.courses[course.index - 1] if course.index > 0 else None
+            )
+            for unit in self.move_strategy._next_units_in_order(course):
+                if (
+                    unit.is_built
+                    or not zone_start <= unit.box.bottom_left_corner.x < zone_end
+                    or not unit.is_supported(previous_course)
+                ):
+                    continue
+                area = self.move_strategy.alignment_strategy.next_reachable_area(
+                    unit, robot, wall
+                )
+                # a neighbour may be in the way of the aligned position, but a shifted
+                # one can still reach the unit
+                x = max(min_x, min(area.bottom_left_corner.x, max_x - area.length))
+                # and a robot that's been asked to make way goes as far as it can while
+                # still reaching the unit
+                if direction < 0:
+                    x = max(min_x, unit.box.bottom_right_corner.x - area.length)
+                elif direction > 0:
+                    x = min(max_x - area.length, unit.box.bottom_left_corner.x)
+                if x <= unit.box.bottom_left_corner.x and (
+                    unit.box.bottom_right_corner.x <= x + area.length
+                ):
+                    return Rectangle(
+                        Point(x, area.bottom_left_corner.y), area.length, area.height
+                    ), None
+                if blocking_unit is None:
+                    blocking_unit = unit
+        return None, blocking_unit
+
+
+class Fleet:
+    def __init__(
+        self,
+        wall: Wall,
+        number_of_robots: int,
+        reachable_area_length: int,
+        reachable_area_height: int,
+        move_strategy: Callable[[], MoveStrategy],
+        dynamic_zones: bool = False,
+    ) -> None:
+        if number_of_robots * reachable_area_length > wall.box.length:
+            raise ValueError(
+                f"{number_of_robots} robots don't fit side by side along the wall"
+            )
+        self._wall = wall
+        self._dynamic_zones = dynamic_zones
+        # every robot starts with an equal slice of the wall. zone i runs from the ith
+        # start up to the next one
+        zone_length = wall.box.length // number_of_robots
+        self._zone_starts = [index * zone_length for index in range(number_of_robots)]
+        self._zone_starts.append(wall.box.length)
+        self.robots = []
+        self._move_strategies = []
+        for index in range(number_of_robots):
+            # every robot gets its own move strategy, as strategies keep state
+            robot_move_strategy = move_strategy()
+            zone_move_strategy = ZoneMoveStrategy(
+                robot_move_strategy.alignment_strategy, robot_move_strategy, self, index
+            )
+            robot = Robot(
+                reachable_area_length, reachable_area_height, zone_move_strategy
+            )
+            # every robot starts at the bottom left of its zone
+            robot.reachable_area = Rectangle(
+                Point(self._zone_starts[index], 0),
+                reachable_area_length,
+                reachable_area_height,
+            )
+            self.robots.append(robot)
+            self._move_strategies.append(zone_move_strategy)
+        self.strides_per_robot = [0] * number_of_robots
+        self.makespan = 0
+        self.bricks = 0
+        self._rounds_without_bricks = 0
+        self._ways_to_make = [0] * number_of_robots
+        self._forced_moves: dict[int, Rectangle] = {}
+
+    @property
+    def envelopes(self) -> list[Rectangle]:
+        return [robot.reachable_area for robot in self.robots]
+
+    def free_span(self, index: int) -> tuple[int, int]:
+        # a robot can move anywhere between its neighbours' envelopes
+        min_x = (
+            self.robots[index - 1].reachable_area.bottom_right_corner.x
+            if index > 0
+            else 0
+        )
+        max_x = (
+            self.robots[index + 1].reachable_area.bottom_left_corner.x
+            if index + 1 < len(self.robots)
+            else self._wall.box.length
+        )
+        return min_x, max_x
+
+    def zone(self, index: int) -> tuple[int, int]:
+        # the units a robot lays are the ones that start in its zone
+        return self._zone_starts[index], self._zone_starts[index + 1]
+
+    def share_work(self, index: int) -> bool:
+        # with dynamic zones a robot that has laid everything in its zone takes over the
+        # nearer half of what's left in its busier neighbour's zone. zones stay in the
+        # robots' order, so robots never need to pass each other to reach their units
+        if not self._dynamic_zones or self._unbuilt_xs(index):
+            return False
+        neighbours = [n for n in (index - 1, index + 1) if 0 <= n < len(self.robots)]
+        busiest = max(neighbours, key=lambda n: len(self._unbuilt_xs(n)), default=None)
+        if busiest is None:
+            return False
+        xs = self._unbuilt_xs(busiest)
+        if not xs:
+            return False
+        if len(xs) == 1:
+            # the last unit of a zone only changes hands if this robot is nearer to it,
+            # so that two robots can't keep taking it off each other
+            if self._distance(index, xs[0]) >= self._distance(busiest, xs[0]):
+                return False
+            self._zone_starts[max(index, busiest)] = (
+                self.zone(busiest)[1] if busiest > index else xs[0]
+            )
+            return True
+        if busiest > index:
+            self._zone_starts[busiest] = next(
+                (x for x in xs[len(xs) // 2 :] if x > xs[0]), self.zone(busiest)[1]
+            )
+        else:
+            self._zone_starts[index] = xs[len(xs) // 2]
+        return True
+
+    def _distance(self, index: int, x: int) -> int:
+        envelope = self.robots[index].reachable_area
+        return max(
+            0,
+            envelope.bottom_left_corner.x - x,
+            x - envelope.bottom_right_corner.x,
+        )
+
+    def _unbuilt_xs(self, index: int) -> list[int]:
+        zone_start, zone_end = self.zone(index)
+        return sorted(
+            unit.box.bottom_left_corner.x
+            for course in self._wall.courses
+            for unit in course.units
+            if not unit.is_built
+            and zone_start <= unit.box.bottom_left_corner.x < zone_end
+        )
+
+    def make_way(self, index: int, direction: int) -> None:
+        # asks a robot to move out of the way, left for -1 and right for 1. the first ask
+        # wins, as robots that cancelled out asks from both sides could keep each other
+        # waiting for ever
+        if 0 <= index < len(self.robots) and not self._ways_to_make[index]:
+            self._ways_to_make[index] = direction
+
+    def way_to_make(self, index: int) -> int:
+        direction = self._ways_to_make[index]
+        self._ways_to_make[index] = 0
+        return direction
+
+    def forced_move(self, index: int) -> Optional[Rectangle]:
+        return self._forced_moves.pop(index, None)
+
+    def is_built(self) -> bool:
+        return self._wall.next_non_complete_course() is None
+
+    def step(self) -> int:
+        laid = 0
+        for index, robot in enumerate(self.robots):
+            bricks = len(robot.lay_stride(self._wall))
+            if bricks:
+                self.strides_per_robot[index] += 1
+                laid += bricks
+        self.makespan += 1
+        self.bricks += laid
+        if self.is_built():
+            return laid
+        self._rounds_without_bricks = 0 if laid else self._rounds_without_bricks + 1
+        # a round without bricks means no robot could get to anything it could lay.
+        # asks to make way mostly sort that out by the next round, and when they don't,
+        # the fleet makes room itself, after which the next round has to lay something
+        if self._rounds_without_bricks == 2:
+            self._unjam()
+        elif self._rounds_without_bricks > 2:
+            raise FleetStuckException(
+                f"{len(self.robots)} robots couldn't finish the wall"
+            )
+        for robot in self.robots:
+            robot.move(self._wall)
+        return laid
+
+    def _unjam(self) -> None:
+        # the nearest robot that can get to the first unit that can be laid goes to it,
+        # and pushes the robots in its way along the track. robot i can only go as far
+        # as leaves room for the i robots before it and the ones after it
+        unit = self._first_unit_to_lay()
+        length = self.robots[0].reachable_area.length
+        slack = self._wall.box.length - len(self.robots) * length
+        xs = [robot.reachable_area.bottom_left_corner.x for robot in self.robots]
+        moves = []
+        for index, x in enumerate(xs):
+            low = max(index * length, unit.box.bottom_right_corner.x - length)
+            high = min(index * length + slack, unit.box.bottom_left_corner.x)
+            if low <= high:
+                to = max(low, min(x, high))
+                moves.append((abs(to - x), index, to))
+        if not moves:
+            raise FleetStuckException(
+                f"{len(self.robots)} robots leave no room to reach every unit"
+            )
+        _, chosen, xs[chosen] = min(moves)
+        for index in range(chosen - 1, -1, -1):
+            xs[index] = min(xs[index], xs[index + 1] - length)
+        for index in range(chosen + 1, len(xs)):
+            xs[index] = max(xs[index], xs[index - 1] + length)
+        for index, robot in enumerate(self.robots):
+            area = robot.reachable_area
+            if index == chosen:
+                area = self._move_strategies[
+                    index
+                ].alignment_strategy.next_reachable_area(unit, robot, self._wall)
+            self._forced_moves[index] = Rectangle(
+                Point(xs[index], area.bottom_left_corner.y), length, area.height
+            )
+        self._ways_to_make = [0] * len(self.robots)
+
+    def _first_unit_to_lay(self) -> Unit:
+        first_course = self._wall.next_non_complete_course()
+        for course in self._wall.courses[first_course.index :]:
+            previous_course = (
+                self._wall.courses[course.index - 1] if course.index > 0 else None
+            )
+            for unit in course.units:
+                if not unit.is_built and unit.is_supported(previous_course):
+                    return unit
+
+    def run(self) -> FleetResult:
+        while not self.is_built():
+            self.step()
+        return FleetResult(
+            len(self.robots),
+            self.bricks,
+            sum(self.strides_per_robot),
+            self.makespan,
+            list(self.strides_per_robot),
+        )
@@ -0,0 +1,136 @@
+import argparse
+import random
+from typing import Callable, Optional
+
+from buildplanner.fleet import Fleet, FleetStuckException
+from buildplanner.parser_util import (
+    ALIGNMENT_STRATEGIES,
+    BONDS,
+    MOVE_STRATEGIES,
+    int_greater_than_0,
+    wall_dimensions,
+)
+from buildplanner.robot import MoveStrategy
+from buildplanner.util import to_fixed_point
+from buildplanner.wall import Bond, create_wall
+
+WALL_LENGTH = 10000
+WALL_HEIGHT = 2000
+ROBOT_BUILD_ENVELOPE_LENGTH = 800
+ROBOT_BUILD_ENVELOPE_HEIGHT = 1300
+MAX_DEFAULT_ROBOTS = 8
+
+# the search strategy plans a whole build for one robot, so it can't share a wall
+FLEET_MOVE_STRATEGIES = {
+    name: move_strategy
+    for name, move_strategy in MOVE_STRATEGIES.items()
+    if name != "search"
+}
+
+
+def main(
+    bond: Bond,
+    move_strategy: Callable[[], MoveStrategy],
+    wall_size: tuple[int, int],
+    robot_counts: Optional[list[int]],
+    dynamic_zones: bool,
+):
+    wall_length, wall_height = wall_size
+    wall = create_wall(to_fixed_point(wall_length), to_fixed_point(wall_height), bond)
+    if robot_counts is None:
+        robots_that_fit = wall_length // ROBOT_BUILD_ENVELOPE_LENGTH
+        robot_counts = list(range(1, min(robots_that_fit, MAX_DEFAULT_ROBOTS) + 1))
+
+    # speedup and efficiency are against the first number of robots
+    print("Robots  Strides  Makespan  Bricks/round  Speedup  Efficiency")
+    first = None
+    for robot_count in robot_counts:
+        # every fleet builds the same wall from scratch
+        wall.reset()
+        try:
+            result = Fleet(
+                wall,
+                robot_count,
+                to_fixed_point(ROBOT_BUILD_ENVELOPE_LENGTH),
+                to_fixed_point(ROBOT_BUILD_ENVELOPE_HEIGHT),
+                move_strategy,
+                dynamic_zones,
+            ).run()
+        except (ValueError, FleetStuckException) as e:
+            print(f"{robot_count:>6}  {e}")
+            continue
+        if first is None:
+            first = result
+        speedup = first.makespan / result.makespan
+        print(
+            f"{result.robots:>6}  {result.strides:>7}  {result.makespan:>8}  "
+            f"{result.bricks_per_round:>12.1f}  {speedup:>7.2f}  "
+            f"{speedup * first.robots / result.robots:>10.2f}"
+        )
+
+
+def parse_args() -> (
+    Bond,
+    Callable[[], MoveStrategy],
+    tuple[int, int],
+    Optional[list[int]],
+    bool,
+):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-b", "--bond", choices=BONDS.keys(), default="stretcher")
+    parser.add_argument(
+        "-m",
+        "--move-strategy",
+        choices=FLEET_MOVE_STRATEGIES.keys(),
+        default="outside_in",
+    )
+    parser.add_argument(
+        "-a",
+        "--alignment-strategy",
+        choices=ALIGNMENT_STRATEGIES.keys(),
+    )
+    parser.add_argument(
+        "-s",
+        "--wall-size",
+        type=wall_dimensions,
+        default=(WALL_LENGTH, WALL_HEIGHT),
+        help="Size of the wall to build, given as LENGTHxHEIGHT in mm",
+    )
+    parser.add_argument(
+        "-n",
+        "--robots",
+        type=int_greater_than_0,
+        nargs="+",
+        help="Numbers of robots to build the wall with. Defaults to 1 up to as many as fit along the wall, at most 8",
+    )
+    parser.add_argument(
+        "-d",
+        "--dynamic-zones",
+        action="store_true",
+        help="Let a robot that has built its own slice of the wall take over half of what's left of a neighbour's",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed for wild bonds and random alignment, so that the results can be reproduced",
+    )
+    args = parser.parse_args()
+    default_align = "right" if args.bond == "flemish" else "center"
+    alignment_strategy = ALIGNMENT_STRATEGIES[args.alignment_strategy or default_align]
+    move_strategy = FLEET_MOVE_STRATEGIES[args.move_strategy]
+    # every robot gets its own alignment stream, from the same seed
+    return (
+        BONDS[args.bond](_rng(args.seed)),
+        lambda: move_strategy(alignment_strategy(_rng(args.seed))),
+        args.wall_size,
+        args.robots,
+        args.dynamic_zones,
+    )
+
+
+def _rng(seed: Optional[int]) -> Optional[random.Random]:
+    return random.Random(seed) if seed is not None else None
+
+
+if __name__ == "__main__":
+    main(*parse_args())
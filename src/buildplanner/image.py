@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import colorsys
+import itertools
+import struct
+import zlib
+from typing import Iterator, Optional
+from xml.sax.saxutils import escape
+
+from .model import Brick, Wall
+from .plan import BuildPlan
+from .util import Rectangle, to_millimetres
+
+# unlike render.Renderer, these draw without turtle and so without a display. a whole
+# image is drawn in one pass and only encoded once it's finished
+
+Colour = tuple[int, int, int]
+
+BACKGROUND = (255, 255, 255)
+UNBUILT = (211, 211, 211)
+LABEL_FONT_SIZE = 24
+PIXELS_PER_MM = 0.5
+GOLDEN_RATIO_CONJUGATE = 0.618033988749895
+
+
+def stride_colour(stride: int) -> Colour:
+    # hues a golden ratio apart keep neighbouring strides easy to tell apart, and the
+    # same stride always gets the same colour
+    red, green, blue = colorsys.hsv_to_rgb(
+        (stride * GOLDEN_RATIO_CONJUGATE) % 1, 0.55, 0.95
+    )
+    return round(red * 255), round(green * 255), round(blue * 255)
+
+
+class Canvas:
+    extension: str
+
+    def draw_brick(self, box: Rectangle, colour: Colour, stride: Optional[int]) -> None:
+        raise NotImplementedError
+
+    def encode(self) -> bytes:
+        raise NotImplementedError
+
+
+class SvgCanvas(Canvas):
+    extension = ".svg"
+
+    def __init__(self, wall: Wall) -> None:
+        self._length = to_millimetres(wall.box.length)
+        self._height = to_millimetres(wall.box.height)
+        self._elements = [
+            f'<rect width="{self._length:g}" height="{self._height:g}" '
+            f'fill="{_hex(BACKGROUND)}"/>'
+        ]
+
+    def draw_brick(self, box: Rectangle, colour: Colour, stride: Optional[int]) -> None:
+        x = to_millimetres(box.bottom_left_corner.x)
+        length = to_millimetres(box.length)
+        height = to_millimetres(box.height)
+        # svg's y axis points down
+        y = self._height - to_millimetres(box.bottom_left_corner.y) - height
+        self._elements.append(
+            f'<rect x="{x:g}" y="{y:g}" width="{length:g}" height="{height:g}" '
+            f'fill="{_hex(colour)}"/>'
+        )
+        if stride is not None:
+            self._elements.append(
+                f'<text x="{x + length / 2:g}" y="{y + height / 2:g}" '
+                f'font-size="{LABEL_FONT_SIZE}" text-anchor="middle" '
+                f'dominant-baseline="central">{escape(str(stride))}</text>'
+            )
+
+    def encode(self) -> bytes:
+        return "\n".join(
+            [
+                '<svg xmlns="http://www.w3.org/2000/svg" '
+                f'width="{self._length:g}mm" height="{self._height:g}mm" '
+                f'viewBox="0 0 {self._length:g} {self._height:g}">',
+                *self._elements,
+                "</svg>\n",
+            ]
+        ).encode()
+
+
+class PngCanvas(Canvas):
+    # a pure python rasteriser, which only has to fill axis aligned rectangles. strides
+    # aren't labelled, as that would need a font
+    extension = ".png"
+
+    def __init__(self, wall: Wall, pixels_per_mm: float = PIXELS_PER_MM) -> None:
+        self._pixels_per_mm = pixels_per_mm
+        self._width = max(1, self._to_pixels(wall.box.length))
+        self._height = max(1, self._to_pixels(wall.box.height))
+        self._pixels = bytearray(bytes(BACKGROUND) * (self._width * self._height))
+
+    def _to_pixels(self, value: int) -> int:
+        return round(to_millimetres(value) * self._pixels_per_mm)
+
+    def draw_brick(self, box: Rectangle, colour: Colour, stride: Optional[int]) -> None:
+        left = min(self._width, self._to_pixels(box.bottom_left_corner.x))
+        right = min(self._width, self._to_pixels(box.bottom_left_corner.x + box.length))
+        bottom = min(self._height, self._to_pixels(box.bottom_left_corner.y))
+        top = min(self._height, self._to_pixels(box.bottom_left_corner.y + box.height))
+        span = bytes(colour) * (right - left)
+        row_length = self._width * 3
+        # rows are stored from the top of the image down
+        for row in range(self._height - top, self._height - bottom):
+            start = row * row_length + left * 3
+            self._pixels[start : start + len(span)] = span
+
+    def encode(self) -> bytes:
+        row_length = self._width * 3
+        # every row starts with its filter type, and none of them are filtered
+        rows = b"".join(
+            b"\x00" + self._pixels[start : start + row_length]
+            for start in range(0, len(self._pixels), row_length)
+        )
+        return b"".join(
+            [
+                b"\x89PNG\r\n\x1a\n",
+                _png_chunk(
+                    b"IHDR",
+                    struct.pack(">IIBBBBB", self._width, self._height, 8, 2, 0, 0, 0),
+                ),
+                _png_chunk(b"IDAT", zlib.compress(rows)),
+                _png_chunk(b"IEND", b""),
+            ]
+        )
+
+
+def render(canvas: Canvas, wall: Wall, plan: Optional[BuildPlan] = None) -> bytes:
+    _draw_wall(canvas, wall)
+    if plan is not None:
+        for planned_brick in plan:
+            canvas.draw_brick(
+                planned_brick.box,
+                stride_colour(planned_brick.stride),
+                planned_brick.stride,
+            )
+    return canvas.encode()
+
+
+def render_frames(canvas: Canvas, wall: Wall, plan: BuildPlan) -> Iterator[bytes]:
+    # frame n shows the wall once stride n is finished. each frame only draws the
+    # bricks of its own stride over the frame before it
+    _draw_wall(canvas, wall)
+    for stride, planned_bricks in itertools.groupby(
+        plan, key=lambda planned_brick: planned_brick.stride
+    ):
+        for planned_brick in planned_bricks:
+            canvas.draw_brick(planned_brick.box, stride_colour(stride), stride)
+        yield canvas.encode()
+
+
+def _draw_wall(canvas: Canvas, wall: Wall) -> None:
+    for course in wall.courses:
+        for unit in course.units:
+            if isinstance(unit, Brick):
+                canvas.draw_brick(unit.box, UNBUILT, None)
+
+
+def _hex(colour: Colour) -> str:
+    return "#{:02x}{:02x}{:02x}".format(*colour)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + kind
+        + data
+        + struct.pack(">I", zlib.crc32(kind + data))
+    )
@@ -1,26 +1,44 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
 from typing import Optional
 
-from .util import Rectangle, Point
+from .util import Rectangle, Point, to_fixed_point
 
-FULL_BRICK_LENGTH = 210
-HALF_BRICK_LENGTH = 100
-THREE_QUARTER_BRICK_LENGTH = 155
-QUARTER_BRICK_LENGTH = 45
-BRICK_HEIGHT = 50
-BED_JOINT_THICKNESS = 12.5
-HEAD_JOINT_THICKNESS = 10
+FULL_BRICK_LENGTH = to_fixed_point(210)
+HALF_BRICK_LENGTH = to_fixed_point(100)
+THREE_QUARTER_BRICK_LENGTH = to_fixed_point(155)
+QUARTER_BRICK_LENGTH = to_fixed_point(45)
+BRICK_HEIGHT = to_fixed_point(50)
+BED_JOINT_THICKNESS = to_fixed_point(12.5)
+HEAD_JOINT_THICKNESS = to_fixed_point(10)
 COURSE_HEIGHT = BED_JOINT_THICKNESS + BRICK_HEIGHT
 
 
-@dataclass
+@dataclass(slots=True)
 class Unit:
     box: Rectangle
-    is_built: bool = False
+    _is_built: bool = False
+    supporters: Optional[list[Unit]] = field(default=None, compare=False, repr=False)
+    dependents: list[Unit] = field(default_factory=list, compare=False, repr=False)
+    _unbuilt_supporters: int = field(default=0, compare=False, repr=False)
+
+    @property
+    def is_built(self) -> bool:
+        return self._is_built
+
+    @is_built.setter
+    def is_built(self, is_built: bool) -> None:
+        if is_built != self._is_built:
+            change = -1 if is_built else 1
+            for dependent in self.dependents:
+                dependent._unbuilt_supporters += change
+        self._is_built = is_built
 
     def is_supported(self, course_below: Optional[Course]) -> bool:
+        if self.supporters is not None:
+            return self._unbuilt_supporters == 0
         if course_below is None:
             return True
         for unit_below in course_below.units:
@@ -33,6 +51,8 @@ class Unit:
 
 
 class Brick(Unit):
+    __slots__ = ()
+
     @staticmethod
     def create_full_brick(bottom_left_corner: Point) -> Brick:
         return Brick(Rectangle(bottom_left_corner, FULL_BRICK_LENGTH, BRICK_HEIGHT))
@@ -53,6 +73,8 @@ class Brick(Unit):
 
 
 class HeadJoint(Unit):
+    __slots__ = ()
+
     @staticmethod
     def create_head_joint(bottom_left_corner: Point) -> HeadJoint:
         return HeadJoint(
@@ -60,15 +82,19 @@ class HeadJoint(Unit):
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Course:
-    height: float
+    height: int
     units: list[Unit]
     _is_built: bool = False
+    _unit_xs: Optional[list[int]] = field(default=None, compare=False, repr=False)
+    _joint_positions: Optional[set[int]] = field(
+        default=None, compare=False, repr=False
+    )
 
     @property
     def index(self) -> int:
-        return int(self.height / COURSE_HEIGHT)
+        return self.height // COURSE_HEIGHT
 
     def is_built(self) -> bool:
         if self._is_built:
@@ -79,11 +105,70 @@ class Course:
         self._is_built = True
         return True
 
-    def joint_exists_at(self, x: float) -> bool:
+    def support_spans(self, course_below: Optional[Course]) -> list[range]:
+        # units in both courses are ordered by x, so the units below that support each
+        # unit form a window that only ever slides to the right
+        units_below = course_below.units if course_below is not None else []
+        spans = []
+        first_below = 0
+        for unit in self.units:
+            unit_x = unit.box.bottom_left_corner.x
+            while first_below < len(units_below) and (
+                units_below[first_below].box.bottom_left_corner.x
+                + units_below[first_below].box.length
+                < unit_x
+            ):
+                first_below += 1
+            last_below = first_below
+            while last_below < len(units_below) and units_below[last_below]._supports(
+                unit
+            ):
+                last_below += 1
+            spans.append(range(first_below, last_below))
+        return spans
+
+    def link_supports(
+        self, course_below: Optional[Course], spans: Optional[list[range]] = None
+    ) -> None:
+        units_below = course_below.units if course_below is not None else []
+        if spans is None:
+            spans = self.support_spans(course_below)
+        for unit_below in units_below:
+            unit_below.dependents = []
+        for unit, span in zip(self.units, spans):
+            unit.supporters = units_below[span.start : span.stop]
+            unit._unbuilt_supporters = 0
+            for unit_below in unit.supporters:
+                unit_below.dependents.append(unit)
+                if not unit_below.is_built:
+                    unit._unbuilt_supporters += 1
+
+    def units_within(self, min_x: int, max_x: int) -> list[Unit]:
+        if self._unit_xs is None:
+            self._unit_xs = [unit.box.bottom_left_corner.x for unit in self.units]
+        first = bisect_left(self._unit_xs, min_x)
+        last = bisect_right(self._unit_xs, max_x)
+        if last > first:
+            last_box = self.units[last - 1].box
+            if last_box.bottom_left_corner.x + last_box.length > max_x:
+                last -= 1
+        return self.units[first:last]
+
+    def joint_exists_at(self, x: int) -> bool:
+        if self._joint_positions is None:
+            self._joint_positions = {
+                unit.box.bottom_left_corner.x
+                for unit in self.units
+                if isinstance(unit, HeadJoint)
+            }
+        return x in self._joint_positions
+
+    def reset(self) -> None:
         for unit in self.units:
-            if unit.box.bottom_left_corner.x == x and isinstance(unit, HeadJoint):
-                return True
-        return False
+            unit._is_built = False
+            if unit.supporters is not None:
+                unit._unbuilt_supporters = len(unit.supporters)
+        self._is_built = False
 
 
 @dataclass
@@ -91,6 +176,22 @@ class Wall:
     box: Rectangle
     courses: list[Course]
     _is_built: bool = False
+    _course_heights: Optional[list[int]] = field(
+        default=None, compare=False, repr=False
+    )
+
+    def course_indices_within(self, min_y: int, max_y: int) -> range:
+        if self._course_heights is None:
+            self._course_heights = [course.height for course in self.courses]
+        return range(
+            bisect_left(self._course_heights, min_y),
+            bisect_right(self._course_heights, max_y - COURSE_HEIGHT),
+        )
+
+    def reset(self) -> None:
+        for course in self.courses:
+            course.reset()
+        self._is_built = False
 
     def next_non_complete_course(self) -> Optional[Course]:
         if self._is_built:
@@ -8,6 +8,7 @@ from buildplanner.robot import (
     CenterAlignmentStrategy,
     RandomAlignmentStrategy,
 )
+from buildplanner.search import SearchMoveStrategy
 from buildplanner.wall import StretcherBond, CrossBond, FlemishBond, WildBond
 
 BONDS = {
@@ -21,6 +22,7 @@ MOVE_STRATEGIES = {
     "outside_in": OutsideInMoveStrategy,
     "snake": SnakeMoveStrategy,
     "dynamic_snake": DynamicSnakeMoveStrategy,
+    "search": SearchMoveStrategy,
 }
 ALIGNMENT_STRATEGIES = {
     "left": LeftAlignmentStrategy,
@@ -35,3 +37,22 @@ def int_greater_than_0(val: str) -> int:
     if val < 1:
         raise ValueError("Must be an int greater than 0")
     return val
+
+
+def wall_dimensions(val: str) -> tuple[int, int]:
+    length, _, height = val.partition("x")
+    return int_greater_than_0(length), int_greater_than_0(height)
+
+
+def int_range(val: str) -> list[int]:
+    # START:STOP:STEP includes STOP when the steps land on it, and a single int is a
+    # range of one
+    start, _, rest = val.partition(":")
+    if not rest:
+        return [int_greater_than_0(start)]
+    stop, _, step = rest.partition(":")
+    start, stop = int_greater_than_0(start), int_greater_than_0(stop)
+    step = int_greater_than_0(step) if step else 1
+    if stop < start:
+        raise ValueError("Range must not end before it starts")
+    return list(range(start, stop + 1, step))
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import itertools
+import json
+import mmap
+import struct
+from dataclasses import dataclass
+from typing import Iterator, Union
+
+from .model import Brick, Wall
+from .robot import Robot
+from .util import (
+    FIXED_POINT_SCALE,
+    Point,
+    Rectangle,
+    to_fixed_point,
+    to_millimetres,
+)
+
+# a plan file is a header followed by fixed size records, one per brick in the order
+# they're laid, with all geometry in fixed point units. plans are held in memory in the
+# same layout, so writing one is a single write and reading one is a memory map
+MAGIC = b"BPLN"
+VERSION = 1
+HEADER = struct.Struct("<4sHH")
+RECORD = struct.Struct("<I4iI4i")
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedBrick:
+    stride: int
+    envelope: Rectangle
+    brick_id: int
+    box: Rectangle
+
+
+class BuildPlan:
+    def __init__(self, buffer: Union[bytearray, mmap.mmap, None] = None) -> None:
+        if buffer is None:
+            buffer = bytearray(HEADER.pack(MAGIC, VERSION, FIXED_POINT_SCALE))
+        if len(buffer) < HEADER.size:
+            raise ValueError("Not a build plan")
+        magic, version, scale = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a build plan, or one of an unsupported version")
+        if scale != FIXED_POINT_SCALE:
+            raise ValueError(f"Build plan has a fixed point scale of {scale}")
+        if (len(buffer) - HEADER.size) % RECORD.size:
+            raise ValueError("Build plan is truncated")
+        self._buffer = buffer
+
+    @staticmethod
+    def compile(wall: Wall, robot: Robot) -> BuildPlan:
+        # bricks are identified by their position in the wall, counting course by course
+        # from the bottom left
+        brick_ids = {
+            id(unit): brick_id
+            for brick_id, unit in enumerate(
+                unit
+                for course in wall.courses
+                for unit in course.units
+                if isinstance(unit, Brick)
+            )
+        }
+        plan = BuildPlan()
+        while True:
+            stride = robot.move_count + 1
+            for brick in robot.lay_stride(wall):
+                plan.append(
+                    PlannedBrick(
+                        stride, robot.reachable_area, brick_ids[id(brick)], brick.box
+                    )
+                )
+            if not robot.move(wall):
+                return plan
+
+    def append(self, planned_brick: PlannedBrick) -> None:
+        envelope = planned_brick.envelope
+        box = planned_brick.box
+        self._buffer += RECORD.pack(
+            planned_brick.stride,
+            envelope.bottom_left_corner.x,
+            envelope.bottom_left_corner.y,
+            envelope.length,
+            envelope.height,
+            planned_brick.brick_id,
+            box.bottom_left_corner.x,
+            box.bottom_left_corner.y,
+            box.length,
+            box.height,
+        )
+
+    def __len__(self) -> int:
+        return (len(self._buffer) - HEADER.size) // RECORD.size
+
+    def __getitem__(self, index: int) -> PlannedBrick:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("build plan index out of range")
+        return _planned_brick(
+            RECORD.unpack_from(self._buffer, HEADER.size + index * RECORD.size)
+        )
+
+    def __iter__(self) -> Iterator[PlannedBrick]:
+        records = memoryview(self._buffer)[HEADER.size :]
+        try:
+            for record in RECORD.iter_unpack(records):
+                yield _planned_brick(record)
+        finally:
+            records.release()
+
+    @property
+    def strides(self) -> int:
+        return self[-1].stride if len(self) else 0
+
+    def bricks_laid_by_stride(self) -> list[int]:
+        # entry n is the number of bricks laid once stride n is finished, so stride n lays
+        # the bricks from entry n - 1 up to entry n
+        bricks_per_stride = [0] * (self.strides + 1)
+        for planned_brick in self:
+            bricks_per_stride[planned_brick.stride] += 1
+        return list(itertools.accumulate(bricks_per_stride))
+
+    def write(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(self._buffer)
+
+    @staticmethod
+    def read(path: str) -> BuildPlan:
+        with open(path, "rb") as file:
+            return BuildPlan(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def json_records(self) -> Iterator[dict]:
+        # JSON is for people and other tools, so it's in millimetres
+        for planned_brick in self:
+            yield {
+                "stride": planned_brick.stride,
+                "envelope": _rectangle_to_millimetres(planned_brick.envelope),
+                "brick_id": planned_brick.brick_id,
+                "brick": _rectangle_to_millimetres(planned_brick.box),
+            }
+
+    def write_json_lines(self, path: str) -> None:
+        with open(path, "w") as file:
+            for record in self.json_records():
+                file.write(json.dumps(record) + "\n")
+
+    @staticmethod
+    def read_json_lines(path: str) -> BuildPlan:
+        plan = BuildPlan()
+        with open(path) as file:
+            for line in file:
+                record = json.loads(line)
+                plan.append(
+                    PlannedBrick(
+                        record["stride"],
+                        _rectangle_from_millimetres(record["envelope"]),
+                        record["brick_id"],
+                        _rectangle_from_millimetres(record["brick"]),
+                    )
+                )
+        return plan
+
+
+def _planned_brick(record: tuple[int, ...]) -> PlannedBrick:
+    (
+        stride,
+        envelope_x,
+        envelope_y,
+        envelope_length,
+        envelope_height,
+        brick_id,
+        x,
+        y,
+        length,
+        height,
+    ) = record
+    return PlannedBrick(
+        stride,
+        Rectangle(Point(envelope_x, envelope_y), envelope_length, envelope_height),
+        brick_id,
+        Rectangle(Point(x, y), length, height),
+    )
+
+
+def _rectangle_to_millimetres(rectangle: Rectangle) -> list[float]:
+    return [
+        to_millimetres(rectangle.bottom_left_corner.x),
+        to_millimetres(rectangle.bottom_left_corner.y),
+        to_millimetres(rectangle.length),
+        to_millimetres(rectangle.height),
+    ]
+
+
+def _rectangle_from_millimetres(values: list[float]) -> Rectangle:
+    x, y, length, height = (to_fixed_point(value) for value in values)
+    return Rectangle(Point(x, y), length, height)
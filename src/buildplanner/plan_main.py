@@ -0,0 +1,175 @@
+import argparse
+import os
+import random
+from typing import Optional
+
+from buildplanner.image import PngCanvas, SvgCanvas, render, render_frames
+from buildplanner.model import Wall
+from buildplanner.parser_util import (
+    ALIGNMENT_STRATEGIES,
+    BONDS,
+    MOVE_STRATEGIES,
+    wall_dimensions,
+)
+from buildplanner.plan import BuildPlan
+from buildplanner.robot import Robot, MoveStrategy
+from buildplanner.stats import dumping_to
+from buildplanner.util import to_fixed_point
+from buildplanner.wall import Bond, create_wall
+
+WALL_LENGTH = 2300
+WALL_HEIGHT = 2000
+ROBOT_BUILD_ENVELOPE_LENGTH = 800
+ROBOT_BUILD_ENVELOPE_HEIGHT = 1300
+
+IMAGE_CANVASES = {".svg": SvgCanvas, ".png": PngCanvas}
+
+
+def main(
+    bond: Bond,
+    move_strategy: MoveStrategy,
+    wall_size: tuple[int, int],
+    output: Optional[str],
+    image: Optional[str],
+    frames: bool,
+    stats_path: Optional[str] = None,
+    envelope: tuple[int, int] = (
+        ROBOT_BUILD_ENVELOPE_LENGTH,
+        ROBOT_BUILD_ENVELOPE_HEIGHT,
+    ),
+):
+    wall_length, wall_height = wall_size
+    envelope_length, envelope_height = envelope
+    # stats cover planning the wall and laying it, but not writing it out
+    with dumping_to(stats_path):
+        wall = create_wall(
+            to_fixed_point(wall_length), to_fixed_point(wall_height), bond
+        )
+        robot = Robot(
+            to_fixed_point(envelope_length),
+            to_fixed_point(envelope_height),
+            move_strategy,
+        )
+        plan = BuildPlan.compile(wall, robot)
+    if output is not None:
+        if output.endswith(".jsonl"):
+            plan.write_json_lines(output)
+        else:
+            plan.write(output)
+        print(f"Wrote {len(plan)} bricks in {plan.strides} strides to {output}")
+    if image is not None:
+        write_images(wall, plan, image, frames)
+
+
+def write_images(wall: Wall, plan: BuildPlan, image: str, frames: bool) -> None:
+    stem, extension = os.path.splitext(image)
+    canvas = IMAGE_CANVASES[extension]
+    with open(image, "wb") as file:
+        file.write(render(canvas(wall), wall, plan))
+    print(f"Drew the plan to {image}")
+    if frames:
+        digits = len(str(plan.strides))
+        for stride, frame in enumerate(render_frames(canvas(wall), wall, plan), 1):
+            with open(f"{stem}-{stride:0{digits}}{extension}", "wb") as file:
+                file.write(frame)
+        print(f"Drew {plan.strides} frames to {stem}-*{extension}")
+
+
+def _rng(seed: Optional[int]) -> Optional[random.Random]:
+    return random.Random(seed) if seed is not None else None
+
+
+def parse_args() -> (
+    Bond,
+    MoveStrategy,
+    tuple[int, int],
+    Optional[str],
+    Optional[str],
+    bool,
+    Optional[str],
+    tuple[int, int],
+):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-b", "--bond", choices=BONDS.keys(), default="stretcher")
+    parser.add_argument(
+        "-m",
+        "--move-strategy",
+        choices=MOVE_STRATEGIES.keys(),
+        default="outside_in",
+    )
+    parser.add_argument(
+        "-a",
+        "--alignment-strategy",
+        choices=ALIGNMENT_STRATEGIES.keys(),
+    )
+    parser.add_argument(
+        "-s",
+        "--wall-size",
+        type=wall_dimensions,
+        default=(WALL_LENGTH, WALL_HEIGHT),
+        help="Size of the wall to plan, given as LENGTHxHEIGHT in mm",
+    )
+    parser.add_argument(
+        "-e",
+        "--envelope",
+        type=wall_dimensions,
+        default=(ROBOT_BUILD_ENVELOPE_LENGTH, ROBOT_BUILD_ENVELOPE_HEIGHT),
+        help="Size of the robot's build envelope, given as LENGTHxHEIGHT in mm",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed for wild bonds and random alignment, so that the plan can be reproduced",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="File to write the plan to. Files ending in .jsonl get JSON lines in mm, anything else gets the binary format",
+    )
+    parser.add_argument(
+        "-i",
+        "--image",
+        help="File to draw the plan to, coloured by stride. It must end in .svg or .png",
+    )
+    parser.add_argument(
+        "-f",
+        "--frames",
+        action="store_true",
+        help="Also draw the wall after each stride, next to the image and numbered by stride",
+    )
+
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="-",
+        help="Count and time the planner's hot paths while planning, and print them or write them as JSON to the given file",
+    )
+
+    args = parser.parse_args()
+    if args.output is None and args.image is None:
+        parser.error("at least one of --output and --image is required")
+    if args.image is not None and os.path.splitext(args.image)[1] not in IMAGE_CANVASES:
+        parser.error("--image must end in .svg or .png")
+    if args.frames and args.image is None:
+        parser.error("--frames needs an --image")
+    default_align = "right" if args.bond == "flemish" else "center"
+    # the bond and the alignment strategy get their own streams, like in the planner,
+    # so that a plan matches the planner's result for the same seed
+    return (
+        BONDS[args.bond](_rng(args.seed)),
+        MOVE_STRATEGIES[args.move_strategy](
+            ALIGNMENT_STRATEGIES[args.alignment_strategy or default_align](
+                _rng(args.seed)
+            )
+        ),
+        args.wall_size,
+        args.output,
+        args.image,
+        args.frames,
+        args.stats,
+        args.envelope,
+    )
+
+
+if __name__ == "__main__":
+    main(*parse_args())
@@ -1,63 +1,258 @@
 import argparse
 import itertools
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from typing import Optional
 
-from buildplanner.parser_util import BONDS
+from buildplanner.parser_util import (
+    ALIGNMENT_STRATEGIES,
+    BONDS,
+    MOVE_STRATEGIES,
+    int_greater_than_0,
+    wall_dimensions,
+)
 from buildplanner.robot import (
-    LeftAlignmentStrategy,
-    RightAlignmentStrategy,
-    CenterAlignmentStrategy,
+    AlignmentStrategy,
+    MoveStrategy,
     RandomAlignmentStrategy,
-    LeftToRightMoveStrategy,
-    OutsideInMoveStrategy,
-    SnakeMoveStrategy,
     Robot,
-    DynamicSnakeMoveStrategy,
 )
-from buildplanner.wall import Bond, create_wall
+from buildplanner.stats import Stats, collecting
+from buildplanner.util import to_fixed_point
+from buildplanner.wall import Bond, WallCache
 
 WALL_LENGTH = 2300
 WALL_HEIGHT = 2000
 ROBOT_BUILD_ENVELOPE_LENGTH = 800
 ROBOT_BUILD_ENVELOPE_HEIGHT = 1300
 
+Combination = tuple[
+    type[Bond], tuple[int, int], type[AlignmentStrategy], type[MoveStrategy]
+]
+
+
+# each worker process keeps its own cache, and trials that plan the same wall are run
+# back to back so that they can share it
+_WALL_CACHE = WallCache()
+
+
+def count_strides(
+    combination: Combination,
+    seed: Optional[int] = None,
+    envelope: tuple[int, int] = (
+        ROBOT_BUILD_ENVELOPE_LENGTH,
+        ROBOT_BUILD_ENVELOPE_HEIGHT,
+    ),
+) -> int:
+    bond, (wall_length, wall_height), alignment_strategy, move_strategy = combination
+    envelope_length, envelope_height = envelope
+    wall = _WALL_CACHE.get(
+        to_fixed_point(wall_length), to_fixed_point(wall_height), bond, seed
+    )
+    rng = random.Random(seed) if seed is not None else None
+    robot = Robot(
+        to_fixed_point(envelope_length),
+        to_fixed_point(envelope_height),
+        move_strategy(alignment_strategy(rng)),
+    )
+    while True:
+        robot.lay_stride(wall)
+        if not robot.move(wall):
+            break
+    return robot.move_count + 1
+
+
+def _count_strides_of_trial(
+    trial: tuple[Combination, Optional[int], tuple[int, int], bool],
+) -> tuple[int, Optional[Stats]]:
+    # stats are collected in whichever process runs the trial, and sent back with it
+    combination, seed, envelope, collect_stats = trial
+    if not collect_stats:
+        return count_strides(combination, seed, envelope), None
+    with collecting() as stats:
+        return count_strides(combination, seed, envelope), stats
+
+
+def _is_random(combination: Combination) -> bool:
+    bond, _, alignment_strategy, _ = combination
+    return bond.is_random() or issubclass(alignment_strategy, RandomAlignmentStrategy)
 
-def try_all_move_strategies(bond: Bond):
-    alignment_strategies = [
-        LeftAlignmentStrategy,
-        RightAlignmentStrategy,
-        CenterAlignmentStrategy,
-        RandomAlignmentStrategy,
+
+def try_all_move_strategies(
+    bonds: list[type[Bond]],
+    wall_sizes: list[tuple[int, int]],
+    workers: Optional[int],
+    trials: int,
+    seed: Optional[int],
+    stats_path: Optional[str] = None,
+    envelope: tuple[int, int] = (
+        ROBOT_BUILD_ENVELOPE_LENGTH,
+        ROBOT_BUILD_ENVELOPE_HEIGHT,
+    ),
+):
+    combinations = list(
+        itertools.product(
+            bonds,
+            wall_sizes,
+            ALIGNMENT_STRATEGIES.values(),
+            MOVE_STRATEGIES.values(),
+        )
+    )
+    if seed is None and trials > 1:
+        seed = 0
+    # every trial gets its own seed, and so its own RNG stream, so any result can be
+    # reproduced on its own with --seed and --trials 1
+    seeds_of_combinations = [
+        [seed + trial for trial in range(trials if _is_random(combination) else 1)]
+        if seed is not None
+        else [None]
+        for combination in combinations
+    ]
+    # combinations of the same bond and wall size are adjacent, so running them trial
+    # by trial plans each wall once and then reuses it from the cache
+    trial_indices = []
+    for _, wall_combinations in itertools.groupby(
+        range(len(combinations)), key=lambda i: combinations[i][:2]
+    ):
+        wall_combinations = list(wall_combinations)
+        for trial in range(
+            max(len(seeds_of_combinations[i]) for i in wall_combinations)
+        ):
+            for i in wall_combinations:
+                if trial < len(seeds_of_combinations[i]):
+                    trial_indices.append((i, trial))
+    trials_to_run = [
+        (
+            combinations[i],
+            seeds_of_combinations[i][trial],
+            envelope,
+            stats_path is not None,
+        )
+        for i, trial in trial_indices
     ]
-    move_strategies = [
-        LeftToRightMoveStrategy,
-        OutsideInMoveStrategy,
-        SnakeMoveStrategy,
-        DynamicSnakeMoveStrategy,
+    if workers == 1:
+        results = list(map(_count_strides_of_trial, trials_to_run))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(
+                    _count_strides_of_trial,
+                    trials_to_run,
+                    chunksize=max(
+                        1, len(trials_to_run) // (8 * (workers or cpu_count()))
+                    ),
+                )
+            )
+    stride_counts_of_combinations = [
+        [0] * len(seeds) for seeds in seeds_of_combinations
     ]
+    total_stats = Stats()
+    for (i, trial), (stride_count, stats) in zip(trial_indices, results):
+        stride_counts_of_combinations[i][trial] = stride_count
+        if stats is not None:
+            total_stats.merge(stats)
+    _print_stride_counts(
+        combinations, seeds_of_combinations, stride_counts_of_combinations
+    )
+    if stats_path is not None:
+        total_stats.dump(stats_path)
+
 
-    for alignment_strategy, move_strategy in itertools.product(
-        alignment_strategies, move_strategies
+def _print_stride_counts(
+    combinations: list[Combination],
+    seeds_of_combinations: list[list[Optional[int]]],
+    stride_counts_of_combinations: list[list[int]],
+) -> None:
+    for combination, seeds, counts in zip(
+        combinations, seeds_of_combinations, stride_counts_of_combinations
     ):
-        print("Trying ", alignment_strategy.__name__, move_strategy.__name__)
-        wall = create_wall(WALL_LENGTH, WALL_HEIGHT, bond)
-        robot = Robot(
-            ROBOT_BUILD_ENVELOPE_LENGTH,
-            ROBOT_BUILD_ENVELOPE_HEIGHT,
-            move_strategy(alignment_strategy()),
+        bond, (wall_length, wall_height), alignment_strategy, move_strategy = (
+            combination
+        )
+        print(
+            "Trying ",
+            bond.__name__,
+            f"{wall_length}x{wall_height}",
+            alignment_strategy.__name__,
+            move_strategy.__name__,
+        )
+        if len(counts) == 1:
+            print("Total number of strides: ", counts[0])
+            continue
+        percentiles = statistics.quantiles(counts, n=20, method="inclusive")
+        best_count, best_seed = min(zip(counts, seeds))
+        print(
+            f"Strides over {len(counts)} trials: min {best_count}, "
+            f"mean {statistics.fmean(counts):.2f}, p5 {percentiles[0]:g}, "
+            f"p50 {percentiles[9]:g}, p95 {percentiles[18]:g}, best seed {best_seed}"
         )
-        while True:
-            if robot.lay_brick(wall) is None:
-                if not robot.move(wall):
-                    break
-        print("Total number of strides: ", robot.move_count + 1)
 
 
-def parse_args() -> Bond:
+def parse_args() -> (
+    list[type[Bond]],
+    list[tuple[int, int]],
+    Optional[int],
+    int,
+    Optional[int],
+    Optional[str],
+    tuple[int, int],
+):
     parser = argparse.ArgumentParser()
-    parser.add_argument("-b", "--bond", choices=BONDS.keys(), default="stretcher")
+    parser.add_argument(
+        "-b", "--bond", choices=BONDS.keys(), nargs="+", default=["stretcher"]
+    )
+    parser.add_argument(
+        "-s",
+        "--wall-size",
+        type=wall_dimensions,
+        nargs="+",
+        default=[(WALL_LENGTH, WALL_HEIGHT)],
+        help="One or more wall sizes to plan, given as LENGTHxHEIGHT in mm",
+    )
+    parser.add_argument(
+        "-e",
+        "--envelope",
+        type=wall_dimensions,
+        default=(ROBOT_BUILD_ENVELOPE_LENGTH, ROBOT_BUILD_ENVELOPE_HEIGHT),
+        help="Size of the robot's build envelope, given as LENGTHxHEIGHT in mm",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int_greater_than_0,
+        help="Number of worker processes, defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "-t",
+        "--trials",
+        type=int_greater_than_0,
+        default=1,
+        help="Number of seeded trials to run for each combination that uses a wild bond or random alignment",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed of the first trial, trial n uses seed + n. Defaults to 0 when running more than one trial",
+    )
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="-",
+        help="Count and time the planner's hot paths over all trials, and print them or write them as JSON to the given file",
+    )
     args = parser.parse_args()
-    return BONDS[args.bond]()
+    return (
+        [BONDS[bond] for bond in args.bond],
+        args.wall_size,
+        args.workers,
+        args.trials,
+        args.seed,
+        args.stats,
+        args.envelope,
+    )
 
 
 if __name__ == "__main__":
-    try_all_move_strategies(parse_args())
+    try_all_move_strategies(*parse_args())
@@ -1,9 +1,12 @@
-from typing import Optional
+from typing import Callable, Optional
 
 from .model import Brick, Wall
+from .plan import BuildPlan
+from .util import Point, Rectangle, to_millimetres
 from turtle import Turtle
 
 FONT_HEIGHT_ADJUSTMENT = 10
+UNBUILT_COLOUR = "LightGrey"
 
 
 class Renderer:
@@ -17,33 +20,73 @@ class Renderer:
         for course in wall.courses:
             for unit in course.units:
                 if isinstance(unit, Brick):
-                    self.render_brick(unit, "LightGrey", None)
+                    self.render_brick(unit, UNBUILT_COLOUR, None)
 
     def render_brick(self, brick: Brick, colour: str, stride: Optional[int]) -> None:
-        self._turtle.goto(
-            brick.box.bottom_left_corner.x, brick.box.bottom_left_corner.y
-        )
+        self.render_box(brick.box, colour, stride)
+
+    def render_box(self, box: Rectangle, colour: str, stride: Optional[int]) -> None:
+        self._goto(box.bottom_left_corner)
         self._turtle.color(colour)
         self._turtle.pendown()
 
         self._turtle.begin_fill()
-        self._turtle.goto(brick.box.top_left_corner.x, brick.box.top_left_corner.y)
-        self._turtle.goto(brick.box.top_right_corner.x, brick.box.top_right_corner.y)
-        self._turtle.goto(
-            brick.box.bottom_right_corner.x, brick.box.bottom_right_corner.y
-        )
-        self._turtle.goto(
-            brick.box.bottom_left_corner.x, brick.box.bottom_left_corner.y
-        )
+        self._goto(box.top_left_corner)
+        self._goto(box.top_right_corner)
+        self._goto(box.bottom_right_corner)
+        self._goto(box.bottom_left_corner)
         self._turtle.end_fill()
 
         if stride is not None:
             self._turtle.color("black")
             self._turtle.penup()
             self._turtle.goto(
-                brick.box.middle.x, brick.box.middle.y - FONT_HEIGHT_ADJUSTMENT
+                to_millimetres(box.middle.x),
+                to_millimetres(box.middle.y) - FONT_HEIGHT_ADJUSTMENT,
             )
             self._turtle.pendown()
             self._turtle.write(stride, align="center")
 
         self._turtle.penup()
+
+    def _goto(self, point: Point) -> None:
+        # the screen is set up in millimetres
+        self._turtle.goto(to_millimetres(point.x), to_millimetres(point.y))
+
+
+class StridePlayer:
+    # plays a precomputed plan a stride at a time, and can seek to any stride in either
+    # direction by drawing only the strides in between. seeking backwards paints those
+    # strides' bricks back over in grey
+    def __init__(
+        self,
+        renderer: Renderer,
+        plan: BuildPlan,
+        colour_of_stride: Callable[[int], str],
+    ) -> None:
+        self._renderer = renderer
+        self._plan = plan
+        self._colour_of_stride = colour_of_stride
+        self._bricks_laid_by_stride = plan.bricks_laid_by_stride()
+        self.stride = 0
+
+    def seek(self, stride: int) -> None:
+        stride = max(0, min(stride, self._plan.strides))
+        if stride > self.stride:
+            for index in range(
+                self._bricks_laid_by_stride[self.stride],
+                self._bricks_laid_by_stride[stride],
+            ):
+                planned_brick = self._plan[index]
+                self._renderer.render_box(
+                    planned_brick.box,
+                    self._colour_of_stride(planned_brick.stride),
+                    planned_brick.stride,
+                )
+        else:
+            for index in range(
+                self._bricks_laid_by_stride[stride],
+                self._bricks_laid_by_stride[self.stride],
+            ):
+                self._renderer.render_box(self._plan[index].box, UNBUILT_COLOUR, None)
+        self.stride = stride
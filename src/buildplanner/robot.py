@@ -1,18 +1,21 @@
 from __future__ import annotations
 from dataclasses import dataclass
 import random
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Iterator
 
 from .util import Rectangle, Point
 from .model import Wall, Brick, Course, BED_JOINT_THICKNESS, Unit
 
 
 class AlignmentStrategy:
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self._rng = rng
+
     def next_reachable_area(self, unit: Unit, robot: Robot, wall: Wall) -> Rectangle:
         max_x = wall.box.length - robot.reachable_area.length
         max_y = wall.box.height - robot.reachable_area.height
 
-        next_x = max(0.0, self.align_x_with_unit(unit, robot))
+        next_x = max(0, self.align_x_with_unit(unit, robot))
         next_x = min(next_x, max_x)
         next_y = min(unit.box.bottom_left_corner.y - BED_JOINT_THICKNESS, max_y)
 
@@ -22,17 +25,17 @@ class AlignmentStrategy:
             robot.reachable_area.height,
         )
 
-    def align_x_with_unit(self, unit: Unit, robot: Robot) -> float:
+    def align_x_with_unit(self, unit: Unit, robot: Robot) -> int:
         raise NotImplementedError
 
 
 class LeftAlignmentStrategy(AlignmentStrategy):
-    def align_x_with_unit(self, unit: Unit, robot: Robot) -> float:
+    def align_x_with_unit(self, unit: Unit, robot: Robot) -> int:
         return unit.box.bottom_left_corner.x
 
 
 class RightAlignmentStrategy(AlignmentStrategy):
-    def align_x_with_unit(self, unit: Unit, robot: Robot) -> float:
+    def align_x_with_unit(self, unit: Unit, robot: Robot) -> int:
         return (
             unit.box.bottom_left_corner.x
             + unit.box.length
@@ -41,19 +44,20 @@ class RightAlignmentStrategy(AlignmentStrategy):
 
 
 class CenterAlignmentStrategy(AlignmentStrategy):
-    def align_x_with_unit(self, unit: Unit, robot: Robot) -> float:
+    def align_x_with_unit(self, unit: Unit, robot: Robot) -> int:
         return (
             unit.box.bottom_left_corner.x
-            + (unit.box.length / 2)
-            - (robot.reachable_area.length / 2)
+            + (unit.box.length // 2)
+            - (robot.reachable_area.length // 2)
         )
 
 
 class RandomAlignmentStrategy(AlignmentStrategy):
-    def align_x_with_unit(self, unit: Unit, robot: Robot) -> float:
+    def align_x_with_unit(self, unit: Unit, robot: Robot) -> int:
         unit_in_left_corner_x = LeftAlignmentStrategy().align_x_with_unit(unit, robot)
         unit_in_right_corner_x = RightAlignmentStrategy().align_x_with_unit(unit, robot)
-        return random.uniform(unit_in_right_corner_x, unit_in_left_corner_x)
+        rng = self._rng if self._rng is not None else random
+        return round(rng.uniform(unit_in_right_corner_x, unit_in_left_corner_x))
 
 
 @dataclass
@@ -121,6 +125,8 @@ class Robot:
     reachable_area: Rectangle
     _move_strategy: MoveStrategy
     move_count: int = 0
+    _frontier_wall: Optional[Wall] = None
+    _frontier: Iterator[Brick] = iter(())
 
     def __init__(
         self,
@@ -134,9 +140,29 @@ class Robot:
         self._move_strategy = move_strategy
 
     def lay_brick(self, wall: Wall) -> Optional[Brick]:
-        for i, course in enumerate(wall.courses):
+        return next(self._frontier_of(wall), None)
+
+    def lay_stride(self, wall: Wall) -> list[Brick]:
+        return list(self._frontier_of(wall))
+
+    def _frontier_of(self, wall: Wall) -> Iterator[Brick]:
+        # Nothing the frontier has passed can become layable until the robot moves: units
+        # only become supported by units built in the course below, which comes first.
+        if wall is not self._frontier_wall:
+            self._frontier_wall = wall
+            self._frontier = self._lay_units_in_reach(wall)
+        return self._frontier
+
+    def _lay_units_in_reach(self, wall: Wall) -> Iterator[Brick]:
+        area = self.reachable_area
+        for i in wall.course_indices_within(
+            area.bottom_left_corner.y, area.top_left_corner.y
+        ):
+            course = wall.courses[i]
             previous_course = wall.courses[i - 1] if i > 0 else None
-            for unit in course.units:
+            for unit in course.units_within(
+                area.bottom_left_corner.x, area.bottom_right_corner.x
+            ):
                 if (
                     not unit.is_built
                     and self._reachable(unit)
@@ -144,17 +170,15 @@ class Robot:
                 ):
                     unit.is_built = True
                     if isinstance(unit, Brick):
-                        return unit
-        return None
+                        yield unit
 
     def _reachable(self, unit: Unit) -> bool:
-        bed_joint_box = Rectangle(
-            unit.box.bottom_left_corner.plus_y(-1 * BED_JOINT_THICKNESS),
-            unit.box.length,
-            BED_JOINT_THICKNESS,
-        )
-        return self.reachable_area.bounds(bed_joint_box) and self.reachable_area.bounds(
-            unit.box
+        # the unit and the bed joint under it have to be in reach
+        box = unit.box
+        x = box.bottom_left_corner.x
+        y = box.bottom_left_corner.y
+        return self.reachable_area.bounds_coordinates(
+            x, y - BED_JOINT_THICKNESS, x + box.length, y + box.height
         )
 
     def move(self, wall: Wall) -> bool:
@@ -163,4 +187,5 @@ class Robot:
             return False
         self.reachable_area = next_move
         self.move_count += 1
+        self._frontier_wall = None
         return True
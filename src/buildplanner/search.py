@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from array import array
+from dataclasses import dataclass
+from math import ceil
+from typing import Optional
+
+from .compact import BRICK_KIND, CompactWall
+from .model import COURSE_HEIGHT, Unit, Wall
+from .robot import AlignmentStrategy, MoveStrategy, Robot
+from .util import Rectangle
+
+MAX_EXACT_UNITS = 2000
+MAX_EXACT_EXPANSIONS = 5000
+DEFAULT_BEAM_WIDTH = 16
+
+
+def built_state(wall: Wall) -> bytes:
+    return bytes(unit.is_built for course in wall.courses for unit in course.units)
+
+
+@dataclass
+class _Node:
+    state: bytes
+    strides: int
+    unbuilt_brick_length_per_course: list[int]
+    parent: Optional[_Node] = None
+    area: Optional[Rectangle] = None
+
+    @property
+    def unbuilt_brick_length(self) -> int:
+        return sum(self.unbuilt_brick_length_per_course)
+
+
+class StrideSearch:
+    def __init__(
+        self, wall: Wall, robot: Robot, alignment_strategy: AlignmentStrategy
+    ) -> None:
+        self._wall = wall
+        self._robot = robot
+        self._alignment_strategy = alignment_strategy
+        self._compact_wall = CompactWall.from_wall(wall)
+        area = robot.reachable_area
+        courses_per_stride = max(1, area.height // COURSE_HEIGHT)
+        self._stride_capacity = area.length * courses_per_stride
+        self._max_course_capacity = area.length
+
+    def search(
+        self,
+        beam_width: Optional[int] = None,
+        max_exact_expansions: int = MAX_EXACT_EXPANSIONS,
+    ) -> list[Rectangle]:
+        start = self._start_node()
+        if beam_width is not None:
+            return self._path(self._beam_search(start, beam_width))
+        best = self._beam_search(start, 1)
+        if len(self._compact_wall) <= MAX_EXACT_UNITS:
+            exact = self._best_first_search(start, best, max_exact_expansions)
+            if exact is not None:
+                return self._path(exact)
+        # the wall is too big to prove an optimum, so settle for the best beam we can
+        # afford
+        beam = self._beam_search(start, DEFAULT_BEAM_WIDTH)
+        return self._path(beam if beam.strides < best.strides else best)
+
+    def _start_node(self) -> _Node:
+        compact_wall = self._compact_wall
+        unbuilt_brick_length_per_course = [0] * len(compact_wall.course_heights)
+        for i, is_built in enumerate(compact_wall.built):
+            if not is_built and compact_wall.kind[i] == BRICK_KIND:
+                unbuilt_brick_length_per_course[compact_wall.course[i]] += (
+                    compact_wall.length[i]
+                )
+        return _Node(bytes(compact_wall.built), 0, unbuilt_brick_length_per_course)
+
+    def _best_first_search(
+        self, start: _Node, best: _Node, max_expansions: int
+    ) -> Optional[_Node]:
+        counter = itertools.count()
+        queue = [(self._lower_bound(start), next(counter), start)]
+        fewest_strides = {start.state: 0}
+        for _ in range(max_expansions):
+            if not queue:
+                return best
+            estimate, _, node = heapq.heappop(queue)
+            if estimate >= best.strides:
+                return best
+            if node.strides > fewest_strides[node.state]:
+                continue
+            for child in self._children(node):
+                if child.strides >= fewest_strides.get(child.state, best.strides):
+                    continue
+                fewest_strides[child.state] = child.strides
+                if self._is_complete(child.state):
+                    best = child
+                    continue
+                child_estimate = child.strides + self._lower_bound(child)
+                if child_estimate < best.strides:
+                    heapq.heappush(queue, (child_estimate, next(counter), child))
+        return None
+
+    def _beam_search(self, start: _Node, beam_width: int) -> _Node:
+        beam = [start]
+        seen = {start.state}
+        while True:
+            children = []
+            for node in beam:
+                for child in self._children(node):
+                    if self._is_complete(child.state):
+                        return child
+                    if child.state not in seen:
+                        seen.add(child.state)
+                        children.append(child)
+            if not children:
+                return start
+            children.sort(key=lambda child: child.unbuilt_brick_length)
+            beam = children[:beam_width]
+
+    def _children(self, node: _Node) -> list[_Node]:
+        compact_wall = self._compact_wall
+        children = []
+        for area in self._candidate_areas(node.state):
+            compact_wall.built = array("b", node.state)
+            laid = compact_wall.lay_stride(area)
+            state = bytes(compact_wall.built)
+            if state != node.state:
+                unbuilt_brick_length_per_course = node.unbuilt_brick_length_per_course[
+                    :
+                ]
+                for i in laid:
+                    unbuilt_brick_length_per_course[compact_wall.course[i]] -= (
+                        compact_wall.length[i]
+                    )
+                children.append(
+                    _Node(
+                        state,
+                        node.strides + 1,
+                        unbuilt_brick_length_per_course,
+                        node,
+                        area,
+                    )
+                )
+        return children
+
+    def _candidate_areas(self, state: bytes) -> list[Rectangle]:
+        # like the greedy move strategies, the next stride always starts on the lowest
+        # course that isn't finished, aligned with one end of a gap in that course
+        compact_wall = self._compact_wall
+        course_starts = compact_wall.course_starts
+        first_unbuilt = state.index(0)
+        course_index = compact_wall.course[first_unbuilt]
+        course_end = course_starts[course_index + 1]
+        areas = []
+        for i in range(first_unbuilt, course_end):
+            if state[i]:
+                continue
+            starts_gap = i == course_starts[course_index] or state[i - 1]
+            ends_gap = i + 1 == course_end or state[i + 1]
+            if starts_gap or ends_gap:
+                area = self._alignment_strategy.next_reachable_area(
+                    Unit(compact_wall.unit_box(i)), self._robot, self._wall
+                )
+                if area not in areas:
+                    areas.append(area)
+        return areas
+
+    def _lower_bound(self, node: _Node) -> int:
+        # a stride can at most fill its length on every course it spans
+        return max(
+            ceil(node.unbuilt_brick_length / self._stride_capacity),
+            ceil(max(node.unbuilt_brick_length_per_course) / self._max_course_capacity),
+        )
+
+    @staticmethod
+    def _is_complete(state: bytes) -> bool:
+        return 0 not in state
+
+    @staticmethod
+    def _path(node: _Node) -> list[Rectangle]:
+        areas = []
+        while node.parent is not None:
+            areas.append(node.area)
+            node = node.parent
+        return areas[::-1]
+
+
+class SearchMoveStrategy(MoveStrategy):
+    _next_moves: Optional[dict[bytes, Rectangle]] = None
+    beam_width: Optional[int] = None
+
+    def next_move(self, robot: Robot, wall: Wall) -> Optional[Rectangle]:
+        if wall.next_non_complete_course() is None:
+            return None
+        state = built_state(wall)
+        if self._next_moves is None or state not in self._next_moves:
+            self._plan(robot, wall)
+        return self._next_moves.get(state)
+
+    def _plan(self, robot: Robot, wall: Wall) -> None:
+        search = StrideSearch(wall, robot, self.alignment_strategy)
+        compact_wall = CompactWall.from_wall(wall)
+        self._next_moves = {}
+        for area in search.search(self.beam_width):
+            self._next_moves[bytes(compact_wall.built)] = area
+            compact_wall.lay_stride(area)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter, OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from .batch import WallSpec, best_strategies, create_robot
+from .parser_util import ALIGNMENT_STRATEGIES, BONDS
+from .plan import HEADER, RECORD, BuildPlan
+from .robot import RandomAlignmentStrategy
+from .util import to_fixed_point
+from .wall import WallCache, WallPlanningException
+
+# a JSON-RPC 2.0 service over HTTP that plans walls. planning runs in a pool of worker
+# processes, identical requests that arrive while one is being planned wait for that
+# one instead of planning it again, and finished plans are kept in a cache that drops
+# the least recently used plans once it's full
+
+DEFAULT_CACHE_BYTES = 64 << 20
+MAX_BODY_BYTES = 1 << 20
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+PLANNING_ERROR = -32000
+
+# each worker process keeps its own walls, so asking for the same wall again doesn't
+# plan its courses again
+_WALL_CACHE = WallCache()
+
+
+@dataclass(frozen=True)
+class PlannedWall:
+    alignment: str
+    move: str
+    plan: BuildPlan
+
+    @property
+    def nbytes(self) -> int:
+        return HEADER.size + len(self.plan) * RECORD.size
+
+
+def plan_wall(spec: WallSpec) -> PlannedWall:
+    wall = _WALL_CACHE.get(
+        to_fixed_point(spec.length),
+        to_fixed_point(spec.height),
+        BONDS[spec.bond],
+        spec.seed,
+    )
+    _, alignment, move = best_strategies(wall, spec)
+    wall.reset()
+    return PlannedWall(
+        alignment, move, BuildPlan.compile(wall, create_robot(spec, alignment, move))
+    )
+
+
+class PlanCache:
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._plans: OrderedDict[WallSpec, PlannedWall] = OrderedDict()
+        self.nbytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def get(self, key: WallSpec) -> Optional[PlannedWall]:
+        planned_wall = self._plans.get(key)
+        if planned_wall is not None:
+            self._plans.move_to_end(key)
+        return planned_wall
+
+    def put(self, key: WallSpec, planned_wall: PlannedWall) -> None:
+        if planned_wall.nbytes > self._max_bytes:
+            return
+        previous = self._plans.pop(key, None)
+        if previous is not None:
+            self.nbytes -= previous.nbytes
+        self._plans[key] = planned_wall
+        self.nbytes += planned_wall.nbytes
+        while self.nbytes > self._max_bytes:
+            _, evicted = self._plans.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+
+class PlanningService:
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        cache: Optional[PlanCache] = None,
+    ) -> None:
+        self._executor = executor or ProcessPoolExecutor()
+        self._cache = cache if cache is not None else PlanCache()
+        self._in_flight: dict[WallSpec, asyncio.Future] = {}
+        self.counters = Counter()
+
+    async def plan(self, spec: WallSpec) -> PlannedWall:
+        self.counters["requests"] += 1
+        key = _key(spec)
+        planned_wall = self._cache.get(key)
+        if planned_wall is not None:
+            self.counters["cache_hits"] += 1
+            return planned_wall
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+        else:
+            future = self._in_flight[key] = self._start(key)
+            future.add_done_callback(lambda done: self._finish(key, done))
+        # one caller going away mustn't cancel the plan for the others
+        return await asyncio.shield(future)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **{
+                name: self.counters[name]
+                for name in ("requests", "plans", "cache_hits", "coalesced")
+            },
+            "in_flight": len(self._in_flight),
+            "cached_plans": len(self._cache),
+            "cached_bytes": self._cache.nbytes,
+            "evictions": self._cache.evictions,
+        }
+
+    def _start(self, spec: WallSpec) -> asyncio.Future:
+        self.counters["plans"] += 1
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor, plan_wall, spec
+        )
+
+    def _finish(self, key: WallSpec, future: asyncio.Future) -> None:
+        del self._in_flight[key]
+        if not future.cancelled() and future.exception() is None:
+            self._cache.put(key, future.result())
+
+    async def handle_rpc(self, request: object) -> Optional[dict]:
+        # returns the response to a JSON-RPC request, or None for a notification
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0":
+            return _error(None, INVALID_REQUEST, "Not a JSON-RPC 2.0 request")
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params", {})
+        try:
+            if method == "plan":
+                response = {"result": await self._plan_rpc(params)}
+            elif method == "stats":
+                response = {"result": self.stats()}
+            else:
+                response = _error(request_id, METHOD_NOT_FOUND, f"No method {method}")
+        except (TypeError, ValueError) as e:
+            response = _error(request_id, INVALID_PARAMS, str(e))
+        except WallPlanningException as e:
+            response = _error(request_id, PLANNING_ERROR, str(e))
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, **response}
+
+    async def _plan_rpc(self, params: object) -> dict:
+        if not isinstance(params, dict):
+            raise ValueError("Params have to be an object")
+        params = dict(params)
+        # the bricks are only sent when they're asked for, as they're most of a plan
+        with_bricks = bool(params.pop("bricks", False))
+        spec = WallSpec.from_row(params, 0)
+        planned_wall = await self.plan(spec)
+        result = {
+            "strides": planned_wall.plan.strides,
+            "bricks": len(planned_wall.plan),
+            "alignment": planned_wall.alignment,
+            "move": planned_wall.move,
+        }
+        if with_bricks:
+            result["plan"] = list(planned_wall.plan.json_records())
+        return result
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # a small HTTP/1.1 server, which is all a local JSON-RPC endpoint needs. POSTs to
+        # any path are JSON-RPC, and connections are kept alive until the client closes
+        # them or asks for them to be closed
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, *_ = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                length = int(headers.get("content-length", 0))
+                if method != "POST":
+                    status, body = "405 Method Not Allowed", b""
+                elif length > MAX_BODY_BYTES:
+                    status, body, keep_alive = "413 Content Too Large", b"", False
+                else:
+                    status, body = await self._handle_body(
+                        await reader.readexactly(length)
+                    )
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status}\r\n"
+                        "Content-Type: application/json\r\n"
+                        f"Content-Length: {len(body)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                        "\r\n"
+                    ).encode("latin-1")
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+    async def _handle_body(self, body: bytes) -> tuple[str, bytes]:
+        try:
+            request = json.loads(body)
+        except ValueError:
+            response = _error(None, PARSE_ERROR, "Not valid JSON")
+        else:
+            # the requests of a batch are handled at the same time, so identical ones
+            # in it are planned once
+            if isinstance(request, list) and request:
+                responses = await asyncio.gather(*map(self.handle_rpc, request))
+                response = [r for r in responses if r is not None] or None
+            else:
+                response = await self.handle_rpc(request)
+        if response is None:
+            return "204 No Content", b""
+        return "200 OK", json.dumps(response).encode()
+
+
+async def serve(service: PlanningService, host: str, port: int) -> asyncio.Server:
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+def _key(spec: WallSpec) -> WallSpec:
+    # a service has to give the same plan for the same request, so requests without a
+    # seed are planned with seed 0. the seed only matters to wild bonds and random
+    # alignment, which is tried when no alignment is asked for, and names don't matter
+    # at all
+    is_random = BONDS[spec.bond].is_random() or (
+        spec.alignment is None
+        or issubclass(ALIGNMENT_STRATEGIES[spec.alignment], RandomAlignmentStrategy)
+    )
+    return replace(spec, name="", seed=(spec.seed or 0) if is_random else None)
+
+
+def _error(request_id: object, code: int, message: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from buildplanner.parser_util import int_greater_than_0
+from buildplanner.service import PlanCache, PlanningService, serve
+
+HOST = "127.0.0.1"
+PORT = 8765
+CACHE_MIB = 64
+
+
+async def main(host: str, port: int, workers: Optional[int], cache_mib: int):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        service = PlanningService(executor, PlanCache(cache_mib << 20))
+        server = await serve(service, host, port)
+        address, port, *_ = server.sockets[0].getsockname()
+        print(f"Planning walls on http://{address}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def parse_args() -> (str, int, Optional[int], int):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--host",
+        default=HOST,
+        help="Address to listen on. Defaults to localhost only",
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=PORT,
+        help="Port to listen on, or 0 for any free port",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int_greater_than_0,
+        help="Number of worker processes, defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "--cache-mib",
+        type=int_greater_than_0,
+        default=CACHE_MIB,
+        help="Most MiB of finished plans to keep, dropping the least recently used ones first",
+    )
+    args = parser.parse_args()
+    return args.host, args.port, args.workers, args.cache_mib
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(*parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .model import Brick, HeadJoint, Wall
+from .robot import Robot
+from .util import Rectangle, to_millimetres
+
+# a build is laid once and recorded as strides, and then timed as a discrete event
+# simulation. timing a recorded build doesn't touch the wall, so one build can be timed
+# against any number of timing models.
+#
+# the rig carries a gripper that lays bricks and an applicator that puts the head joints
+# on them. the applicator follows the gripper, so it works on one brick while the gripper
+# lays the next, and the rig only moves on once both are done with the stride
+
+RESOURCES = ("rig", "gripper", "applicator")
+
+
+@dataclass(frozen=True)
+class TimingModel:
+    # speeds are in mm per second, and times in seconds
+    travel_speed: float = 250.0
+    lift_speed: float = 100.0
+    settle_seconds: float = 10.0
+    lay_seconds: float = 6.0
+    joint_seconds: float = 3.0
+
+    def move_seconds(self, start: Rectangle, end: Rectangle) -> float:
+        dx = abs(end.bottom_left_corner.x - start.bottom_left_corner.x)
+        dy = abs(end.bottom_left_corner.y - start.bottom_left_corner.y)
+        if not dx and not dy:
+            return 0.0
+        # the rig travels and lifts at the same time, and then settles before it lays
+        return self.settle_seconds + max(
+            to_millimetres(dx) / self.travel_speed,
+            to_millimetres(dy) / self.lift_speed,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedStride:
+    envelope: Rectangle
+    # the number of head joints of each brick, in the order they're laid
+    joints_of_bricks: tuple[int, ...]
+
+
+@dataclass
+class SimulationResult:
+    makespan: float
+    strides: int
+    bricks: int
+    joints: int
+    busy: dict[str, list[tuple[float, float]]] = field(repr=False)
+
+    def busy_seconds(self, resource: str) -> float:
+        return sum(end - start for start, end in self.busy[resource])
+
+    def utilisation(self, resource: str) -> float:
+        return self.busy_seconds(resource) / self.makespan if self.makespan else 0.0
+
+    def timeline(self, bucket_seconds: float) -> list[dict[str, float]]:
+        # the fraction of each bucket of time that each resource is busy
+        buckets = max(1, -int(-self.makespan // bucket_seconds))
+        timeline = [dict.fromkeys(RESOURCES, 0.0) for _ in range(buckets)]
+        for resource, intervals in self.busy.items():
+            for start, end in intervals:
+                bucket = min(int(start // bucket_seconds), buckets - 1)
+                while start < end:
+                    bucket_end = min(end, (bucket + 1) * bucket_seconds)
+                    timeline[bucket][resource] += (bucket_end - start) / bucket_seconds
+                    start = bucket_end
+                    bucket += 1
+        return timeline
+
+
+def record(wall: Wall, robot: Robot) -> list[RecordedStride]:
+    # the head joint that follows a brick in its course is applied to that brick
+    joints_of_bricks = {}
+    for course in wall.courses:
+        for unit, next_unit in itertools.pairwise([*course.units, None]):
+            if isinstance(unit, Brick):
+                joints_of_bricks[id(unit)] = int(isinstance(next_unit, HeadJoint))
+    strides = []
+    while True:
+        envelope = robot.reachable_area
+        bricks = robot.lay_stride(wall)
+        strides.append(
+            RecordedStride(
+                envelope, tuple(joints_of_bricks[id(brick)] for brick in bricks)
+            )
+        )
+        if not robot.move(wall):
+            return strides
+
+
+def simulate(
+    strides: list[RecordedStride], timing: Optional[TimingModel] = None
+) -> SimulationResult:
+    timing = timing or TimingModel()
+    busy = {resource: [] for resource in RESOURCES}
+    events = []
+    sequence = itertools.count()
+
+    def schedule(time: float, kind: str, stride: int, brick: int = 0) -> None:
+        # the sequence number keeps events at the same time in the order they were
+        # scheduled
+        heapq.heappush(events, (time, next(sequence), kind, stride, brick))
+
+    def work(resource: str, start: float, seconds: float) -> float:
+        busy[resource].append((start, start + seconds))
+        return start + seconds
+
+    # bricks that have been laid and are waiting for their joints
+    waiting_for_joints = []
+    applicator_is_free = True
+    gripper_is_done = False
+    makespan = 0.0
+
+    def start_next_joint(now: float, stride: int) -> None:
+        nonlocal applicator_is_free
+        applicator_is_free = not waiting_for_joints
+        if waiting_for_joints:
+            brick = waiting_for_joints.pop(0)
+            joints = strides[stride].joints_of_bricks[brick]
+            seconds = joints * timing.joint_seconds
+            schedule(work("applicator", now, seconds), "jointed", stride, brick)
+
+    def finish_stride(now: float, stride: int) -> None:
+        nonlocal makespan, gripper_is_done
+        makespan = now
+        if stride + 1 == len(strides):
+            return
+        gripper_is_done = False
+        seconds = timing.move_seconds(
+            strides[stride].envelope, strides[stride + 1].envelope
+        )
+        schedule(work("rig", now, seconds) if seconds else now, "moved", stride + 1)
+
+    schedule(0.0, "moved", 0)
+    while events:
+        now, _, kind, stride, brick = heapq.heappop(events)
+        bricks = len(strides[stride].joints_of_bricks)
+        if kind == "moved":
+            if bricks:
+                schedule(work("gripper", now, timing.lay_seconds), "laid", stride)
+            else:
+                finish_stride(now, stride)
+        elif kind == "laid":
+            if strides[stride].joints_of_bricks[brick]:
+                waiting_for_joints.append(brick)
+                if applicator_is_free:
+                    start_next_joint(now, stride)
+            if brick + 1 < bricks:
+                schedule(
+                    work("gripper", now, timing.lay_seconds), "laid", stride, brick + 1
+                )
+            else:
+                gripper_is_done = True
+                if applicator_is_free:
+                    finish_stride(now, stride)
+        elif kind == "jointed":
+            start_next_joint(now, stride)
+            if gripper_is_done and applicator_is_free:
+                finish_stride(now, stride)
+    return SimulationResult(
+        makespan,
+        len(strides),
+        sum(len(stride.joints_of_bricks) for stride in strides),
+        sum(sum(stride.joints_of_bricks) for stride in strides),
+        busy,
+    )
@@ -0,0 +1,236 @@
+import argparse
+import itertools
+import random
+import time
+from typing import Optional
+
+from buildplanner.parser_util import (
+    ALIGNMENT_STRATEGIES,
+    BONDS,
+    MOVE_STRATEGIES,
+    int_greater_than_0,
+    wall_dimensions,
+)
+from buildplanner.robot import Robot
+from buildplanner.simulate import RESOURCES, TimingModel, record, simulate
+from buildplanner.util import to_fixed_point
+from buildplanner.wall import Bond, create_wall
+
+WALL_LENGTH = 2300
+WALL_HEIGHT = 2000
+ROBOT_BUILD_ENVELOPE_LENGTH = 800
+ROBOT_BUILD_ENVELOPE_HEIGHT = 1300
+DEFAULT_TIMING = TimingModel()
+TIMING_PARAMETERS = (
+    "travel_speed",
+    "lift_speed",
+    "settle_seconds",
+    "lay_seconds",
+    "joint_seconds",
+)
+
+
+def main(
+    bond: Bond,
+    wall_size: tuple[int, int],
+    alignment_strategies: list[str],
+    move_strategies: list[str],
+    timings: list[TimingModel],
+    seed: Optional[int],
+    top: int,
+    bucket_seconds: Optional[float],
+):
+    wall_length, wall_height = wall_size
+    wall = create_wall(to_fixed_point(wall_length), to_fixed_point(wall_height), bond)
+    start = time.perf_counter()
+    # each combination of strategies is laid once, and its recorded strides are timed
+    # against every timing model
+    results = []
+    for alignment, move in itertools.product(alignment_strategies, move_strategies):
+        wall.reset()
+        robot = Robot(
+            to_fixed_point(ROBOT_BUILD_ENVELOPE_LENGTH),
+            to_fixed_point(ROBOT_BUILD_ENVELOPE_HEIGHT),
+            MOVE_STRATEGIES[move](ALIGNMENT_STRATEGIES[alignment](_rng(seed))),
+        )
+        strides = record(wall, robot)
+        for timing in timings:
+            results.append((simulate(strides, timing), alignment, move, timing))
+    seconds = time.perf_counter() - start
+    print(
+        f"Simulated {len(results)} builds in {seconds:.2f} s "
+        f"({len(results) / seconds:.0f} per second)"
+    )
+
+    results.sort(key=lambda result: result[0].makespan)
+    print(
+        f"{'Alignment':<10} {'Move':<14} {'Strides':>7} {'Makespan':>9} "
+        + " ".join(f"{resource:>10}" for resource in RESOURCES)
+        + "  Timing"
+    )
+    for result, alignment, move, timing in results[:top]:
+        print(
+            f"{alignment:<10} {move:<14} {result.strides:>7} "
+            f"{_format_seconds(result.makespan):>9} "
+            + " ".join(
+                f"{result.utilisation(resource):>10.0%}" for resource in RESOURCES
+            )
+            + f"  {_format_timing(timing)}"
+        )
+
+    if bucket_seconds is not None:
+        best, *_ = results[0]
+        print(f"Utilisation of the fastest build every {bucket_seconds:g} s")
+        for bucket, busy in enumerate(best.timeline(bucket_seconds)):
+            print(
+                f"{_format_seconds(bucket * bucket_seconds):>9} "
+                + " ".join(
+                    f"{resource} {busy[resource]:>4.0%}" for resource in RESOURCES
+                )
+            )
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}"
+
+
+def _format_timing(timing: TimingModel) -> str:
+    # only what differs from the defaults
+    return (
+        " ".join(
+            f"{parameter}={getattr(timing, parameter):g}"
+            for parameter in TIMING_PARAMETERS
+            if getattr(timing, parameter) != getattr(DEFAULT_TIMING, parameter)
+        )
+        or "default"
+    )
+
+
+def _positive_float(val: str) -> float:
+    val = float(val)
+    if val <= 0:
+        raise ValueError("Must be greater than 0")
+    return val
+
+
+def _non_negative_float(val: str) -> float:
+    val = float(val)
+    if val < 0:
+        raise ValueError("Must not be negative")
+    return val
+
+
+def parse_args() -> (
+    Bond,
+    tuple[int, int],
+    list[str],
+    list[str],
+    list[TimingModel],
+    Optional[int],
+    int,
+    Optional[float],
+):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-b", "--bond", choices=BONDS.keys(), default="stretcher")
+    parser.add_argument(
+        "-s",
+        "--wall-size",
+        type=wall_dimensions,
+        default=(WALL_LENGTH, WALL_HEIGHT),
+        help="Size of the wall to build, given as LENGTHxHEIGHT in mm",
+    )
+    parser.add_argument(
+        "-a",
+        "--alignment-strategy",
+        choices=ALIGNMENT_STRATEGIES.keys(),
+        nargs="+",
+        default=list(ALIGNMENT_STRATEGIES.keys()),
+    )
+    parser.add_argument(
+        "-m",
+        "--move-strategy",
+        choices=MOVE_STRATEGIES.keys(),
+        nargs="+",
+        default=list(MOVE_STRATEGIES.keys()),
+    )
+    parser.add_argument(
+        "--travel-speed",
+        type=_positive_float,
+        nargs="+",
+        default=[DEFAULT_TIMING.travel_speed],
+        help="Speeds the rig travels along the wall at, in mm per second",
+    )
+    parser.add_argument(
+        "--lift-speed",
+        type=_positive_float,
+        nargs="+",
+        default=[DEFAULT_TIMING.lift_speed],
+        help="Speeds the rig lifts or lowers its envelope at, in mm per second",
+    )
+    parser.add_argument(
+        "--settle-seconds",
+        type=_non_negative_float,
+        nargs="+",
+        default=[DEFAULT_TIMING.settle_seconds],
+        help="Seconds the rig takes to settle after every move",
+    )
+    parser.add_argument(
+        "--lay-seconds",
+        type=_non_negative_float,
+        nargs="+",
+        default=[DEFAULT_TIMING.lay_seconds],
+        help="Seconds the gripper takes to lay a brick on its bed joint",
+    )
+    parser.add_argument(
+        "--joint-seconds",
+        type=_non_negative_float,
+        nargs="+",
+        default=[DEFAULT_TIMING.joint_seconds],
+        help="Seconds the applicator takes to apply a head joint",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed for wild bonds and random alignment, so that the results can be reproduced",
+    )
+    parser.add_argument(
+        "-t",
+        "--top",
+        type=int_greater_than_0,
+        default=10,
+        help="Number of the fastest builds to print",
+    )
+    parser.add_argument(
+        "--timeline",
+        type=_positive_float,
+        metavar="SECONDS",
+        help="Print how busy the rig, gripper and applicator are over the fastest build, in buckets of this many seconds",
+    )
+    args = parser.parse_args()
+    # every combination of the given timing parameters is simulated
+    timings = [
+        TimingModel(*parameters)
+        for parameters in itertools.product(
+            *(getattr(args, parameter) for parameter in TIMING_PARAMETERS)
+        )
+    ]
+    return (
+        BONDS[args.bond](_rng(args.seed)),
+        args.wall_size,
+        args.alignment_strategy,
+        args.move_strategy,
+        timings,
+        args.seed,
+        args.top,
+        args.timeline,
+    )
+
+
+def _rng(seed: Optional[int]) -> Optional[random.Random]:
+    return random.Random(seed) if seed is not None else None
+
+
+if __name__ == "__main__":
+    main(*parse_args())
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import functools
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from . import wall as wall_module
+from .model import Course, Unit
+from .robot import MoveStrategy, Robot
+from .wall import WallPlanningException
+
+# nothing on the hot paths knows about stats. collecting them swaps counting and timing
+# wrappers in for the methods below and puts the originals back afterwards, so there's
+# no cost at all when they aren't being collected
+
+COUNTERS = (
+    "moves",
+    "lays",
+    "unit_scans",
+    "units_scanned",
+    "reachability_tests",
+    "support_checks",
+    "joint_lookups",
+    "courses_planned",
+    "course_retries",
+)
+TIMERS = ("plan_courses", "lay", "next_move")
+
+
+@dataclass
+class Stats:
+    counters: Counter[str] = field(default_factory=Counter)
+    seconds: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def units_scanned_per_lay(self) -> float:
+        return self.counters["units_scanned"] / max(1, self.counters["lays"])
+
+    def merge(self, other: Stats) -> None:
+        self.counters.update(other.counters)
+        self.seconds.update(other.seconds)
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        return {
+            "counters": {name: self.counters[name] for name in COUNTERS},
+            "seconds": {name: self.seconds[name] for name in TIMERS},
+        }
+
+    def format(self) -> str:
+        lines = [f"{name:<20} {self.counters[name]:>12}" for name in COUNTERS]
+        lines.append(f"{'units_scanned/lay':<20} {self.units_scanned_per_lay:>12.1f}")
+        lines += [f"{name + ' s':<20} {self.seconds[name]:>12.3f}" for name in TIMERS]
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        # - is stdout, anything else gets JSON
+        if path == "-":
+            print(self.format())
+            return
+        with open(path, "w") as file:
+            json.dump(self.as_dict(), file, indent=2)
+            file.write("\n")
+
+
+@contextmanager
+def collecting(stats: Optional[Stats] = None) -> Iterator[Stats]:
+    stats = stats if stats is not None else Stats()
+    originals = _instrument(stats)
+    try:
+        yield stats
+    finally:
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+
+
+@contextmanager
+def dumping_to(path: Optional[str]) -> Iterator[Optional[Stats]]:
+    # collects stats and dumps them once the block is done, or does nothing at all when
+    # there's nowhere to dump them
+    if path is None:
+        yield None
+        return
+    with collecting() as stats:
+        yield stats
+    stats.dump(path)
+
+
+def _instrument(stats: Stats) -> list[tuple[object, str, object]]:
+    counters = stats.counters
+    seconds = stats.seconds
+
+    def counted(counter: str) -> Callable[[Callable], Callable]:
+        def wrap(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                counters[counter] += 1
+                return method(*args, **kwargs)
+
+            return wrapper
+
+        return wrap
+
+    def timed(timer: str, counter: Optional[str] = None) -> Callable:
+        def wrap(method: Callable) -> Callable:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                if counter is not None:
+                    counters[counter] += 1
+                start = time.perf_counter()
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    seconds[timer] += time.perf_counter() - start
+
+            return wrapper
+
+        return wrap
+
+    def scanning(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            units = method(*args, **kwargs)
+            counters["unit_scans"] += 1
+            counters["units_scanned"] += len(units)
+            return units
+
+        return wrapper
+
+    def timed_generator(method: Callable) -> Callable:
+        # a generator's time is spent in its steps, not in the call that creates it
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            courses = method(*args, **kwargs)
+            while True:
+                start = time.perf_counter()
+                try:
+                    course = next(courses)
+                except StopIteration:
+                    return
+                finally:
+                    seconds["plan_courses"] += time.perf_counter() - start
+                yield course
+
+        return wrapper
+
+    def retried(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            try:
+                course = method(*args, **kwargs)
+            except WallPlanningException:
+                counters["course_retries"] += 1
+                raise
+            counters["courses_planned"] += 1
+            return course
+
+        return wrapper
+
+    patches = [
+        (Robot, "move", counted("moves")),
+        (Robot, "lay_brick", timed("lay", "lays")),
+        (Robot, "lay_stride", timed("lay", "lays")),
+        (Robot, "_reachable", counted("reachability_tests")),
+        (Unit, "is_supported", counted("support_checks")),
+        (Course, "units_within", scanning),
+        (Course, "joint_exists_at", counted("joint_lookups")),
+        (MoveStrategy, "next_move", timed("next_move")),
+        (wall_module, "plan_courses", timed_generator),
+        (wall_module, "_create_course", retried),
+    ]
+    originals = []
+    for owner, name, wrap in patches:
+        # subclasses that override a method get wrapped too
+        for patched in [owner, *_subclasses(owner)]:
+            original = vars(patched).get(name)
+            if original is not None:
+                originals.append((patched, name, original))
+                setattr(patched, name, wrap(original))
+    return originals
+
+
+def _subclasses(owner: object) -> list[type]:
+    if not isinstance(owner, type):
+        return []
+    subclasses = []
+    for subclass in owner.__subclasses__():
+        subclasses += [subclass, *_subclasses(subclass)]
+    return subclasses
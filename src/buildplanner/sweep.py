@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional
+
+from .batch import BATCH_MOVE_STRATEGIES, WallSpec, _rng, create_robot
+from .model import COURSE_HEIGHT, FULL_BRICK_LENGTH, Wall
+from .parser_util import ALIGNMENT_STRATEGIES, BONDS
+from .robot import Robot
+from .util import to_fixed_point
+from .wall import WallPlanningException, create_wall
+
+# sweeps envelope sizes over walls to help choose the size of a rig. each wall is
+# planned once and laid again for every envelope and strategy. what comes out for a
+# wall is its front: the envelopes that no envelope that's as small or smaller in both
+# dimensions builds in as few strides. lengths are in mm, like the other command line
+# tools
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    envelope_length: int
+    envelope_height: int
+    strides: int
+    alignment: str
+    move: str
+
+
+@dataclass
+class WallSweep:
+    bond: str
+    wall_length: int
+    wall_height: int
+    front: list[SweepPoint] = field(default_factory=list)
+    runs: int = 0
+    pruned_runs: int = 0
+    error: Optional[str] = None
+
+
+def sweep(
+    bonds: Iterable[str],
+    wall_sizes: Iterable[tuple[int, int]],
+    envelopes: Iterable[tuple[int, int]],
+    alignments: Iterable[str] = ALIGNMENT_STRATEGIES,
+    moves: Iterable[str] = BATCH_MOVE_STRATEGIES,
+    seed: Optional[int] = None,
+    prune: bool = True,
+    workers: Optional[int] = None,
+) -> Iterator[WallSweep]:
+    envelopes = sorted(set(envelopes))
+    for envelope_length, envelope_height in envelopes:
+        # a robot that can't reach a whole brick and its bed joint would never finish
+        if to_fixed_point(envelope_length) < FULL_BRICK_LENGTH or (
+            to_fixed_point(envelope_height) < COURSE_HEIGHT
+        ):
+            raise ValueError(
+                f"Envelope {envelope_length}x{envelope_height} is too small to lay a brick"
+            )
+    walls = [
+        (bond, wall_size, envelopes, list(alignments), list(moves), seed, prune)
+        for bond, wall_size in itertools.product(bonds, wall_sizes)
+    ]
+    if workers == 1:
+        yield from itertools.starmap(sweep_wall, walls)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_sweep_wall, walls)
+
+
+def sweep_wall(
+    bond: str,
+    wall_size: tuple[int, int],
+    envelopes: list[tuple[int, int]],
+    alignments: list[str],
+    moves: list[str],
+    seed: Optional[int] = None,
+    prune: bool = True,
+) -> WallSweep:
+    wall_length, wall_height = wall_size
+    result = WallSweep(bond, wall_length, wall_height)
+    try:
+        wall = create_wall(
+            to_fixed_point(wall_length),
+            to_fixed_point(wall_height),
+            BONDS[bond](_rng(seed)),
+        )
+    except WallPlanningException as e:
+        result.error = str(e)
+        return result
+    # envelopes are tried smallest first, so an envelope's bound comes from the ones
+    # it's at least as big as. once a run takes as many strides as the bound it can't
+    # get onto the front, and is stopped. envelopes that are off the front don't bound
+    # any others, as whatever put them off the front bounds those too
+    bests: dict[tuple[int, int], SweepPoint] = {}
+    for envelope in sorted(envelopes):
+        dominating = [
+            point.strides
+            for (length, height), point in bests.items()
+            if prune and length <= envelope[0] and height <= envelope[1]
+        ]
+        spec = WallSpec("", wall_length, wall_height, bond, *envelope, seed=seed)
+        best = None
+        for alignment, move in itertools.product(alignments, moves):
+            bounds = dominating + ([best.strides] if prune and best else [])
+            strides = _lay(
+                wall, create_robot(spec, alignment, move), min(bounds, default=None)
+            )
+            result.runs += 1
+            if strides is None:
+                result.pruned_runs += 1
+            elif best is None or strides < best.strides:
+                best = SweepPoint(*envelope, strides, alignment, move)
+        if best is not None:
+            bests[envelope] = best
+    result.front = [
+        point
+        for envelope, point in bests.items()
+        if not any(
+            other is not point
+            and other.envelope_length <= envelope[0]
+            and other.envelope_height <= envelope[1]
+            and other.strides <= point.strides
+            for other in bests.values()
+        )
+    ]
+    return result
+
+
+def _sweep_wall(args: tuple) -> WallSweep:
+    return sweep_wall(*args)
+
+
+def _lay(wall: Wall, robot: Robot, bound: Optional[int]) -> Optional[int]:
+    # returns the number of strides the robot builds the wall in, or None once it's
+    # taken as many as the bound, as it can't do better than that any more
+    wall.reset()
+    while True:
+        robot.lay_stride(wall)
+        if bound is not None and robot.move_count + 1 >= bound:
+            return None
+        if not robot.move(wall):
+            return robot.move_count + 1
@@ -0,0 +1,152 @@
+import argparse
+import itertools
+import time
+from typing import Optional
+
+from buildplanner.batch import BATCH_MOVE_STRATEGIES
+from buildplanner.parser_util import (
+    ALIGNMENT_STRATEGIES,
+    BONDS,
+    MOVE_STRATEGIES,
+    int_greater_than_0,
+    int_range,
+)
+from buildplanner.sweep import WallSweep, sweep
+
+WALL_LENGTH = 2300
+WALL_HEIGHT = 2000
+ENVELOPE_LENGTHS = "600:1200:200"
+ENVELOPE_HEIGHTS = "1000:1600:200"
+
+
+def main(
+    bonds: list[str],
+    wall_lengths: list[int],
+    wall_heights: list[int],
+    envelope_lengths: list[int],
+    envelope_heights: list[int],
+    alignments: list[str],
+    moves: list[str],
+    seed: Optional[int],
+    prune: bool,
+    workers: Optional[int],
+):
+    start = time.perf_counter()
+    runs = 0
+    pruned_runs = 0
+    for wall_sweep in sweep(
+        bonds,
+        itertools.product(wall_lengths, wall_heights),
+        itertools.product(envelope_lengths, envelope_heights),
+        alignments,
+        moves,
+        seed,
+        prune,
+        workers,
+    ):
+        runs += wall_sweep.runs
+        pruned_runs += wall_sweep.pruned_runs
+        _print_front(wall_sweep)
+    print(
+        f"Laid {runs} walls, stopping {pruned_runs} early, "
+        f"in {time.perf_counter() - start:.1f} s"
+    )
+
+
+def _print_front(wall_sweep: WallSweep) -> None:
+    print(f"{wall_sweep.bond} wall {wall_sweep.wall_length}x{wall_sweep.wall_height}mm")
+    if wall_sweep.error is not None:
+        print(f"  Couldn't plan the wall: {wall_sweep.error}")
+        return
+    print(f"  {'Envelope':>11} {'Strides':>7}  Strategy")
+    for point in wall_sweep.front:
+        envelope = f"{point.envelope_length}x{point.envelope_height}"
+        print(f"  {envelope:>11} {point.strides:>7}  {point.alignment} {point.move}")
+
+
+def parse_args() -> (
+    list[str],
+    list[int],
+    list[int],
+    list[int],
+    list[int],
+    list[str],
+    list[str],
+    Optional[int],
+    bool,
+    Optional[int],
+):
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-b",
+        "--bonds",
+        nargs="+",
+        choices=BONDS.keys(),
+        default=list(BONDS),
+    )
+    parser.add_argument(
+        "-a",
+        "--alignment-strategies",
+        nargs="+",
+        choices=ALIGNMENT_STRATEGIES.keys(),
+        default=list(ALIGNMENT_STRATEGIES),
+    )
+    parser.add_argument(
+        "-m",
+        "--move-strategies",
+        nargs="+",
+        choices=MOVE_STRATEGIES.keys(),
+        default=BATCH_MOVE_STRATEGIES,
+        help="Move strategies to try. Defaults to all of them but search, which is slow",
+    )
+    for name, default, what in (
+        ("--wall-lengths", str(WALL_LENGTH), "wall lengths"),
+        ("--wall-heights", str(WALL_HEIGHT), "wall heights"),
+        ("--envelope-lengths", ENVELOPE_LENGTHS, "build envelope lengths"),
+        ("--envelope-heights", ENVELOPE_HEIGHTS, "build envelope heights"),
+    ):
+        parser.add_argument(
+            name,
+            nargs="+",
+            type=int_range,
+            default=[int_range(default)],
+            help=f"One or more {what} in mm, or ranges of them given as START:STOP:STEP. Defaults to {default}",
+        )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="Seed for wild bonds and random alignment, so that sweeps can be repeated",
+    )
+    parser.add_argument(
+        "--no-prune",
+        action="store_true",
+        help="Lay every wall to the end, even once it can't get onto the front",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int_greater_than_0,
+        help="Number of worker processes, defaults to the number of CPUs",
+    )
+    args = parser.parse_args()
+    return (
+        args.bonds,
+        *(
+            sorted(set(itertools.chain.from_iterable(values)))
+            for values in (
+                args.wall_lengths,
+                args.wall_heights,
+                args.envelope_lengths,
+                args.envelope_heights,
+            )
+        ),
+        args.alignment_strategies,
+        args.move_strategies,
+        args.seed,
+        not args.no_prune,
+        args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main(*parse_args())
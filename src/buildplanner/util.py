@@ -1,24 +1,36 @@
 from __future__ import annotations
 from dataclasses import dataclass
 
+# geometry is held in integer tenths of a millimetre, and only converted to and from
+# millimetres where it enters or leaves the planner
+FIXED_POINT_SCALE = 10
 
-@dataclass(frozen=True)
+
+def to_fixed_point(millimetres: float) -> int:
+    return round(millimetres * FIXED_POINT_SCALE)
+
+
+def to_millimetres(value: int) -> float:
+    return value / FIXED_POINT_SCALE
+
+
+@dataclass(frozen=True, slots=True)
 class Point:
-    x: float
-    y: float
+    x: int
+    y: int
 
-    def plus_x(self, distance: float) -> Point:
+    def plus_x(self, distance: int) -> Point:
         return Point(self.x + distance, self.y)
 
-    def plus_y(self, distance: float) -> Point:
+    def plus_y(self, distance: int) -> Point:
         return Point(self.x, self.y + distance)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Rectangle:
     bottom_left_corner: Point
-    length: float
-    height: float
+    length: int
+    height: int
 
     @property
     def top_left_corner(self) -> Point:
@@ -34,29 +46,45 @@ class Rectangle:
 
     @property
     def middle(self) -> Point:
-        return self.bottom_left_corner.plus_x(self.length / 2).plus_y(self.height / 2)
+        return self.bottom_left_corner.plus_x(self.length // 2).plus_y(self.height // 2)
+
+    # the predicates below work on coordinates rather than corners, so they don't
+    # allocate any points on the robot's hot path
 
     def bounds(self, other: Rectangle) -> bool:
-        return self.bounds_point(other.bottom_left_corner) and self.bounds_point(
-            other.top_right_corner
+        other_x = other.bottom_left_corner.x
+        other_y = other.bottom_left_corner.y
+        return self.bounds_coordinates(
+            other_x, other_y, other_x + other.length, other_y + other.height
         )
 
-    def overlaps_in_x_axis(self, other: Rectangle) -> bool:
-        return not (
-            self.bottom_right_corner.x < other.bottom_left_corner.x
-            or self.bottom_left_corner.x > other.bottom_right_corner.x
+    def bounds_coordinates(
+        self, min_x: int, min_y: int, max_x: int, max_y: int
+    ) -> bool:
+        x = self.bottom_left_corner.x
+        y = self.bottom_left_corner.y
+        return (
+            x <= min_x
+            and max_x <= x + self.length
+            and y <= min_y
+            and max_y <= y + self.height
         )
 
+    def overlaps_in_x_axis(self, other: Rectangle) -> bool:
+        x = self.bottom_left_corner.x
+        other_x = other.bottom_left_corner.x
+        return not (x + self.length < other_x or x > other_x + other.length)
+
     def bounds_point(self, point: Point) -> bool:
         return self.bounds_x(point.x) and self.bounds_y(point.y)
 
-    def bounds_x(self, x: float) -> bool:
-        return self.bottom_left_corner.x <= x <= self.bottom_right_corner.x
+    def bounds_x(self, x: int) -> bool:
+        return self.bottom_left_corner.x <= x <= self.bottom_left_corner.x + self.length
 
-    def bounds_y(self, y: float) -> bool:
-        return self.bottom_left_corner.y <= y <= self.top_left_corner.y
+    def bounds_y(self, y: int) -> bool:
+        return self.bottom_left_corner.y <= y <= self.bottom_left_corner.y + self.height
 
-    def slice_at_x(self, x: float) -> Rectangle:
+    def slice_at_x(self, x: int) -> Rectangle:
         if x - self.bottom_left_corner.x < 0:
             raise ValueError("Cannot have negative length rectangle")
         return Rectangle(
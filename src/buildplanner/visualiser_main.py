@@ -1,5 +1,6 @@
 import argparse
 import random
+from typing import Optional
 from turtle import mainloop, Screen
 
 from buildplanner.parser_util import (
@@ -7,12 +8,16 @@ from buildplanner.parser_util import (
     ALIGNMENT_STRATEGIES,
     BONDS,
     int_greater_than_0,
+    wall_dimensions,
 )
-from buildplanner.render import Renderer
+from buildplanner.plan import BuildPlan
+from buildplanner.render import Renderer, StridePlayer
 from buildplanner.robot import (
     Robot,
     MoveStrategy,
 )
+from buildplanner.stats import dumping_to
+from buildplanner.util import to_fixed_point
 from buildplanner.wall import Bond, create_wall
 
 WALL_LENGTH = 2300
@@ -21,40 +26,82 @@ ROBOT_BUILD_ENVELOPE_LENGTH = 800
 ROBOT_BUILD_ENVELOPE_HEIGHT = 1300
 
 
-def main(bond: Bond, move_strategy: MoveStrategy, bricks_per_keypress: int):
-    wall = create_wall(WALL_LENGTH, WALL_HEIGHT, bond)
-    robot = Robot(
+def main(
+    bond: Bond,
+    move_strategy: MoveStrategy,
+    strides_per_keypress: int,
+    stats_path: Optional[str] = None,
+    wall_size: tuple[int, int] = (WALL_LENGTH, WALL_HEIGHT),
+    envelope: tuple[int, int] = (
         ROBOT_BUILD_ENVELOPE_LENGTH,
         ROBOT_BUILD_ENVELOPE_HEIGHT,
-        move_strategy,
-    )
+    ),
+):
+    wall_length, wall_height = wall_size
+    envelope_length, envelope_height = envelope
+    # the whole build is planned up front, so that any stride can be drawn straight
+    # away. that's also all there is to collect stats on
+    with dumping_to(stats_path):
+        wall = create_wall(
+            to_fixed_point(wall_length), to_fixed_point(wall_height), bond
+        )
+        robot = Robot(
+            to_fixed_point(envelope_length),
+            to_fixed_point(envelope_height),
+            move_strategy,
+        )
+        plan = BuildPlan.compile(wall, robot)
 
     screen = Screen()
     screen.tracer(False)
-    screen.setworldcoordinates(0, 0, WALL_LENGTH, WALL_HEIGHT)
+    screen.setworldcoordinates(0, 0, wall_length, wall_height)
 
     renderer = Renderer()
     renderer.render_wall(wall)
+    screen.update()
 
     colours = [f"#{random.randint(0, 0xFFFFFF):06x}" for _ in range(100)]
+    player = StridePlayer(renderer, plan, lambda stride: colours[stride % len(colours)])
+
+    def seek(stride: int) -> None:
+        # each seek draws all of its bricks and then refreshes the screen once
+        player.seek(stride)
+        screen.title(f"Stride {player.stride} of {plan.strides}")
+        screen.update()
+
+    def go_to_stride():
+        stride = screen.numinput(
+            "Go to stride",
+            f"Stride (0 to {plan.strides})",
+            default=player.stride,
+            minval=0,
+            maxval=plan.strides,
+        )
+        # the dialog takes the keyboard focus
+        screen.listen()
+        if stride is not None:
+            seek(int(stride))
 
-    def render_brick():
-        for _ in range(bricks_per_keypress):
-            brick = robot.lay_brick(wall)
-            if brick is None:
-                if robot.move(wall):
-                    brick = robot.lay_brick(wall)
-            if brick is not None:
-                stride = robot.move_count + 1
-                renderer.render_brick(brick, colours[stride], stride)
-
-    screen.onkey(render_brick, "Return")
+    for key in ("Return", "Right"):
+        screen.onkey(lambda: seek(player.stride + strides_per_keypress), key)
+    for key in ("BackSpace", "Left"):
+        screen.onkey(lambda: seek(player.stride - strides_per_keypress), key)
+    screen.onkey(lambda: seek(0), "Home")
+    screen.onkey(lambda: seek(plan.strides), "End")
+    screen.onkey(go_to_stride, "g")
     screen.listen()
 
     mainloop()
 
 
-def parse_args() -> (Bond, MoveStrategy, int):
+def parse_args() -> (
+    Bond,
+    MoveStrategy,
+    int,
+    Optional[str],
+    tuple[int, int],
+    tuple[int, int],
+):
     parser = argparse.ArgumentParser()
     parser.add_argument("-b", "--bond", choices=BONDS.keys(), default="stretcher")
     parser.add_argument(
@@ -70,10 +117,31 @@ def parse_args() -> (Bond, MoveStrategy, int):
     )
     parser.add_argument(
         "-k",
-        "--bricks-per-keypress",
+        "--strides-per-keypress",
         default=1,
         type=int_greater_than_0,
-        help="Set this to an integer greater than 1 to increase the number of bricks shown when you press enter",
+        help="Set this to an integer greater than 1 to step through more than one stride when you press enter or backspace",
+    )
+    parser.add_argument(
+        "-s",
+        "--wall-size",
+        type=wall_dimensions,
+        default=(WALL_LENGTH, WALL_HEIGHT),
+        help="Size of the wall to build, given as LENGTHxHEIGHT in mm",
+    )
+    parser.add_argument(
+        "-e",
+        "--envelope",
+        type=wall_dimensions,
+        default=(ROBOT_BUILD_ENVELOPE_LENGTH, ROBOT_BUILD_ENVELOPE_HEIGHT),
+        help="Size of the robot's build envelope, given as LENGTHxHEIGHT in mm",
+    )
+
+    parser.add_argument(
+        "--stats",
+        nargs="?",
+        const="-",
+        help="Count and time the planner's hot paths while planning, and print them or write them as JSON to the given file",
     )
 
     args = parser.parse_args()
@@ -83,7 +151,10 @@ def parse_args() -> (Bond, MoveStrategy, int):
         MOVE_STRATEGIES[args.move_strategy](
             ALIGNMENT_STRATEGIES[args.alignment_strategy or default_align]()
         ),
-        args.bricks_per_keypress,
+        args.strides_per_keypress,
+        args.stats,
+        args.wall_size,
+        args.envelope,
     )
 
 
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import random
 from _operator import itemgetter
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 
-from typing import List, Literal
+from typing import Iterator, List, Literal, Optional
 
 from buildplanner.util import Point, Rectangle
 from buildplanner.model import (
@@ -21,13 +23,22 @@ from buildplanner.model import (
 )
 
 
+# bonds only look a few courses down, so this is all of the handed out courses that
+# planning has to keep
+PLANNING_CONTEXT = 8
+STREAMING_LOOKAHEAD = 16
+
+
 class Bond:
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self._rng = rng
+
     def next_brick_in_course(
         self,
         course: List[Unit],
         course_idx: int,
         bottom_left_corner: Point,
-        wall_length: float,
+        wall_length: int,
         previous_courses: List[Course],
     ) -> Brick:
         raise NotImplementedError
@@ -36,6 +47,15 @@ class Bond:
     def retries() -> int:
         return 0
 
+    @staticmethod
+    def is_random() -> bool:
+        return False
+
+    @staticmethod
+    def period() -> Optional[int]:
+        # the number of courses after which the bond repeats itself, if it does
+        return None
+
     @staticmethod
     def is_first_brick(bricks: List[Unit]) -> bool:
         return len(bricks) == 0
@@ -45,7 +65,7 @@ class Bond:
         return index % 2 == 1
 
     @staticmethod
-    def is_full_brick_too_long(point: Point, length: float) -> bool:
+    def is_full_brick_too_long(point: Point, length: int) -> bool:
         return point.x + FULL_BRICK_LENGTH > length
 
     @staticmethod
@@ -53,19 +73,23 @@ class Bond:
         return len(course) >= 2 and course[-2].box.length == HALF_BRICK_LENGTH
 
     @staticmethod
-    def fit_brick_at_end(candidate_brick: Brick, wall_length: float) -> Brick:
+    def fit_brick_at_end(candidate_brick: Brick, wall_length: int) -> Brick:
         # assumes that we have a wall length that perfectly fits our pre-sized bricks
         # i.e. this won't create anything other than full, three-quarter, half and quarter bricks
         return Brick(candidate_brick.box.slice_at_x(wall_length))
 
 
 class StretcherBond(Bond):
+    @staticmethod
+    def period() -> Optional[int]:
+        return 2
+
     def next_brick_in_course(
         self,
         course: List[Unit],
         course_idx: int,
         bottom_left_corner: Point,
-        wall_length: float,
+        wall_length: int,
         previous_courses: List[Course],
     ) -> Brick:
         if self.is_first_brick(course) and self.is_odd_course(course_idx):
@@ -76,16 +100,22 @@ class StretcherBond(Bond):
 
 
 class CrossBond(Bond):
+    @staticmethod
+    def period() -> Optional[int]:
+        return 2
+
     def next_brick_in_course(
         self,
         course: List[Unit],
         course_idx: int,
         bottom_left_corner: Point,
-        wall_length: float,
+        wall_length: int,
         previous_courses: List[Course],
     ) -> Brick:
         if self.is_odd_course(course_idx):
-            return Brick.create_half_brick(bottom_left_corner)
+            return self.fit_brick_at_end(
+                Brick.create_half_brick(bottom_left_corner), wall_length
+            )
         if self.is_first_brick(course):
             return Brick.create_quarter_brick(bottom_left_corner)
         return self.fit_brick_at_end(
@@ -94,12 +124,16 @@ class CrossBond(Bond):
 
 
 class FlemishBond(Bond):
+    @staticmethod
+    def period() -> Optional[int]:
+        return 2
+
     def next_brick_in_course(
         self,
         course: List[Unit],
         course_idx: int,
         bottom_left_corner: Point,
-        wall_length: float,
+        wall_length: int,
         previous_courses: List[Course],
     ) -> Brick:
         if self.is_first_brick(course):
@@ -126,18 +160,23 @@ class WildBond(Bond):
     def retries() -> int:
         return 20
 
+    @staticmethod
+    def is_random() -> bool:
+        return True
+
     def next_brick_in_course(
         self,
         course: List[Unit],
         course_idx: int,
         bottom_left_corner: Point,
-        wall_length: float,
+        wall_length: int,
         previous_courses: List[Course],
     ) -> Brick:
         candidate_bricks = self._candidate_bricks(
             bottom_left_corner, course, course_idx
         )
-        random.shuffle(candidate_bricks)
+        rng = self._rng if self._rng is not None else random
+        rng.shuffle(candidate_bricks)
         bricks_with_pattern_length = [
             (b, self._length_of_longest_pattern(previous_courses, b))
             for b in candidate_bricks
@@ -193,7 +232,7 @@ class WildBond(Bond):
 
 
 def _create_course(
-    index: int, length: float, bond: Bond, previous_courses: List[Course]
+    index: int, length: int, bond: Bond, previous_courses: List[Course]
 ) -> Course:
     units = []
     point = Point(0, index * COURSE_HEIGHT + BED_JOINT_THICKNESS)
@@ -208,18 +247,205 @@ def _create_course(
     return Course(index * COURSE_HEIGHT, units)
 
 
-def create_wall(length: float, height: float, bond: Bond) -> Wall:
-    retries = bond.retries()
-    while retries >= 0:
-        try:
-            box = Rectangle(Point(0, 0), length, height)
-            number_of_courses = int(height / COURSE_HEIGHT)
-            courses = []
-            for i in range(number_of_courses):
-                courses.append(_create_course(i, length, bond, courses))
-            return Wall(box, courses)
-        except WallPlanningException:
-            retries -= 1
-    raise WallPlanningException(
-        f"Couldn't plan a wall that satisfied the rules of bond type: {bond.__class__.__name__}"
+def _repeat_course(course: Course, index: int) -> Course:
+    height = index * COURSE_HEIGHT
+    offset = height - course.height
+    units = [
+        unit.__class__(
+            Rectangle(
+                Point(
+                    unit.box.bottom_left_corner.x,
+                    unit.box.bottom_left_corner.y + offset,
+                ),
+                unit.box.length,
+                unit.box.height,
+            )
+        )
+        for unit in course.units
+    ]
+    return Course(height, units)
+
+
+def plan_courses(
+    length: int, number_of_courses: int, bond: Bond, lookahead: Optional[int] = None
+) -> Iterator[Course]:
+    # courses are handed out once they are lookahead courses below the top of the plan,
+    # or once the whole wall has been planned if there's no lookahead. the plan never
+    # goes back on a course it has handed out, and of those it only keeps the few that
+    # the bond can still look at
+    courses = []
+    first_index = 0
+    handed_out = 0
+    failures_left = (bond.retries() + 1) * number_of_courses
+    course_failures = 0
+    backtrack_depths = {}
+    period = bond.period()
+    support_spans_of_phases = {}
+    while first_index + len(courses) < number_of_courses:
+        index = first_index + len(courses)
+        if period is not None and index >= period:
+            # once a whole period has been planned, the rest of the wall repeats it, and
+            # so do the supports between its courses
+            course = _repeat_course(courses[-period], index)
+            phase = index % period
+            if phase not in support_spans_of_phases:
+                support_spans_of_phases[phase] = course.support_spans(courses[-1])
+            course.link_supports(courses[-1], support_spans_of_phases[phase])
+        else:
+            try:
+                course = _create_course(index, length, bond, courses)
+            except WallPlanningException:
+                failures_left -= 1
+                if failures_left < 0:
+                    raise WallPlanningException(
+                        f"Couldn't plan a wall that satisfied the rules of bond type: {bond.__class__.__name__}"
+                    )
+                course_failures += 1
+                if course_failures > bond.retries():
+                    # the courses below leave no room for this one, so rework the ones
+                    # under it, going further down each time we get stuck at the same
+                    # course
+                    backtrack_depth = backtrack_depths.get(index, 1)
+                    backtrack_depths[index] = backtrack_depth * 2
+                    del courses[max(handed_out, len(courses) - backtrack_depth) :]
+                    course_failures = 0
+                continue
+            course_failures = 0
+            course.link_supports(courses[-1] if courses else None)
+        courses.append(course)
+        if lookahead is not None:
+            while len(courses) - handed_out > lookahead:
+                yield courses[handed_out]
+                handed_out += 1
+            if handed_out > PLANNING_CONTEXT:
+                del courses[: handed_out - PLANNING_CONTEXT]
+                first_index += handed_out - PLANNING_CONTEXT
+                handed_out = PLANNING_CONTEXT
+    yield from courses[handed_out:]
+
+
+def create_wall(length: int, height: int, bond: Bond) -> Wall:
+    box = Rectangle(Point(0, 0), length, height)
+    return Wall(box, list(plan_courses(length, height // COURSE_HEIGHT, bond)))
+
+
+def create_streaming_wall(
+    length: int, height: int, bond: Bond, lookahead: int = STREAMING_LOOKAHEAD
+) -> StreamingWall:
+    box = Rectangle(Point(0, 0), length, height)
+    number_of_courses = height // COURSE_HEIGHT
+    return StreamingWall(
+        box,
+        StreamedCourses(
+            plan_courses(length, number_of_courses, bond, lookahead), number_of_courses
+        ),
     )
+
+
+class StreamedCourses:
+    # the courses of a wall, planned only as they're first asked for. courses that
+    # have been dropped are stood in for by an empty, built course of the same height
+    def __init__(self, courses: Iterator[Course], number_of_courses: int) -> None:
+        self._courses = courses
+        self._number_of_courses = number_of_courses
+        self._kept: deque[Course] = deque()
+        self.first_kept = 0
+
+    def __len__(self) -> int:
+        return self._number_of_courses
+
+    def __getitem__(self, index: int) -> Course:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("course index out of range")
+        if index < self.first_kept:
+            return Course(index * COURSE_HEIGHT, [], True)
+        while self.first_kept + len(self._kept) <= index:
+            self._kept.append(next(self._courses))
+        return self._kept[index - self.first_kept]
+
+    def __iter__(self) -> Iterator[Course]:
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def planned(self) -> int:
+        return len(self._kept)
+
+    def drop_below(self, index: int) -> None:
+        # only built courses may be dropped. they're unlinked from each other and from
+        # the course above them, so that they're freed straight away rather than by the
+        # garbage collector
+        if index <= self.first_kept:
+            return
+        while self._kept and self.first_kept < index:
+            for unit in self._kept.popleft().units:
+                unit.supporters = []
+                unit.dependents = []
+            self.first_kept += 1
+        if self._kept and self.first_kept == index:
+            for unit in self._kept[0].units:
+                unit.supporters = []
+                unit._unbuilt_supporters = 0
+
+
+@dataclass
+class StreamingWall(Wall):
+    courses: StreamedCourses
+
+    def course_indices_within(self, min_y: int, max_y: int) -> range:
+        # courses are planned at every COURSE_HEIGHT, so there's no need to plan them
+        # all to find their heights
+        number_of_courses = len(self.courses)
+        return range(
+            min(number_of_courses, max(0, -(-min_y // COURSE_HEIGHT))),
+            min(
+                number_of_courses, max(0, (max_y - COURSE_HEIGHT) // COURSE_HEIGHT + 1)
+            ),
+        )
+
+    def next_non_complete_course(self) -> Optional[Course]:
+        if self._is_built:
+            return None
+        for index in range(self.courses.first_kept, len(self.courses)):
+            course = self.courses[index]
+            if not course.is_built():
+                # nothing can be laid on the built courses below this one any more
+                self.courses.drop_below(index)
+                return course
+        self._is_built = True
+        return None
+
+    def reset(self) -> None:
+        raise NotImplementedError("A streaming wall can't be reset once it's built")
+
+
+WallKey = tuple[int, int, type[Bond], Optional[int]]
+
+
+class WallCache:
+    def __init__(self, max_walls: int = 8) -> None:
+        self._max_walls = max_walls
+        self._walls: OrderedDict[WallKey, Wall] = OrderedDict()
+
+    def get(
+        self, length: int, height: int, bond: type[Bond], seed: Optional[int] = None
+    ) -> Wall:
+        # the geometry of a wall only depends on its size, its bond and, for random
+        # bonds, the seed, so a cached wall can be handed out again with its build
+        # state reset. the wall is reset in place, so it is only valid until the same
+        # wall is asked for again
+        if bond.is_random() and seed is None:
+            return create_wall(length, height, bond())
+        key = (length, height, bond, seed if bond.is_random() else None)
+        wall = self._walls.get(key)
+        if wall is None:
+            rng = random.Random(seed) if seed is not None else None
+            wall = self._walls[key] = create_wall(length, height, bond(rng))
+            if len(self._walls) > self._max_walls:
+                self._walls.popitem(last=False)
+        else:
+            self._walls.move_to_end(key)
+            wall.reset()
+        return wall
@@ -0,0 +1,108 @@
+import io
+
+import pytest
+
+from buildplanner.batch import (
+    WallSpec,
+    _json_objects,
+    plan_wall,
+    plan_walls,
+    read_manifest,
+)
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.wall import StretcherBond, create_wall
+
+
+def test_wall_spec_from_csv_row_uses_defaults_for_empty_values():
+    row = {
+        "name": "",
+        "length": "2300",
+        "height": "2000",
+        "bond": "flemish",
+        "envelope_length": "",
+        "envelope_height": "",
+        "alignment": "",
+        "move": "snake",
+        "seed": "3",
+    }
+    assert WallSpec.from_row(row, 7) == WallSpec(
+        "7", 2300, 2000, "flemish", 800, 1300, None, "snake", 3
+    )
+
+
+@pytest.mark.parametrize(
+    "row, error",
+    [
+        ({"length": 2300, "height": 2000, "colour": "red"}, "Unknown fields colour"),
+        ({"length": 2300}, "No height"),
+        ({"length": 2300, "height": 0}, "height"),
+        ({"length": 2300, "height": 2000, "bond": "english"}, "Unknown bond"),
+        ({"length": 2300, "height": 2000, "envelope_length": 100}, "too small"),
+    ],
+)
+def test_wall_spec_from_row_rejects_bad_rows(row, error):
+    with pytest.raises(ValueError, match=error):
+        WallSpec.from_row(row, 0)
+
+
+@pytest.mark.parametrize(
+    "manifest",
+    [
+        '[{"name": "a", "length": 1}, {"name": "b", "length": 2}]',
+        '{"name": "a", "length": 1}\n{"name": "b", "length": 2}\n',
+    ],
+)
+def test_json_objects_are_read_across_chunks(manifest):
+    objects = list(_json_objects(io.StringIO(manifest), chunk_size=3))
+    assert objects == [{"name": "a", "length": 1}, {"name": "b", "length": 2}]
+
+
+def test_json_objects_reject_invalid_json():
+    with pytest.raises(ValueError):
+        list(_json_objects(io.StringIO('[{"name": "a"'), chunk_size=3))
+
+
+def test_read_csv_manifest():
+    manifest = io.StringIO("name,length,height\na,2300,2000\nb,1000,500\n")
+    assert [row["name"] for row in read_manifest(manifest, "csv")] == ["a", "b"]
+
+
+def test_plan_wall_with_given_strategies_follows_robot():
+    wall = create_wall(23000, 20000, StretcherBond())
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    while True:
+        robot.lay_stride(wall)
+        if not robot.move(wall):
+            break
+    result = plan_wall(WallSpec("a", 2300, 2000, alignment="center", move="outside_in"))
+    assert result["strides"] == robot.move_count + 1
+    assert (result["alignment"], result["move"]) == ("center", "outside_in")
+
+
+def test_plan_walls_keeps_manifest_order_and_reports_bad_rows():
+    rows = [
+        {"name": "a", "length": 2300, "height": 1000, "move": "left_to_right"},
+        {"name": "b", "length": 0, "height": 1000},
+        {"name": "c", "length": 1000, "height": 1000, "move": "left_to_right"},
+    ]
+    results = list(plan_walls(rows, workers=1))
+    assert [result["index"] for result in results] == [0, 1, 2]
+    assert [result["name"] for result in results] == ["a", "b", "c"]
+    assert "error" in results[1]
+    assert results[0]["strides"] > results[2]["strides"]
+
+
+def test_plan_walls_reads_a_bounded_number_of_rows_ahead():
+    read = []
+
+    def rows():
+        for index in range(6):
+            read.append(index)
+            yield {"length": 1000, "height": 500, "move": "left_to_right"}
+
+    for result in plan_walls(rows(), workers=2, in_flight=2):
+        assert len(read) <= result["index"] + 2
@@ -0,0 +1,72 @@
+from buildplanner.benchmark import (
+    Measurement,
+    find_regressions,
+    measure,
+    read_baseline,
+    scaling_exponents,
+    write_baseline,
+)
+from buildplanner.wall import Bond, StretcherBond, WallPlanningException
+
+
+class _UnplannableBond(Bond):
+    def next_brick_in_course(self, *args):
+        raise WallPlanningException("Couldn't plan")
+
+
+def test_measure_plans_and_lays_a_wall():
+    measurement = measure("stretcher", StretcherBond, (2300, 2000), repeats=1)
+    assert measurement.key == "stretcher 2300x2000"
+    assert measurement.error is None
+    assert measurement.bricks == 352
+    assert measurement.plan_seconds > 0
+    assert measurement.lay_seconds > 0
+    assert measurement.peak_kib > 0
+    assert measurement.sweep_seconds is None
+
+
+def test_measure_records_walls_that_cannot_be_planned():
+    measurement = measure("unplannable", _UnplannableBond, (2300, 2000), repeats=1)
+    assert measurement.error.startswith("Couldn't plan")
+    assert measurement.lay_seconds is None
+
+
+def test_find_regressions():
+    baseline = {
+        "stretcher 2300x2000": Measurement("stretcher", 2300, 2000, 352, 0.1, 0.2, 300),
+        "wild 2300x2000": Measurement("wild", 2300, 2000, 414, 0.1, 0.2, 300),
+    }
+    measurements = [
+        # slower, but by less than the threshold or by less than the noise
+        Measurement("stretcher", 2300, 2000, 352, 0.12, 0.21, 350),
+        Measurement("wild", 2300, 2000, error="Couldn't plan"),
+    ]
+    assert find_regressions(baseline, measurements) == ["wild 2300x2000: Couldn't plan"]
+    measurements[0].lay_seconds = 0.3
+    measurements[0].peak_kib = 400
+    assert find_regressions(baseline, measurements[:1]) == [
+        "stretcher 2300x2000: lay_seconds went from 0.2 to 0.3 (+50%)",
+        "stretcher 2300x2000: peak_kib went from 300 to 400 (+33%)",
+    ]
+    assert find_regressions(baseline, measurements[:1], threshold=0.5) == []
+
+
+def test_scaling_exponents():
+    measurements = [
+        Measurement("stretcher", 2300, 2000, 100, 0.1, 1.0, 300),
+        Measurement("stretcher", 4600, 2000, 200, 0.1, 4.0, 300),
+        Measurement("stretcher", 2300, 4000, 200, 0.1, 2.0, 300),
+    ]
+    assert scaling_exponents(measurements) == {"stretcher 4600x2000": 2.0}
+
+
+def test_write_and_read_baseline(tmp_path):
+    measurements = [
+        Measurement("stretcher", 2300, 2000, 352, 0.1, 0.2, 300, 2.5),
+        Measurement("wild", 50000, 2000, error="Couldn't plan"),
+    ]
+    path = str(tmp_path / "baseline.json")
+    write_baseline(path, measurements)
+    assert read_baseline(path) == {
+        measurement.key: measurement for measurement in measurements
+    }
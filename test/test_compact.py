@@ -0,0 +1,79 @@
+from buildplanner.compact import BRICK_KIND, HEAD_JOINT_KIND, CompactWall
+from buildplanner.model import Brick, HeadJoint
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.util import Point, Rectangle
+from buildplanner.wall import FlemishBond, StretcherBond, create_wall
+
+
+def test_compact_wall_from_wall():
+    wall = create_wall(23000, 20000, StretcherBond())
+    wall.courses[0].units[0].is_built = True
+    compact_wall = CompactWall.from_wall(wall)
+    assert len(compact_wall) == sum(len(course.units) for course in wall.courses)
+    assert list(compact_wall.course_starts[:3]) == [0, 21, 42]
+    assert compact_wall.kind[0] == BRICK_KIND
+    assert compact_wall.kind[1] == HEAD_JOINT_KIND
+    assert compact_wall.built[0]
+    assert not compact_wall.built[1]
+    assert compact_wall.unit_box(22) == wall.courses[1].units[1].box
+
+
+def test_compact_wall_is_supported():
+    compact_wall = CompactWall.from_wall(create_wall(23000, 20000, StretcherBond()))
+    assert compact_wall.is_supported(0)
+    assert not compact_wall.is_supported(21)
+    compact_wall.built[0] = True
+    assert compact_wall.is_supported(21)
+    assert not compact_wall.is_supported(23)
+
+
+def test_compact_wall_unit_ranges_within():
+    compact_wall = CompactWall.from_wall(create_wall(23000, 20000, StretcherBond()))
+    ranges = list(compact_wall.unit_ranges_within(Rectangle(Point(0, 0), 4300, 1250)))
+    assert ranges == [range(0, 3), range(21, 25)]
+
+
+def test_compact_wall_lay_stride_matches_robot():
+    wall = create_wall(23000, 20000, FlemishBond())
+    compact_wall = CompactWall.from_wall(wall)
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    robot.move(wall)
+    bricks = []
+    while (brick := robot.lay_brick(wall)) is not None:
+        bricks.append(brick)
+    laid = compact_wall.lay_stride(robot.reachable_area)
+    assert [compact_wall.unit_box(i) for i in laid] == [brick.box for brick in bricks]
+
+
+def test_compact_wall_as_wall_writes_through():
+    compact_wall = CompactWall.from_wall(create_wall(23000, 20000, StretcherBond()))
+    wall = compact_wall.as_wall()
+    first_brick = wall.courses[0].units[0]
+    assert isinstance(first_brick, Brick)
+    assert isinstance(wall.courses[0].units[1], HeadJoint)
+    assert not wall.courses[1].units[0].is_supported(wall.courses[0])
+    first_brick.is_built = True
+    assert compact_wall.built[0]
+    assert wall.courses[1].units[0].is_supported(wall.courses[0])
+    assert first_brick.dependents == wall.courses[1].units[:3]
+
+
+def test_compact_wall_as_wall_can_be_built_by_robot():
+    wall = create_wall(23000, 20000, StretcherBond())
+    compact_wall = CompactWall.from_wall(create_wall(23000, 20000, StretcherBond()))
+    view = compact_wall.as_wall()
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    view_robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    while True:
+        brick = robot.lay_brick(wall)
+        view_brick = view_robot.lay_brick(view)
+        assert (brick and brick.box) == (view_brick and view_brick.box)
+        if brick is None:
+            view_robot.move(view)
+            if not robot.move(wall):
+                break
+    assert all(compact_wall.built)
@@ -0,0 +1,76 @@
+import pytest
+
+from buildplanner.fleet import Fleet
+from buildplanner.model import Brick
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.wall import FlemishBond, StretcherBond, create_wall
+
+
+def _move_strategy():
+    return OutsideInMoveStrategy(CenterAlignmentStrategy())
+
+
+def _fleet(wall, number_of_robots, dynamic_zones=False):
+    return Fleet(wall, number_of_robots, 8000, 13000, _move_strategy, dynamic_zones)
+
+
+def test_one_robot_fleet_builds_like_a_robot():
+    wall = create_wall(23000, 20000, StretcherBond())
+    robot = Robot(8000, 13000, _move_strategy())
+    while True:
+        robot.lay_stride(wall)
+        if not robot.move(wall):
+            break
+    wall.reset()
+    result = _fleet(wall, 1).run()
+    assert result.strides == robot.move_count + 1
+    assert result.makespan == result.strides
+    assert result.strides_per_robot == [result.strides]
+
+
+@pytest.mark.parametrize("dynamic_zones", [False, True])
+def test_fleet_keeps_robots_apart_and_lays_on_built_units(dynamic_zones):
+    wall = create_wall(100000, 20000, FlemishBond())
+    fleet = _fleet(wall, 4, dynamic_zones)
+    while not fleet.is_built():
+        fleet.step()
+        envelopes = fleet.envelopes
+        for left, right in zip(envelopes, envelopes[1:]):
+            assert left.bottom_right_corner.x <= right.bottom_left_corner.x
+        for course in wall.courses:
+            for unit in course.units:
+                if unit.is_built:
+                    assert all(supporter.is_built for supporter in unit.supporters)
+    bricks = sum(
+        isinstance(unit, Brick) for course in wall.courses for unit in course.units
+    )
+    assert fleet.bricks == bricks
+
+
+def test_more_robots_finish_sooner():
+    wall = create_wall(100000, 20000, StretcherBond())
+    one = _fleet(wall, 1).run()
+    wall.reset()
+    four = _fleet(wall, 4).run()
+    assert four.bricks == one.bricks
+    assert four.makespan < one.makespan / 3
+    assert sum(four.strides_per_robot) == four.strides
+
+
+@pytest.mark.parametrize("dynamic_zones", [False, True])
+def test_fleet_packed_along_the_wall_finishes(dynamic_zones):
+    wall = create_wall(100000, 20000, StretcherBond())
+    one = _fleet(wall, 1).run()
+    wall.reset()
+    # twelve 800 mm envelopes leave less than a brick to spare along a 10 m wall
+    packed = _fleet(wall, 12, dynamic_zones).run()
+    assert packed.bricks == one.bricks
+
+
+def test_fleet_must_fit_along_the_wall():
+    with pytest.raises(ValueError):
+        _fleet(create_wall(23000, 20000, StretcherBond()), 3)
@@ -0,0 +1,79 @@
+import struct
+import zlib
+
+from buildplanner.image import (
+    BACKGROUND,
+    UNBUILT,
+    PngCanvas,
+    SvgCanvas,
+    render,
+    render_frames,
+    stride_colour,
+)
+from buildplanner.plan import BuildPlan
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.wall import StretcherBond, create_wall
+
+
+def _wall_and_plan():
+    wall = create_wall(23000, 20000, StretcherBond())
+    plan = BuildPlan.compile(
+        wall, Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    )
+    return wall, plan
+
+
+def _png_chunks(png):
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    chunks = {}
+    offset = 8
+    while offset < len(png):
+        (length,) = struct.unpack_from(">I", png, offset)
+        kind = png[offset + 4 : offset + 8]
+        data = png[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack_from(">I", png, offset + 8 + length)
+        assert crc == zlib.crc32(kind + data)
+        chunks[kind] = data
+        offset += 12 + length
+    return chunks
+
+
+def test_svg_draws_every_brick_with_its_stride():
+    wall, plan = _wall_and_plan()
+    svg = render(SvgCanvas(wall), wall, plan).decode()
+    assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg" width="2300mm"')
+    # the background, then every brick once unbuilt and once built
+    assert svg.count("<rect") == 1 + 2 * len(plan)
+    assert svg.count("<text") == len(plan)
+    first = plan[0]
+    assert f">{first.stride}</text>" in svg
+    assert 'x="0" y="1937.5" width="210" height="50"' in svg
+
+
+def test_png_is_a_valid_image_coloured_by_stride():
+    wall, plan = _wall_and_plan()
+    chunks = _png_chunks(render(PngCanvas(wall, pixels_per_mm=0.1), wall, plan))
+    width, height, depth, colour_type = struct.unpack_from(">IIBB", chunks[b"IHDR"])
+    assert (width, height, depth, colour_type) == (230, 200, 8, 2)
+    rows = zlib.decompress(chunks[b"IDAT"])
+    assert len(rows) == height * (width * 3 + 1)
+    # the bottom row is the first bed joint, and the first brick sits just above it
+    start = (height - 1) * (width * 3 + 1) + 1
+    assert tuple(rows[start : start + 3]) == BACKGROUND
+    start = (height - 3) * (width * 3 + 1) + 1
+    assert tuple(rows[start : start + 3]) == stride_colour(plan[0].stride)
+
+
+def test_render_frames_draws_one_frame_per_stride():
+    wall, plan = _wall_and_plan()
+    frames = list(render_frames(PngCanvas(wall, pixels_per_mm=0.1), wall, plan))
+    assert len(frames) == plan.strides
+    assert frames[-1] == render(PngCanvas(wall, pixels_per_mm=0.1), wall, plan)
+    # after the first stride the top right brick is still waiting to be laid
+    rows = zlib.decompress(_png_chunks(frames[0])[b"IDAT"])
+    start = 2 * (230 * 3 + 1) + 1 + 229 * 3
+    assert tuple(rows[start : start + 3]) == UNBUILT
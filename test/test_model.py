@@ -5,40 +5,40 @@ from buildplanner.util import Point, Rectangle
 def test_create_full_brick():
     brick = Brick.create_full_brick(Point(0, 0))
     assert brick.box.bottom_left_corner == Point(0, 0)
-    assert brick.box.length == 210
-    assert brick.box.height == 50
+    assert brick.box.length == 2100
+    assert brick.box.height == 500
     assert not brick.is_built
 
 
 def test_create_three_quarter_brick():
-    brick = Brick.create_three_quarter_brick(Point(3, 4))
-    assert brick.box.bottom_left_corner == Point(3, 4)
-    assert brick.box.length == 155
-    assert brick.box.height == 50
+    brick = Brick.create_three_quarter_brick(Point(30, 40))
+    assert brick.box.bottom_left_corner == Point(30, 40)
+    assert brick.box.length == 1550
+    assert brick.box.height == 500
     assert not brick.is_built
 
 
 def test_create_half_brick():
-    brick = Brick.create_half_brick(Point(1, 4))
-    assert brick.box.bottom_left_corner == Point(1, 4)
-    assert brick.box.length == 100
-    assert brick.box.height == 50
+    brick = Brick.create_half_brick(Point(10, 40))
+    assert brick.box.bottom_left_corner == Point(10, 40)
+    assert brick.box.length == 1000
+    assert brick.box.height == 500
     assert not brick.is_built
 
 
 def test_create_quarter_brick():
-    brick = Brick.create_quarter_brick(Point(1, 4))
-    assert brick.box.bottom_left_corner == Point(1, 4)
-    assert brick.box.length == 45
-    assert brick.box.height == 50
+    brick = Brick.create_quarter_brick(Point(10, 40))
+    assert brick.box.bottom_left_corner == Point(10, 40)
+    assert brick.box.length == 450
+    assert brick.box.height == 500
     assert not brick.is_built
 
 
 def test_create_head_joint():
-    head_joint = HeadJoint.create_head_joint(Point(2, 3))
-    assert head_joint.box.bottom_left_corner == Point(2, 3)
-    assert head_joint.box.length == 10
-    assert head_joint.box.height == 50
+    head_joint = HeadJoint.create_head_joint(Point(20, 30))
+    assert head_joint.box.bottom_left_corner == Point(20, 30)
+    assert head_joint.box.length == 100
+    assert head_joint.box.height == 500
     assert not head_joint.is_built
 
 
@@ -48,14 +48,14 @@ def test_unit_is_supported_when_first_course():
 
 
 def test_unit_is_supported_when_both_below_not_built():
-    brick = Brick.create_full_brick(Point(100, 62.5))
-    irrelevant_built_brick = Brick.create_full_brick(Point(500, 0))
+    brick = Brick.create_full_brick(Point(1000, 625))
+    irrelevant_built_brick = Brick.create_full_brick(Point(5000, 0))
     irrelevant_built_brick.is_built = True
     course_below = Course(
         0,
         [
             Brick.create_full_brick(Point(0, 0)),
-            Brick.create_full_brick(Point(220, 0)),
+            Brick.create_full_brick(Point(2200, 0)),
             irrelevant_built_brick,
         ],
     )
@@ -63,28 +63,68 @@ def test_unit_is_supported_when_both_below_not_built():
 
 
 def test_unit_is_supported_when_one_below_not_built():
-    brick = Brick.create_full_brick(Point(100, 62.5))
+    brick = Brick.create_full_brick(Point(1000, 625))
     built_brick = Brick.create_full_brick(Point(0, 0))
     built_brick.is_built = True
-    course_below = Course(0, [built_brick, Brick.create_full_brick(Point(220, 0))])
+    course_below = Course(0, [built_brick, Brick.create_full_brick(Point(2200, 0))])
     assert not brick.is_supported(course_below)
 
 
 def test_unit_is_supported_when_all_below_built():
-    brick = Brick.create_full_brick(Point(100, 62.5))
+    brick = Brick.create_full_brick(Point(1000, 625))
     built_brick = Brick.create_full_brick(Point(0, 0))
     built_brick.is_built = True
-    built_brick_2 = Brick.create_full_brick(Point(220, 0))
+    built_brick_2 = Brick.create_full_brick(Point(2200, 0))
     built_brick_2.is_built = True
     course_below = Course(
-        0, [built_brick, built_brick_2, Brick.create_full_brick(Point(500, 0))]
+        0, [built_brick, built_brick_2, Brick.create_full_brick(Point(5000, 0))]
     )
     assert brick.is_supported(course_below)
 
 
+def test_course_link_supports():
+    below = [
+        Brick.create_full_brick(Point(0, 0)),
+        HeadJoint.create_head_joint(Point(2100, 0)),
+        Brick.create_full_brick(Point(2200, 0)),
+    ]
+    above = [
+        Brick.create_half_brick(Point(0, 625)),
+        HeadJoint.create_head_joint(Point(1000, 625)),
+        Brick.create_full_brick(Point(1100, 625)),
+    ]
+    course = Course(625, above)
+    course.link_supports(Course(0, below))
+    assert above[0].supporters == [below[0]]
+    assert above[1].supporters == [below[0]]
+    assert above[2].supporters == below
+    assert below[0].dependents == above
+    assert below[2].dependents == [above[2]]
+
+
+def test_unit_is_supported_when_linked_and_supporters_get_built():
+    built_brick = Brick.create_full_brick(Point(0, 0))
+    built_brick.is_built = True
+    brick_below = Brick.create_full_brick(Point(2200, 0))
+    brick = Brick.create_full_brick(Point(1000, 625))
+    Course(625, [brick]).link_supports(Course(0, [built_brick, brick_below]))
+    assert not brick.is_supported(None)
+    brick_below.is_built = True
+    assert brick.is_supported(None)
+    brick_below.is_built = False
+    assert not brick.is_supported(None)
+
+
+def test_unit_is_supported_when_linked_on_first_course():
+    brick = Brick.create_full_brick(Point(0, 0))
+    Course(0, [brick]).link_supports(None)
+    assert brick.supporters == []
+    assert brick.is_supported(None)
+
+
 def test_course_index():
     assert Course(0, []).index == 0
-    assert Course(62.5, []).index == 1
+    assert Course(625, []).index == 1
 
 
 def test_course_is_built_when_some_units_are_not():
@@ -94,7 +134,7 @@ def test_course_is_built_when_some_units_are_not():
         0,
         [
             built_brick,
-            Brick.create_full_brick(Point(220, 0)),
+            Brick.create_full_brick(Point(2200, 0)),
         ],
     )
     assert not course.is_built()
@@ -103,20 +143,61 @@ def test_course_is_built_when_some_units_are_not():
 def test_course_is_built_when_all_units_built():
     built_brick = Brick.create_full_brick(Point(0, 0))
     built_brick.is_built = True
-    head_joint = HeadJoint.create_head_joint(Point(210, 0))
+    head_joint = HeadJoint.create_head_joint(Point(2100, 0))
     head_joint.is_built = True
-    built_brick_2 = Brick.create_full_brick(Point(220, 0))
+    built_brick_2 = Brick.create_full_brick(Point(2200, 0))
     built_brick_2.is_built = True
     course = Course(0, [built_brick, head_joint, built_brick_2])
     assert course.is_built()
     assert course.is_built()  # test it caches correct value
 
 
+def test_course_units_within():
+    units = [
+        Brick.create_full_brick(Point(0, 0)),
+        HeadJoint.create_head_joint(Point(2100, 0)),
+        Brick.create_full_brick(Point(2200, 0)),
+        HeadJoint.create_head_joint(Point(4300, 0)),
+        Brick.create_full_brick(Point(4400, 0)),
+    ]
+    course = Course(0, units)
+    assert course.units_within(0, 6500) == units
+    assert course.units_within(50, 6500) == units[1:]
+    assert course.units_within(2100, 4400) == units[1:4]
+    assert course.units_within(2110, 4290) == []
+
+
+def test_wall_course_indices_within():
+    wall = Wall(
+        Rectangle(Point(0, 0), 100, 5000),
+        [Course(i * 625, []) for i in range(8)],
+    )
+    assert wall.course_indices_within(0, 5000) == range(0, 8)
+    assert wall.course_indices_within(625, 2500) == range(1, 4)
+    assert wall.course_indices_within(700, 2500) == range(2, 4)
+    assert wall.course_indices_within(700, 1200) == range(2, 2)
+
+
+def test_course_joint_exists_at():
+    course = Course(
+        0,
+        [
+            Brick.create_full_brick(Point(0, 0)),
+            HeadJoint.create_head_joint(Point(2100, 0)),
+            Brick.create_full_brick(Point(2200, 0)),
+        ],
+    )
+    assert course.joint_exists_at(2100)
+    assert not course.joint_exists_at(2101)
+    assert not course.joint_exists_at(0)
+    assert not course.joint_exists_at(2200)
+
+
 def test_wall_next_non_complete_course_when_not_yet_started():
     first_course = Course(0, [Brick.create_full_brick(Point(0, 0))])
     wall = Wall(
-        Rectangle(Point(0, 0), 10, 500),
-        [first_course, Course(62.5, [Brick.create_full_brick(Point(0, 62.5))])],
+        Rectangle(Point(0, 0), 100, 5000),
+        [first_course, Course(625, [Brick.create_full_brick(Point(0, 625))])],
     )
     assert wall.next_non_complete_course() is first_course
 
@@ -124,9 +205,9 @@ def test_wall_next_non_complete_course_when_not_yet_started():
 def test_wall_next_non_complete_course_when_started():
     built_brick = Brick.create_full_brick(Point(0, 0))
     built_brick.is_built = True
-    second_course = Course(62.5, [Brick.create_full_brick(Point(0, 62.5))])
+    second_course = Course(625, [Brick.create_full_brick(Point(0, 625))])
     wall = Wall(
-        Rectangle(Point(0, 0), 10, 500), [Course(0, [built_brick]), second_course]
+        Rectangle(Point(0, 0), 100, 5000), [Course(0, [built_brick]), second_course]
     )
     assert wall.next_non_complete_course() is second_course
 
@@ -135,8 +216,24 @@ def test_wall_next_non_complete_course_when_finished():
     built_brick = Brick.create_full_brick(Point(0, 0))
     built_brick.is_built = True
     wall = Wall(
-        Rectangle(Point(0, 0), 10, 500),
-        [Course(0, [built_brick]), Course(62.5, [built_brick])],
+        Rectangle(Point(0, 0), 100, 5000),
+        [Course(0, [built_brick]), Course(625, [built_brick])],
     )
     assert wall.next_non_complete_course() is None
     assert wall.next_non_complete_course() is None  # test it caches correct value
+
+
+def test_wall_reset():
+    built_brick = Brick.create_full_brick(Point(0, 0))
+    brick = Brick.create_full_brick(Point(0, 625))
+    first_course = Course(0, [built_brick])
+    second_course = Course(625, [brick])
+    second_course.link_supports(first_course)
+    wall = Wall(Rectangle(Point(0, 0), 100, 5000), [first_course, second_course])
+    built_brick.is_built = True
+    brick.is_built = True
+    assert wall.next_non_complete_course() is None
+    wall.reset()
+    assert not built_brick.is_built
+    assert not brick.is_supported(first_course)
+    assert wall.next_non_complete_course() is first_course
@@ -0,0 +1,95 @@
+import pytest
+
+from buildplanner.model import Brick
+from buildplanner.plan import BuildPlan, PlannedBrick
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.util import Point, Rectangle
+from buildplanner.wall import FlemishBond, create_wall
+
+
+def _compile_plan():
+    return BuildPlan.compile(
+        create_wall(23000, 20000, FlemishBond()),
+        Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy())),
+    )
+
+
+def test_build_plan_compile_follows_robot():
+    wall = create_wall(23000, 20000, FlemishBond())
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    bricks = [
+        unit
+        for course in wall.courses
+        for unit in course.units
+        if isinstance(unit, Brick)
+    ]
+    expected = []
+    while True:
+        for brick in robot.lay_stride(wall):
+            expected.append(
+                PlannedBrick(
+                    robot.move_count + 1,
+                    robot.reachable_area,
+                    bricks.index(brick),
+                    brick.box,
+                )
+            )
+        if not robot.move(wall):
+            break
+    plan = _compile_plan()
+    assert list(plan) == expected
+    assert len(plan) == len(bricks)
+    assert plan.strides == robot.move_count + 1
+    assert plan[0] == PlannedBrick(
+        1, Rectangle(Point(0, 0), 8000, 13000), 0, bricks[0].box
+    )
+    assert plan[-1] == expected[-1]
+
+
+def test_build_plan_write_and_read(tmp_path):
+    plan = _compile_plan()
+    path = str(tmp_path / "plan.bin")
+    plan.write(path)
+    read_plan = BuildPlan.read(path)
+    assert list(read_plan) == list(plan)
+    assert read_plan[10] == plan[10]
+
+
+def test_build_plan_write_and_read_json_lines(tmp_path):
+    plan = _compile_plan()
+    path = str(tmp_path / "plan.jsonl")
+    plan.write_json_lines(path)
+    with open(path) as file:
+        assert file.readline().startswith(
+            '{"stride": 1, "envelope": [0.0, 0.0, 800.0, 1300.0], "brick_id": 0'
+        )
+    assert list(BuildPlan.read_json_lines(path)) == list(plan)
+
+
+def test_build_plan_rejects_other_files(tmp_path):
+    with pytest.raises(ValueError):
+        BuildPlan(bytearray(b"not a plan"))
+    path = tmp_path / "plan.bin"
+    _compile_plan().write(str(path))
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        BuildPlan.read(str(path))
+
+
+def test_build_plan_bricks_laid_by_stride():
+    plan = _compile_plan()
+    bricks_laid_by_stride = plan.bricks_laid_by_stride()
+    assert len(bricks_laid_by_stride) == plan.strides + 1
+    assert bricks_laid_by_stride[0] == 0
+    assert bricks_laid_by_stride[-1] == len(plan)
+    for stride in range(1, plan.strides + 1):
+        assert all(
+            plan[index].stride == stride
+            for index in range(
+                bricks_laid_by_stride[stride - 1], bricks_laid_by_stride[stride]
+            )
+        )
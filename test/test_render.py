@@ -0,0 +1,66 @@
+from buildplanner.plan import BuildPlan
+from buildplanner.render import UNBUILT_COLOUR, StridePlayer
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.wall import StretcherBond, create_wall
+
+
+class _RecordingRenderer:
+    def __init__(self):
+        self.boxes = []
+
+    def render_box(self, box, colour, stride):
+        self.boxes.append((box, colour, stride))
+
+
+def _player():
+    plan = BuildPlan.compile(
+        create_wall(23000, 20000, StretcherBond()),
+        Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy())),
+    )
+    renderer = _RecordingRenderer()
+    return plan, renderer, StridePlayer(renderer, plan, lambda stride: f"{stride}")
+
+
+def test_stride_player_draws_whole_strides():
+    plan, renderer, player = _player()
+    player.seek(1)
+    first_stride = [
+        (planned_brick.box, "1", 1)
+        for planned_brick in plan
+        if planned_brick.stride == 1
+    ]
+    assert renderer.boxes == first_stride
+    player.seek(3)
+    assert renderer.boxes == [
+        (planned_brick.box, f"{planned_brick.stride}", planned_brick.stride)
+        for planned_brick in plan
+        if planned_brick.stride <= 3
+    ]
+
+
+def test_stride_player_seeks_backwards_and_clamps():
+    plan, renderer, player = _player()
+    player.seek(plan.strides + 10)
+    assert player.stride == plan.strides
+    assert len(renderer.boxes) == len(plan)
+    renderer.boxes.clear()
+    player.seek(plan.strides - 2)
+    assert renderer.boxes == [
+        (planned_brick.box, UNBUILT_COLOUR, None)
+        for planned_brick in plan
+        if planned_brick.stride > plan.strides - 2
+    ]
+    renderer.boxes.clear()
+    player.seek(-1)
+    assert player.stride == 0
+    assert len(renderer.boxes) == len(plan) - len(
+        [
+            planned_brick
+            for planned_brick in plan
+            if planned_brick.stride > plan.strides - 2
+        ]
+    )
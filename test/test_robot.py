@@ -1,3 +1,5 @@
+import random
+
 from buildplanner.robot import (
     Robot,
     LeftToRightMoveStrategy,
@@ -15,76 +17,97 @@ from buildplanner.model import (
     BED_JOINT_THICKNESS,
     COURSE_HEIGHT,
 )
-from buildplanner.wall import StretcherBond, create_wall
+from buildplanner.wall import (
+    StretcherBond,
+    WildBond,
+    create_streaming_wall,
+    create_wall,
+)
 
 
 def test_left_alignment_strategy():
     alignment_strategy = LeftAlignmentStrategy()
-    brick = Brick(Rectangle(Point(14, BED_JOINT_THICKNESS), 2, 10))
-    robot = Robot(10, 10, LeftToRightMoveStrategy(alignment_strategy))
-    wall = create_wall(30, 30, StretcherBond())
+    brick = Brick(Rectangle(Point(140, BED_JOINT_THICKNESS), 20, 100))
+    robot = Robot(100, 100, LeftToRightMoveStrategy(alignment_strategy))
+    wall = create_wall(300, 300, StretcherBond())
     next_area = alignment_strategy.next_reachable_area(brick, robot, wall)
-    assert next_area == Rectangle(Point(14, 0), 10, 10)
+    assert next_area == Rectangle(Point(140, 0), 100, 100)
 
 
 def test_right_alignment_strategy():
     alignment_strategy = RightAlignmentStrategy()
-    brick = Brick(Rectangle(Point(14, 10 + BED_JOINT_THICKNESS), 2, 10))
-    robot = Robot(10, 10, LeftToRightMoveStrategy(alignment_strategy))
-    wall = create_wall(30, 30, StretcherBond())
+    brick = Brick(Rectangle(Point(140, 100 + BED_JOINT_THICKNESS), 20, 100))
+    robot = Robot(100, 100, LeftToRightMoveStrategy(alignment_strategy))
+    wall = create_wall(300, 300, StretcherBond())
     next_area = alignment_strategy.next_reachable_area(brick, robot, wall)
-    assert next_area == Rectangle(Point(6, 10), 10, 10)
+    assert next_area == Rectangle(Point(60, 100), 100, 100)
 
 
 def test_center_alignment_strategy():
     alignment_strategy = CenterAlignmentStrategy()
-    brick = Brick(Rectangle(Point(14, BED_JOINT_THICKNESS), 2, 10))
-    robot = Robot(10, 10, LeftToRightMoveStrategy(alignment_strategy))
-    wall = create_wall(30, 30, StretcherBond())
+    brick = Brick(Rectangle(Point(140, BED_JOINT_THICKNESS), 20, 100))
+    robot = Robot(100, 100, LeftToRightMoveStrategy(alignment_strategy))
+    wall = create_wall(300, 300, StretcherBond())
     next_area = alignment_strategy.next_reachable_area(brick, robot, wall)
-    assert next_area == Rectangle(Point(10, 0), 10, 10)
+    assert next_area == Rectangle(Point(100, 0), 100, 100)
 
 
 def test_random_alignment_strategy():
     alignment_strategy = RandomAlignmentStrategy()
-    brick = Brick(Rectangle(Point(14, BED_JOINT_THICKNESS), 2, 10))
-    robot = Robot(10, 10, LeftToRightMoveStrategy(alignment_strategy))
-    wall = create_wall(30, 30, StretcherBond())
+    brick = Brick(Rectangle(Point(140, BED_JOINT_THICKNESS), 20, 100))
+    robot = Robot(100, 100, LeftToRightMoveStrategy(alignment_strategy))
+    wall = create_wall(300, 300, StretcherBond())
     next_area = alignment_strategy.next_reachable_area(brick, robot, wall)
-    assert 6 <= next_area.bottom_left_corner.x <= 14
+    assert 60 <= next_area.bottom_left_corner.x <= 140
+
+
+def test_random_alignment_strategy_when_seeded():
+    brick = Brick(Rectangle(Point(140, BED_JOINT_THICKNESS), 20, 100))
+    wall = create_wall(300, 300, StretcherBond())
+    next_areas = []
+    for _ in range(2):
+        alignment_strategy = RandomAlignmentStrategy(random.Random(7))
+        robot = Robot(100, 100, LeftToRightMoveStrategy(alignment_strategy))
+        next_areas.append(
+            [
+                alignment_strategy.next_reachable_area(brick, robot, wall)
+                for _ in range(5)
+            ]
+        )
+    assert next_areas[0] == next_areas[1]
 
 
 def test_alignment_strategy_keeps_reachable_area_in_wall_boundaries_when_too_far_left():
     alignment_strategy = RightAlignmentStrategy()
     brick = Brick.create_full_brick(Point(0, BED_JOINT_THICKNESS))
-    robot = Robot(10, 10, LeftToRightMoveStrategy(alignment_strategy))
-    wall = create_wall(20, 20, StretcherBond())
+    robot = Robot(100, 100, LeftToRightMoveStrategy(alignment_strategy))
+    wall = create_wall(200, 200, StretcherBond())
     next_area = alignment_strategy.next_reachable_area(brick, robot, wall)
     assert wall.box.bounds(next_area)
 
 
 def test_alignment_strategy_keeps_reachable_area_in_wall_boundaries_when_too_far_right():
     alignment_strategy = LeftAlignmentStrategy()
-    brick = Brick.create_full_brick(Point(19, BED_JOINT_THICKNESS))
-    robot = Robot(10, 10, LeftToRightMoveStrategy(alignment_strategy))
-    wall = create_wall(20, 20, StretcherBond())
+    brick = Brick.create_full_brick(Point(190, BED_JOINT_THICKNESS))
+    robot = Robot(100, 100, LeftToRightMoveStrategy(alignment_strategy))
+    wall = create_wall(200, 200, StretcherBond())
     next_area = alignment_strategy.next_reachable_area(brick, robot, wall)
     assert wall.box.bounds(next_area)
 
 
 def test_alignment_strategy_keeps_reachable_area_in_wall_boundaries_when_too_far_up():
     alignment_strategy = LeftAlignmentStrategy()
-    brick = Brick.create_full_brick(Point(0, 19))
-    robot = Robot(10, 10, LeftToRightMoveStrategy(alignment_strategy))
-    wall = create_wall(20, 20, StretcherBond())
+    brick = Brick.create_full_brick(Point(0, 190))
+    robot = Robot(100, 100, LeftToRightMoveStrategy(alignment_strategy))
+    wall = create_wall(200, 200, StretcherBond())
     next_area = alignment_strategy.next_reachable_area(brick, robot, wall)
     assert wall.box.bounds(next_area)
 
 
 def test_move_strategy_returns_none_when_wall_is_complete():
-    wall = create_wall(2300, 2000, StretcherBond())
+    wall = create_wall(23000, 20000, StretcherBond())
     move_strategy = LeftToRightMoveStrategy(LeftAlignmentStrategy())
-    robot = Robot(800, 1300, move_strategy)
+    robot = Robot(8000, 13000, move_strategy)
     for course in wall.courses:
         for unit in course.units:
             unit.is_built = True
@@ -92,66 +115,72 @@ def test_move_strategy_returns_none_when_wall_is_complete():
 
 
 def test_left_to_right_move_strategy():
-    wall = create_wall(2300, 2000, StretcherBond())
+    wall = create_wall(23000, 20000, StretcherBond())
     move_strategy = LeftToRightMoveStrategy(LeftAlignmentStrategy())
-    robot = Robot(800, 1300, move_strategy)
+    robot = Robot(8000, 13000, move_strategy)
     for unit in wall.courses[0].units[:4]:
         unit.is_built = True
-    assert move_strategy.next_move(robot, wall) == Rectangle(Point(440, 0), 800, 1300)
+    assert move_strategy.next_move(robot, wall) == Rectangle(
+        Point(4400, 0), 8000, 13000
+    )
 
 
 def test_outside_in_move_strategy():
-    wall = create_wall(2300, 2000, StretcherBond())
+    wall = create_wall(23000, 20000, StretcherBond())
     move_strategy = OutsideInMoveStrategy(LeftAlignmentStrategy())
-    robot = Robot(800, 1300, move_strategy)
-    assert move_strategy.next_move(robot, wall) == Rectangle(Point(1500, 0), 800, 1300)
-    assert move_strategy.next_move(robot, wall) == Rectangle(Point(0, 0), 800, 1300)
-    assert move_strategy.next_move(robot, wall) == Rectangle(Point(1500, 0), 800, 1300)
+    robot = Robot(8000, 13000, move_strategy)
+    assert move_strategy.next_move(robot, wall) == Rectangle(
+        Point(15000, 0), 8000, 13000
+    )
+    assert move_strategy.next_move(robot, wall) == Rectangle(Point(0, 0), 8000, 13000)
+    assert move_strategy.next_move(robot, wall) == Rectangle(
+        Point(15000, 0), 8000, 13000
+    )
 
 
 def test_snake_move_strategy():
-    wall = create_wall(2300, 2000, StretcherBond())
+    wall = create_wall(23000, 20000, StretcherBond())
     move_strategy = SnakeMoveStrategy(LeftAlignmentStrategy())
-    robot = Robot(800, 1300, move_strategy)
-    assert move_strategy.next_move(robot, wall) == Rectangle(Point(0, 0), 800, 1300)
+    robot = Robot(8000, 13000, move_strategy)
+    assert move_strategy.next_move(robot, wall) == Rectangle(Point(0, 0), 8000, 13000)
     for unit in wall.courses[0].units:
         unit.is_built = True
     assert move_strategy.next_move(robot, wall) == Rectangle(
-        Point(1500, COURSE_HEIGHT), 800, 1300
+        Point(15000, COURSE_HEIGHT), 8000, 13000
     )
     for unit in wall.courses[1].units:
         unit.is_built = True
     assert move_strategy.next_move(robot, wall) == Rectangle(
-        Point(0, 2 * COURSE_HEIGHT), 800, 1300
+        Point(0, 2 * COURSE_HEIGHT), 8000, 13000
     )
 
 
 def test_dynamic_snake_move_strategy():
-    wall = create_wall(2300, 2000, StretcherBond())
+    wall = create_wall(23000, 20000, StretcherBond())
     move_strategy = DynamicSnakeMoveStrategy(LeftAlignmentStrategy())
-    robot = Robot(800, 1300, move_strategy)
+    robot = Robot(8000, 13000, move_strategy)
     wall.courses[0].units[0].is_built = True
-    assert move_strategy.next_move(robot, wall) == Rectangle(Point(0, 0), 800, 1300)
+    assert move_strategy.next_move(robot, wall) == Rectangle(Point(0, 0), 8000, 13000)
     for unit in wall.courses[0].units:
         unit.is_built = True
     wall.courses[1].units[-1].is_built = True
     wall.courses[1].units[-2].is_built = True
     assert move_strategy.next_move(robot, wall) == Rectangle(
-        Point(1500, COURSE_HEIGHT), 800, 1300
+        Point(15000, COURSE_HEIGHT), 8000, 13000
     )
 
 
 def test_robot_move():
-    wall = create_wall(2300, 2000, StretcherBond())
-    robot = Robot(800, 1300, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    wall = create_wall(23000, 20000, StretcherBond())
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
     assert robot.move(wall)
     assert robot.move_count == 1
-    assert robot.reachable_area == Rectangle(Point(1500, 0), 800, 1300)
+    assert robot.reachable_area == Rectangle(Point(15000, 0), 8000, 13000)
 
 
 def test_robot_move_returns_false_when_wall_is_complete():
-    wall = create_wall(2300, 2000, StretcherBond())
-    robot = Robot(800, 1300, LeftToRightMoveStrategy(CenterAlignmentStrategy()))
+    wall = create_wall(23000, 20000, StretcherBond())
+    robot = Robot(8000, 13000, LeftToRightMoveStrategy(CenterAlignmentStrategy()))
     for course in wall.courses:
         for unit in course.units:
             unit.is_built = True
@@ -159,17 +188,98 @@ def test_robot_move_returns_false_when_wall_is_complete():
 
 
 def test_robot_lay_brick():
-    wall = create_wall(2300, 2000, StretcherBond())
-    robot = Robot(800, 1300, LeftToRightMoveStrategy(CenterAlignmentStrategy()))
+    wall = create_wall(23000, 20000, StretcherBond())
+    robot = Robot(8000, 13000, LeftToRightMoveStrategy(CenterAlignmentStrategy()))
     brick = robot.lay_brick(wall)
     assert brick.is_built
     assert brick.box.bottom_left_corner == Point(0, BED_JOINT_THICKNESS)
 
 
 def test_robot_lay_brick_returns_none_when_area_is_complete():
-    wall = create_wall(2300, 2000, StretcherBond())
-    robot = Robot(800, 1300, LeftToRightMoveStrategy(CenterAlignmentStrategy()))
+    wall = create_wall(23000, 20000, StretcherBond())
+    robot = Robot(8000, 13000, LeftToRightMoveStrategy(CenterAlignmentStrategy()))
     for course in wall.courses:
         for unit in course.units:
             unit.is_built = True
     assert robot.lay_brick(wall) is None
+
+
+def _lay_brick_by_scanning_whole_wall(robot, wall):
+    for i, course in enumerate(wall.courses):
+        previous_course = wall.courses[i - 1] if i > 0 else None
+        for unit in course.units:
+            if (
+                not unit.is_built
+                and robot._reachable(unit)
+                and unit.is_supported(previous_course)
+            ):
+                unit.is_built = True
+                if isinstance(unit, Brick):
+                    return unit
+    return None
+
+
+def test_robot_lay_brick_keeps_order_of_whole_wall_scan():
+    wall = create_wall(23000, 10000, StretcherBond())
+    expected_wall = create_wall(23000, 10000, StretcherBond())
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    expected_robot = Robot(
+        8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy())
+    )
+    while True:
+        brick = robot.lay_brick(wall)
+        assert brick == _lay_brick_by_scanning_whole_wall(expected_robot, expected_wall)
+        if brick is None:
+            expected_robot.move(expected_wall)
+            if not robot.move(wall):
+                break
+    assert wall.next_non_complete_course() is None
+
+
+def test_robot_lay_stride():
+    wall = create_wall(23000, 20000, StretcherBond())
+    expected_wall = create_wall(23000, 20000, StretcherBond())
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    expected_robot = Robot(
+        8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy())
+    )
+    while True:
+        expected_bricks = []
+        while (brick := expected_robot.lay_brick(expected_wall)) is not None:
+            expected_bricks.append(brick)
+        assert robot.lay_stride(wall) == expected_bricks
+        expected_robot.move(expected_wall)
+        if not robot.move(wall):
+            break
+    assert wall.next_non_complete_course() is None
+
+
+def test_robot_lay_stride_returns_empty_list_when_area_is_complete():
+    wall = create_wall(23000, 20000, StretcherBond())
+    robot = Robot(8000, 13000, LeftToRightMoveStrategy(CenterAlignmentStrategy()))
+    assert len(robot.lay_stride(wall)) == 12
+    assert robot.lay_stride(wall) == []
+    assert robot.lay_brick(wall) is None
+
+
+def test_robot_builds_streaming_wall_like_planned_wall():
+    for bond in (StretcherBond, lambda: WildBond(random.Random(2))):
+        wall = create_wall(23000, 30000, bond())
+        streaming_wall = create_streaming_wall(23000, 30000, bond(), lookahead=4)
+        robot = Robot(8000, 13000, SnakeMoveStrategy(CenterAlignmentStrategy()))
+        streaming_robot = Robot(
+            8000, 13000, SnakeMoveStrategy(CenterAlignmentStrategy())
+        )
+        while True:
+            bricks = robot.lay_stride(wall)
+            streaming_bricks = streaming_robot.lay_stride(streaming_wall)
+            assert [brick.box for brick in bricks] == [
+                brick.box for brick in streaming_bricks
+            ]
+            # the envelope spans 21 courses, and the wall plans 4 courses ahead
+            assert streaming_wall.courses.planned <= 25
+            streaming_robot.move(streaming_wall)
+            if not robot.move(wall):
+                break
+        assert streaming_wall.next_non_complete_course() is None
+        assert streaming_robot.move_count == robot.move_count
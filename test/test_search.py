@@ -0,0 +1,57 @@
+from buildplanner.compact import CompactWall
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    LeftAlignmentStrategy,
+    Robot,
+    SnakeMoveStrategy,
+)
+from buildplanner.search import SearchMoveStrategy, StrideSearch, built_state
+from buildplanner.wall import FlemishBond, StretcherBond, create_wall
+
+
+def _count_strides(wall, robot):
+    while True:
+        robot.lay_stride(wall)
+        if not robot.move(wall):
+            return robot.move_count + 1
+
+
+def test_built_state():
+    wall = create_wall(23000, 20000, StretcherBond())
+    wall.courses[0].units[1].is_built = True
+    state = built_state(wall)
+    assert len(state) == 32 * 21
+    assert state[:3] == bytes([0, 1, 0])
+
+
+def test_stride_search_ends_with_complete_wall():
+    wall = create_wall(23000, 10000, FlemishBond())
+    robot = Robot(8000, 13000, SnakeMoveStrategy(CenterAlignmentStrategy()))
+    robot.lay_stride(wall)
+    for beam_width in (None, 1, 4):
+        areas = StrideSearch(wall, robot, CenterAlignmentStrategy()).search(beam_width)
+        compact_wall = CompactWall.from_wall(wall)
+        for area in areas:
+            compact_wall.lay_stride(area)
+        assert all(compact_wall.built)
+
+
+def test_search_move_strategy_beats_greedy_strategy():
+    greedy_strides = _count_strides(
+        create_wall(23000, 20000, StretcherBond()),
+        Robot(8000, 13000, SnakeMoveStrategy(CenterAlignmentStrategy())),
+    )
+    wall = create_wall(23000, 20000, StretcherBond())
+    search_strides = _count_strides(
+        wall, Robot(8000, 13000, SearchMoveStrategy(CenterAlignmentStrategy()))
+    )
+    assert wall.next_non_complete_course() is None
+    assert search_strides < greedy_strides
+
+
+def test_search_move_strategy_with_beam_width():
+    wall = create_wall(23000, 20000, StretcherBond())
+    move_strategy = SearchMoveStrategy(LeftAlignmentStrategy())
+    move_strategy.beam_width = 2
+    _count_strides(wall, Robot(8000, 13000, move_strategy))
+    assert wall.next_non_complete_course() is None
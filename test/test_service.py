@@ -0,0 +1,149 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from buildplanner.batch import WallSpec
+from buildplanner.plan import HEADER, BuildPlan
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.service import PlanCache, PlannedWall, PlanningService, serve
+from buildplanner.wall import StretcherBond, create_wall
+
+SPEC = WallSpec("a", 2300, 2000, alignment="center", move="outside_in")
+
+
+def _service(cache=None):
+    # the walls each worker keeps are reset in place, so threads can't share them
+    return PlanningService(ThreadPoolExecutor(max_workers=1), cache)
+
+
+def test_identical_requests_are_planned_once():
+    async def run():
+        service = _service()
+        planned_walls = await asyncio.gather(*(service.plan(SPEC) for _ in range(5)))
+        assert all(planned_wall is planned_walls[0] for planned_wall in planned_walls)
+        assert await service.plan(SPEC) is planned_walls[0]
+        return service.stats()
+
+    stats = asyncio.run(run())
+    assert stats["requests"] == 6
+    assert stats["plans"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["cache_hits"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_names_and_unused_seeds_do_not_change_the_plan():
+    async def run():
+        service = _service()
+        await service.plan(SPEC)
+        await service.plan(
+            WallSpec("b", 2300, 2000, "stretcher", 800, 1300, "center", "outside_in", 3)
+        )
+        await service.plan(
+            WallSpec("c", 2300, 2000, "wild", 800, 1300, "center", "outside_in", 3)
+        )
+        return service.stats()
+
+    stats = asyncio.run(run())
+    assert stats["plans"] == 2
+    assert stats["cache_hits"] == 1
+
+
+def test_plan_cache_evicts_least_recently_used_plans():
+    cache = PlanCache(max_bytes=2 * HEADER.size)
+    first, second, third = (
+        WallSpec(name, 1000, 1000) for name in ("first", "second", "third")
+    )
+    cache.put(first, PlannedWall("center", "snake", BuildPlan()))
+    cache.put(second, PlannedWall("center", "snake", BuildPlan()))
+    assert cache.get(first) is not None
+    cache.put(third, PlannedWall("center", "snake", BuildPlan()))
+    assert cache.get(second) is None
+    assert cache.get(first) is not None
+    assert cache.get(third) is not None
+    assert cache.evictions == 1
+    assert cache.nbytes == 2 * HEADER.size
+
+
+async def _post(reader, writer, body, close=False):
+    writer.write(
+        (
+            "POST / HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            + ("Connection: close\r\n" if close else "")
+            + "\r\n"
+        ).encode()
+        + body
+    )
+    await writer.drain()
+    status = (await reader.readline()).decode().split()[1]
+    headers = {}
+    while (line := await reader.readline()) != b"\r\n":
+        name, _, value = line.decode().partition(":")
+        headers[name.lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    return status, json.loads(body) if body else None
+
+
+def test_json_rpc_over_http():
+    plan_params = {
+        "length": 2300,
+        "height": 2000,
+        "alignment": "center",
+        "move": "outside_in",
+    }
+
+    async def run():
+        service = _service()
+        server = await serve(service, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            batch = [
+                {"jsonrpc": "2.0", "id": 1, "method": "plan", "params": plan_params},
+                {
+                    "jsonrpc": "2.0",
+                    "id": 2,
+                    "method": "plan",
+                    "params": {**plan_params, "bricks": True},
+                },
+                {"jsonrpc": "2.0", "id": 3, "method": "build"},
+                {"jsonrpc": "2.0", "id": 4, "method": "plan", "params": {"length": 0}},
+            ]
+            batch_response = await _post(reader, writer, json.dumps(batch).encode())
+            # the connection is kept alive for the next request
+            stats_response = await _post(
+                reader,
+                writer,
+                b'{"jsonrpc": "2.0", "id": 5, "method": "stats"}',
+            )
+            parse_error = await _post(reader, writer, b"{", close=True)
+            assert await reader.read() == b""
+            writer.close()
+        return batch_response, stats_response, parse_error
+
+    (status, responses), (_, stats), (_, parse_error) = asyncio.run(run())
+    assert status == "200"
+    planned, with_bricks, no_method, bad_params = responses
+
+    wall = create_wall(23000, 20000, StretcherBond())
+    plan = BuildPlan.compile(
+        wall, Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    )
+    assert planned["id"] == 1
+    assert planned["result"] == {
+        "strides": plan.strides,
+        "bricks": len(plan),
+        "alignment": "center",
+        "move": "outside_in",
+    }
+    assert with_bricks["result"]["plan"] == list(plan.json_records())
+    assert no_method["error"]["code"] == -32601
+    assert bad_params["error"]["code"] == -32602
+    assert stats["result"]["plans"] == 1
+    assert stats["result"]["coalesced"] == 1
+    assert parse_error["error"]["code"] == -32700
@@ -0,0 +1,87 @@
+import pytest
+
+from buildplanner.model import HeadJoint
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.simulate import (
+    RESOURCES,
+    RecordedStride,
+    TimingModel,
+    record,
+    simulate,
+)
+from buildplanner.util import Point, Rectangle
+from buildplanner.wall import FlemishBond, create_wall
+
+TIMING = TimingModel(
+    travel_speed=100, lift_speed=100, settle_seconds=5, lay_seconds=6, joint_seconds=3
+)
+
+
+def _stride(x, joints_of_bricks):
+    return RecordedStride(Rectangle(Point(x, 0), 8000, 13000), joints_of_bricks)
+
+
+def test_simulate_overlaps_joints_with_laying():
+    # bricks are laid at 0-6, 6-12 and 12-18 with joints at 6-9 and 18-21, then the rig
+    # moves 1000 mm in 10 s and settles for 5 s, and lays a brick and its joint by 45
+    result = simulate([_stride(0, (1, 0, 1)), _stride(10000, (1,))], TIMING)
+    assert result.makespan == 45
+    assert result.strides == 2
+    assert result.bricks == 4
+    assert result.joints == 3
+    assert result.busy["rig"] == [(21, 36)]
+    assert result.busy_seconds("gripper") == 24
+    assert result.busy_seconds("applicator") == 9
+
+
+def test_simulate_waits_for_a_slow_applicator():
+    timing = TimingModel(lay_seconds=1, joint_seconds=5)
+    result = simulate([_stride(0, (1, 1))], timing)
+    assert result.makespan == 11
+    assert result.busy["applicator"] == [(1, 6), (6, 11)]
+
+
+def test_simulate_does_not_time_a_move_that_goes_nowhere():
+    result = simulate([_stride(0, (0,)), _stride(0, (0,))], TIMING)
+    assert result.makespan == 12
+    assert result.busy["rig"] == []
+
+
+def test_record_follows_robot():
+    wall = create_wall(23000, 20000, FlemishBond())
+    strides = record(
+        wall, Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    )
+    wall.reset()
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    expected = []
+    while True:
+        expected.append((robot.reachable_area, len(robot.lay_stride(wall))))
+        if not robot.move(wall):
+            break
+    assert [
+        (stride.envelope, len(stride.joints_of_bricks)) for stride in strides
+    ] == expected
+    assert sum(sum(stride.joints_of_bricks) for stride in strides) == sum(
+        isinstance(unit, HeadJoint) for course in wall.courses for unit in course.units
+    )
+
+
+def test_timeline_adds_up_to_busy_seconds():
+    wall = create_wall(23000, 20000, FlemishBond())
+    result = simulate(
+        record(
+            wall, Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+        )
+    )
+    timeline = result.timeline(60)
+    assert len(timeline) == -int(-result.makespan // 60)
+    for resource in RESOURCES:
+        assert all(0 <= bucket[resource] <= 1 + 1e-9 for bucket in timeline)
+        assert sum(bucket[resource] for bucket in timeline) * 60 == pytest.approx(
+            result.busy_seconds(resource)
+        )
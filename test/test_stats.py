@@ -0,0 +1,100 @@
+import json
+
+from buildplanner.model import Unit
+from buildplanner.robot import (
+    CenterAlignmentStrategy,
+    OutsideInMoveStrategy,
+    Robot,
+)
+from buildplanner.stats import Stats, collecting, dumping_to
+from buildplanner.wall import (
+    Bond,
+    StretcherBond,
+    WallPlanningException,
+    create_wall,
+)
+
+
+class _FailsOnceBond(StretcherBond):
+    def __init__(self):
+        super().__init__()
+        self._failed = False
+
+    @staticmethod
+    def retries() -> int:
+        return 1
+
+    def next_brick_in_course(self, course, course_idx, *args):
+        if course_idx == 1 and not self._failed:
+            self._failed = True
+            raise WallPlanningException("Try again")
+        return super().next_brick_in_course(course, course_idx, *args)
+
+
+def _build(wall):
+    robot = Robot(8000, 13000, OutsideInMoveStrategy(CenterAlignmentStrategy()))
+    while True:
+        robot.lay_stride(wall)
+        if not robot.move(wall):
+            return robot
+
+
+def test_collecting_counts_hot_paths():
+    with collecting() as stats:
+        robot = _build(create_wall(23000, 20000, StretcherBond()))
+    assert stats.counters["moves"] == robot.move_count + 1
+    assert stats.counters["lays"] == robot.move_count + 1
+    assert stats.counters["units_scanned"] > stats.counters["unit_scans"] > 0
+    assert stats.counters["support_checks"] == stats.counters["reachability_tests"]
+    assert stats.counters["support_checks"] > 0
+    # the rest of a periodic bond's courses repeat its first period
+    assert stats.counters["courses_planned"] == 2
+    assert stats.seconds["lay"] > 0
+    assert stats.seconds["plan_courses"] > 0
+
+
+def test_collecting_counts_course_retries():
+    with collecting() as stats:
+        create_wall(23000, 20000, _FailsOnceBond())
+    assert stats.counters["course_retries"] == 1
+    assert stats.counters["courses_planned"] == 2
+
+
+def test_collecting_puts_the_originals_back():
+    move = Robot.move
+    is_supported = Unit.is_supported
+    next_brick_in_course = Bond.next_brick_in_course
+    with collecting():
+        assert Robot.move is not move
+    assert Robot.move is move
+    assert Unit.is_supported is is_supported
+    assert Bond.next_brick_in_course is next_brick_in_course
+    with collecting() as stats:
+        pass
+    _build(create_wall(23000, 20000, StretcherBond()))
+    assert stats.counters["moves"] == 0
+
+
+def test_stats_merge():
+    stats = Stats()
+    other = Stats()
+    stats.counters["moves"] = 2
+    other.counters["moves"] = 3
+    other.seconds["lay"] = 0.5
+    stats.merge(other)
+    assert stats.counters["moves"] == 5
+    assert stats.seconds["lay"] == 0.5
+
+
+def test_dumping_to(tmp_path, capsys):
+    with dumping_to(None) as stats:
+        assert stats is None
+    path = tmp_path / "stats.json"
+    with dumping_to(str(path)):
+        _build(create_wall(23000, 20000, StretcherBond()))
+    dumped = json.loads(path.read_text())
+    assert dumped["counters"]["moves"] > 0
+    assert set(dumped["seconds"]) == {"plan_courses", "lay", "next_move"}
+    with dumping_to("-"):
+        pass
+    assert "units_scanned/lay" in capsys.readouterr().out
@@ -0,0 +1,87 @@
+import pytest
+
+import buildplanner.sweep
+from buildplanner.parser_util import int_range
+from buildplanner.sweep import sweep, sweep_wall
+
+ENVELOPES = [(length, height) for length in (600, 800, 1000) for height in (1000, 1300)]
+ALIGNMENTS = ["left", "center", "random"]
+MOVES = ["left_to_right", "outside_in", "snake"]
+
+
+@pytest.mark.parametrize("bond", ["stretcher", "flemish", "wild"])
+def test_pruned_sweep_finds_the_same_front_as_laying_every_wall(bond):
+    pruned = sweep_wall(bond, (2300, 2000), ENVELOPES, ALIGNMENTS, MOVES, seed=1)
+    exhaustive = sweep_wall(
+        bond, (2300, 2000), ENVELOPES, ALIGNMENTS, MOVES, seed=1, prune=False
+    )
+    assert pruned.front == exhaustive.front
+    assert pruned.runs == exhaustive.runs == len(ENVELOPES) * 9
+    assert pruned.pruned_runs > 0
+    assert exhaustive.pruned_runs == 0
+
+
+def test_front_only_has_envelopes_that_nothing_smaller_beats():
+    front = sweep_wall("stretcher", (2300, 2000), ENVELOPES, ALIGNMENTS, MOVES).front
+    for point in front:
+        assert not any(
+            other is not point
+            and other.envelope_length <= point.envelope_length
+            and other.envelope_height <= point.envelope_height
+            and other.strides <= point.strides
+            for other in front
+        )
+    # the smallest envelope is always on the front
+    assert (front[0].envelope_length, front[0].envelope_height) == (600, 1000)
+
+
+def test_each_wall_is_planned_once(monkeypatch):
+    planned = []
+    create_wall = buildplanner.sweep.create_wall
+
+    def counting_create_wall(*args):
+        planned.append(args)
+        return create_wall(*args)
+
+    monkeypatch.setattr(buildplanner.sweep, "create_wall", counting_create_wall)
+    results = list(
+        sweep(
+            ["stretcher", "cross"],
+            [(1000, 1000), (2300, 1000)],
+            ENVELOPES,
+            ["center"],
+            ["snake"],
+            workers=1,
+        )
+    )
+    assert len(planned) == len(results) == 4
+    assert [(result.bond, result.wall_length) for result in results] == [
+        ("stretcher", 1000),
+        ("stretcher", 2300),
+        ("cross", 1000),
+        ("cross", 2300),
+    ]
+
+
+def test_sweep_rejects_envelopes_too_small_to_lay_a_brick():
+    with pytest.raises(ValueError, match="too small"):
+        list(sweep(["stretcher"], [(2300, 2000)], [(100, 1000)], workers=1))
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("800", [800]),
+        ("600:1200:200", [600, 800, 1000, 1200]),
+        ("600:1100:200", [600, 800, 1000]),
+        ("3:5", [3, 4, 5]),
+    ],
+)
+def test_int_range(value, expected):
+    assert int_range(value) == expected
+
+
+@pytest.mark.parametrize("value", ["0", "5:3", "1:5:0", "a:5"])
+def test_int_range_rejects_bad_ranges(value):
+    with pytest.raises(ValueError):
+        int_range(value)
@@ -1,4 +1,4 @@
-from buildplanner.util import Point, Rectangle
+from buildplanner.util import Point, Rectangle, to_fixed_point, to_millimetres
 
 
 def test_point_plus_x():
@@ -87,3 +87,19 @@ def test_rectangle_overlaps_in_x_axis_when_too_far_right():
     assert not Rectangle(Point(7, 1), 2, 10).overlaps_in_x_axis(
         Rectangle(Point(3, -4), 3, 1)
     )
+
+
+def test_to_fixed_point():
+    assert to_fixed_point(12.5) == 125
+    assert to_fixed_point(210) == 2100
+
+
+def test_to_millimetres():
+    assert to_millimetres(125) == 12.5
+
+
+def test_rectangle_bounds_coordinates():
+    rectangle = Rectangle(Point(0, 0), 20, 20)
+    assert rectangle.bounds_coordinates(0, 0, 20, 20)
+    assert not rectangle.bounds_coordinates(-1, 0, 5, 5)
+    assert not rectangle.bounds_coordinates(5, 5, 5, 21)
@@ -1,18 +1,33 @@
+import random
+
+import pytest
+
 from buildplanner.util import Point
 from buildplanner.model import (
     Brick,
+    Course,
     HALF_BRICK_LENGTH,
     FULL_BRICK_LENGTH,
     HEAD_JOINT_THICKNESS,
     QUARTER_BRICK_LENGTH,
     THREE_QUARTER_BRICK_LENGTH,
 )
-from buildplanner.wall import StretcherBond, CrossBond, FlemishBond, create_wall
+from buildplanner.wall import (
+    StretcherBond,
+    CrossBond,
+    FlemishBond,
+    WildBond,
+    WallCache,
+    WallPlanningException,
+    create_streaming_wall,
+    create_wall,
+    plan_courses,
+)
 
 
 def test_stretcher_bond_when_first_brick_on_even_course():
     bond = StretcherBond()
-    brick = bond.next_brick_in_course([], 2, Point(0, 0), 2300, [])
+    brick = bond.next_brick_in_course([], 2, Point(0, 0), 23000, [])
     assert brick.box.bottom_left_corner == Point(0, 0)
     assert brick.box.length == FULL_BRICK_LENGTH
 
@@ -20,15 +35,15 @@ def test_stretcher_bond_when_first_brick_on_even_course():
 def test_stretcher_bond_when_last_brick_on_even_course():
     bond = StretcherBond()
     brick = bond.next_brick_in_course(
-        [Brick.create_full_brick(Point(0, 0))], 0, Point(2200, 0), 2300, []
+        [Brick.create_full_brick(Point(0, 0))], 0, Point(22000, 0), 23000, []
     )
-    assert brick.box.bottom_left_corner == Point(2200, 0)
+    assert brick.box.bottom_left_corner == Point(22000, 0)
     assert brick.box.length == HALF_BRICK_LENGTH
 
 
 def test_stretcher_bond_when_first_brick_on_odd_course():
     bond = StretcherBond()
-    brick = bond.next_brick_in_course([], 3, Point(0, 0), 2300, [])
+    brick = bond.next_brick_in_course([], 3, Point(0, 0), 23000, [])
     assert brick.box.bottom_left_corner == Point(0, 0)
     assert brick.box.length == HALF_BRICK_LENGTH
 
@@ -36,23 +51,23 @@ def test_stretcher_bond_when_first_brick_on_odd_course():
 def test_stretcher_bond_when_last_brick_on_odd_course():
     bond = StretcherBond()
     brick = bond.next_brick_in_course(
-        [Brick.create_full_brick(Point(0, 0))], 1, Point(2090, 0), 2300, []
+        [Brick.create_full_brick(Point(0, 0))], 1, Point(20900, 0), 23000, []
     )
-    assert brick.box.bottom_left_corner == Point(2090, 0)
+    assert brick.box.bottom_left_corner == Point(20900, 0)
     assert brick.box.length == FULL_BRICK_LENGTH
 
 
 def test_stretcher_bond_when_middle_brick():
     bond = StretcherBond()
     brick = bond.next_brick_in_course(
-        [Brick.create_full_brick(Point(0, 0))], 1, Point(300, 0), 2300, []
+        [Brick.create_full_brick(Point(0, 0))], 1, Point(3000, 0), 23000, []
     )
-    assert brick.box.bottom_left_corner == Point(300, 0)
+    assert brick.box.bottom_left_corner == Point(3000, 0)
     assert brick.box.length == FULL_BRICK_LENGTH
 
 
 def test_create_stretcher_wall():
-    wall = create_wall(2300, 2000, StretcherBond())
+    wall = create_wall(23000, 20000, StretcherBond())
     assert len(wall.courses) == 32
     for i in range(32):
         units = wall.courses[i].units
@@ -68,7 +83,7 @@ def test_create_stretcher_wall():
 
 def test_cross_bond_when_first_brick_on_even_course():
     bond = CrossBond()
-    brick = bond.next_brick_in_course([], 2, Point(0, 0), 2300, [])
+    brick = bond.next_brick_in_course([], 2, Point(0, 0), 23000, [])
     assert brick.box.bottom_left_corner == Point(0, 0)
     assert brick.box.length == QUARTER_BRICK_LENGTH
 
@@ -76,24 +91,24 @@ def test_cross_bond_when_first_brick_on_even_course():
 def test_cross_bond_when_middle_brick_on_even_course():
     bond = CrossBond()
     brick = bond.next_brick_in_course(
-        [Brick.create_full_brick(Point(0, 0))], 0, Point(500, 0), 2300, []
+        [Brick.create_full_brick(Point(0, 0))], 0, Point(5000, 0), 23000, []
     )
-    assert brick.box.bottom_left_corner == Point(500, 0)
+    assert brick.box.bottom_left_corner == Point(5000, 0)
     assert brick.box.length == FULL_BRICK_LENGTH
 
 
 def test_cross_bond_when_last_brick_on_even_course():
     bond = CrossBond()
     brick = bond.next_brick_in_course(
-        [Brick.create_full_brick(Point(0, 0))], 4, Point(2255, 0), 2300, []
+        [Brick.create_full_brick(Point(0, 0))], 4, Point(22550, 0), 23000, []
     )
-    assert brick.box.bottom_left_corner == Point(2255, 0)
+    assert brick.box.bottom_left_corner == Point(22550, 0)
     assert brick.box.length == QUARTER_BRICK_LENGTH
 
 
 def test_cross_bond_when_first_brick_on_odd_course():
     bond = CrossBond()
-    brick = bond.next_brick_in_course([], 1, Point(0, 0), 2300, [])
+    brick = bond.next_brick_in_course([], 1, Point(0, 0), 23000, [])
     assert brick.box.bottom_left_corner == Point(0, 0)
     assert brick.box.length == HALF_BRICK_LENGTH
 
@@ -101,23 +116,32 @@ def test_cross_bond_when_first_brick_on_odd_course():
 def test_cross_bond_when_middle_brick_on_odd_course():
     bond = CrossBond()
     brick = bond.next_brick_in_course(
-        [Brick.create_full_brick(Point(0, 0))], 3, Point(500, 0), 2300, []
+        [Brick.create_full_brick(Point(0, 0))], 3, Point(5000, 0), 23000, []
     )
-    assert brick.box.bottom_left_corner == Point(500, 0)
+    assert brick.box.bottom_left_corner == Point(5000, 0)
     assert brick.box.length == HALF_BRICK_LENGTH
 
 
 def test_cross_bond_when_last_brick_on_odd_course():
     bond = CrossBond()
     brick = bond.next_brick_in_course(
-        [Brick.create_full_brick(Point(0, 0))], 5, Point(2200, 0), 2300, []
+        [Brick.create_full_brick(Point(0, 0))], 5, Point(22000, 0), 23000, []
     )
-    assert brick.box.bottom_left_corner == Point(2200, 0)
+    assert brick.box.bottom_left_corner == Point(22000, 0)
     assert brick.box.length == HALF_BRICK_LENGTH
 
 
+def test_cross_bond_when_last_brick_on_odd_course_is_too_long():
+    bond = CrossBond()
+    brick = bond.next_brick_in_course(
+        [Brick.create_full_brick(Point(0, 0))], 5, Point(249700, 0), 250000, []
+    )
+    assert brick.box.bottom_left_corner == Point(249700, 0)
+    assert brick.box.length == 300
+
+
 def test_create_cross_wall():
-    wall = create_wall(2300, 2000, CrossBond())
+    wall = create_wall(23000, 20000, CrossBond())
     assert len(wall.courses) == 32
     for i in range(0, 32, 2):
         units = wall.courses[i].units
@@ -125,7 +149,7 @@ def test_create_cross_wall():
         assert units.pop(0).box.length == QUARTER_BRICK_LENGTH
         last_brick = units.pop(-1)
         assert last_brick.box.length == QUARTER_BRICK_LENGTH
-        assert last_brick.box.bottom_left_corner.x + QUARTER_BRICK_LENGTH == 2300
+        assert last_brick.box.bottom_left_corner.x + QUARTER_BRICK_LENGTH == 23000
         for j, unit in enumerate(units):
             if j % 2 == 0:
                 assert unit.box.length == HEAD_JOINT_THICKNESS
@@ -139,11 +163,11 @@ def test_create_cross_wall():
                 assert unit.box.length == HALF_BRICK_LENGTH
             else:
                 assert unit.box.length == HEAD_JOINT_THICKNESS
-        assert units[-1].box.bottom_left_corner.x + HALF_BRICK_LENGTH == 2300
+        assert units[-1].box.bottom_left_corner.x + HALF_BRICK_LENGTH == 23000
 
 
 def test_create_flemish_wall():
-    wall = create_wall(2300, 2000, FlemishBond())
+    wall = create_wall(23000, 20000, FlemishBond())
     assert len(wall.courses) == 32
     for i in range(0, 32, 2):
         units = wall.courses[i].units
@@ -157,14 +181,14 @@ def test_create_flemish_wall():
             else:
                 assert unit.box.length == HEAD_JOINT_THICKNESS
         last_brick = units[-1]
-        assert last_brick.box.bottom_left_corner.x + last_brick.box.length == 2300
+        assert last_brick.box.bottom_left_corner.x + last_brick.box.length == 23000
     for i in range(1, 32, 2):
         units = wall.courses[i].units
         assert len(units) == 29
         assert units.pop(0).box.length == THREE_QUARTER_BRICK_LENGTH
         last_brick = units.pop(-1)
         assert last_brick.box.length == QUARTER_BRICK_LENGTH
-        assert last_brick.box.bottom_left_corner.x + last_brick.box.length == 2300
+        assert last_brick.box.bottom_left_corner.x + last_brick.box.length == 23000
         for j, unit in enumerate(units):
             if j % 2 == 0:
                 assert unit.box.length == HEAD_JOINT_THICKNESS
@@ -173,3 +197,165 @@ def test_create_flemish_wall():
                     assert unit.box.length == HALF_BRICK_LENGTH
                 else:
                     assert unit.box.length == FULL_BRICK_LENGTH
+
+
+def test_create_wall_links_supports():
+    wall = create_wall(23000, 20000, StretcherBond())
+    assert wall.courses[0].units[0].supporters == []
+    for course, course_below in zip(wall.courses[1:], wall.courses):
+        for unit in course.units:
+            assert unit.supporters == [
+                unit_below
+                for unit_below in course_below.units
+                if unit_below.box.overlaps_in_x_axis(unit.box)
+            ]
+
+
+def test_create_wild_wall_when_seeded():
+    walls = [create_wall(23000, 20000, WildBond(random.Random(3))) for _ in range(2)]
+    assert walls[0] == walls[1]
+
+
+class _StuckUntilSecondCourseIsReworkedBond(StretcherBond):
+    def __init__(self):
+        super().__init__()
+        self.second_course_attempts = 0
+
+    def next_brick_in_course(
+        self, course, course_idx, bottom_left_corner, wall_length, previous_courses
+    ):
+        if self.is_first_brick(course):
+            if course_idx == 1:
+                self.second_course_attempts += 1
+            if course_idx == 3 and self.second_course_attempts < 2:
+                raise WallPlanningException("stuck")
+        return super().next_brick_in_course(
+            course, course_idx, bottom_left_corner, wall_length, previous_courses
+        )
+
+    @staticmethod
+    def retries():
+        return 1
+
+    @staticmethod
+    def period():
+        return None
+
+
+def test_create_wall_backtracks_further_each_time_it_gets_stuck():
+    bond = _StuckUntilSecondCourseIsReworkedBond()
+    wall = create_wall(23000, 5000, bond)
+    assert len(wall.courses) == 8
+    assert bond.second_course_attempts == 2
+
+
+def test_create_wall_raises_when_out_of_retries():
+    class _AlwaysStuckBond(_StuckUntilSecondCourseIsReworkedBond):
+        def next_brick_in_course(self, course, course_idx, *args):
+            raise WallPlanningException("stuck")
+
+    with pytest.raises(WallPlanningException):
+        create_wall(23000, 5000, _AlwaysStuckBond())
+
+
+def test_create_tall_wild_wall():
+    wall = create_wall(23000, 100000, WildBond(random.Random(0)))
+    assert len(wall.courses) == 160
+
+
+def test_wall_cache_resets_wall_it_hands_out_again():
+    cache = WallCache()
+    wall = cache.get(23000, 20000, StretcherBond)
+    for course in wall.courses:
+        for unit in course.units:
+            unit.is_built = True
+    assert wall.next_non_complete_course() is None
+    assert cache.get(23000, 20000, StretcherBond) is wall
+    assert wall.next_non_complete_course() is wall.courses[0]
+    assert not any(unit.is_built for course in wall.courses for unit in course.units)
+    assert wall.courses[0].units[0].is_supported(None)
+    assert not wall.courses[1].units[0].is_supported(wall.courses[0])
+
+
+def test_wall_cache_keys_random_bonds_by_seed():
+    cache = WallCache()
+    wall = cache.get(23000, 20000, WildBond, 1)
+    assert wall == create_wall(23000, 20000, WildBond(random.Random(1)))
+    assert cache.get(23000, 20000, WildBond, 1) is wall
+    assert cache.get(23000, 20000, WildBond, 2) is not wall
+    assert cache.get(23000, 20000, WildBond) is not cache.get(23000, 20000, WildBond)
+
+
+def test_wall_cache_ignores_seed_of_deterministic_bonds():
+    cache = WallCache()
+    assert cache.get(23000, 20000, FlemishBond, 1) is cache.get(
+        23000, 20000, FlemishBond, 2
+    )
+
+
+def test_wall_cache_evicts_least_recently_used_wall():
+    cache = WallCache(max_walls=1)
+    wall = cache.get(23000, 20000, StretcherBond)
+    cache.get(23000, 20000, CrossBond)
+    assert cache.get(23000, 20000, StretcherBond) is not wall
+
+
+@pytest.mark.parametrize("bond", [StretcherBond, CrossBond, FlemishBond])
+def test_create_wall_repeats_period_of_deterministic_bond(bond):
+    class _NonPeriodicBond(bond):
+        @staticmethod
+        def period():
+            return None
+
+    wall = create_wall(23000, 20000, bond())
+    assert wall == create_wall(23000, 20000, _NonPeriodicBond())
+    for course, course_below in zip(wall.courses[1:], wall.courses):
+        assert [unit.supporters for unit in course.units] == [
+            [
+                unit_below
+                for unit_below in course_below.units
+                if unit_below._supports(unit)
+            ]
+            for unit in course.units
+        ]
+
+
+def test_plan_courses_never_reworks_courses_it_has_handed_out():
+    courses = plan_courses(23000, 8, _StuckUntilSecondCourseIsReworkedBond(), 1)
+    assert next(courses).index == 0
+    with pytest.raises(WallPlanningException):
+        list(courses)
+
+
+def test_streaming_wall_drops_built_courses():
+    wall = create_streaming_wall(23000, 20000, StretcherBond(), lookahead=2)
+    assert wall.courses.planned == 0
+    assert wall.next_non_complete_course() is wall.courses[0]
+    assert wall.courses.planned == 1
+    for course in wall.courses[0], wall.courses[1]:
+        for unit in course.units:
+            unit.is_built = True
+    second_course = wall.courses[1]
+    third_course = wall.courses[2]
+    assert wall.next_non_complete_course() is third_course
+    assert wall.courses.first_kept == 2
+    assert wall.courses[1] == Course(625, [], True)
+    assert wall.courses[1] is not second_course
+    assert all(unit.supporters == [] for unit in third_course.units)
+    assert third_course.units[0].is_supported(wall.courses[1])
+
+
+def test_streaming_wall_course_indices_within():
+    wall = create_wall(23000, 20000, StretcherBond())
+    streaming_wall = create_streaming_wall(23000, 20000, StretcherBond())
+    for min_y, max_y in (
+        (0, 20000),
+        (625, 2500),
+        (700, 2500),
+        (700, 1200),
+        (-5, 90000),
+    ):
+        assert streaming_wall.course_indices_within(
+            min_y, max_y
+        ) == wall.course_indices_within(min_y, max_y)
+    assert streaming_wall.courses.planned == 0